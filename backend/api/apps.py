@@ -0,0 +1,14 @@
+from django.apps import AppConfig
+from django.core import checks
+
+
+class ApiConfig(AppConfig):
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "api"
+    verbose_name = "API"
+
+    def ready(self):
+        import api.signals.handlers  # noqa
+        from api.cache import check_response_cache
+
+        checks.register(check_response_cache, checks.Tags.caches)
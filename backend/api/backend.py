@@ -0,0 +1,181 @@
+import hashlib
+import json
+import logging
+import threading
+from collections import Counter, OrderedDict
+from functools import partial
+from typing import Dict, List, Optional, Tuple
+
+from graphql import GraphQLSchema, parse, print_ast
+from graphql.backend import GraphQLCoreBackend
+from graphql.backend.base import GraphQLDocument
+from graphql.execution import ExecutionResult, execute
+from graphql.validation import validate
+
+
+def query_hash(query: str) -> str:
+    """Returns the sha256 hash persisted queries are identified by."""
+
+    return hashlib.sha256(query.encode("utf-8")).hexdigest()
+
+
+def invalid_result(errors: List, *args, **kwargs) -> ExecutionResult:
+    return ExecutionResult(errors=errors, invalid=True)
+
+
+class DocumentCacheBackend(GraphQLCoreBackend):
+    """GraphQL backend which parses and validates each document only once.
+
+    Documents are cached by the sha256 hash of their query string, so that
+    repeated ad-hoc queries skip parsing and validation. The least recently
+    used documents are evicted once `maxsize` documents are cached.
+
+    Persisted queries are registered up front and pinned, so that they are
+    never evicted. Clients may refer to them by hash alone, as well as to
+    queries they registered by sending them along with their hash, for as
+    long as those stay cached. Other cached ad-hoc queries cannot be referred
+    to by hash.
+
+    Each document is given a `normalized_hash` of its printed AST, which is
+    the same for query strings differing only in whitespace or comments.
+
+    Attributes:
+        maxsize: The maximum number of ad-hoc documents to cache.
+        stats: A Counter of document cache hits and misses.
+    """
+
+    def __init__(self, maxsize: int = 256, executor=None):
+        super().__init__(executor=executor)
+        self.maxsize = maxsize
+        self.stats = Counter()
+        self._persisted: Dict[str, GraphQLDocument] = {}
+        self._documents: "OrderedDict[str, GraphQLDocument]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _build_document(
+        self, schema: GraphQLSchema, document_string: str
+    ) -> Tuple[GraphQLDocument, List]:
+        document_ast = parse(document_string)
+        errors = validate(schema, document_ast)
+        if errors:
+            execute_document = partial(invalid_result, errors)
+        else:
+            execute_document = partial(
+                execute, schema, document_ast, **self.execute_params
+            )
+        document = GraphQLDocument(
+            schema=schema,
+            document_string=document_string,
+            document_ast=document_ast,
+            execute=execute_document,
+        )
+        document.normalized_hash = query_hash(print_ast(document_ast))
+        return document, errors
+
+    def document_from_string(
+        self, schema: GraphQLSchema, document_string: str
+    ) -> GraphQLDocument:
+        """Returns the parsed and validated document for a query string.
+
+        Raises:
+            GraphQLSyntaxError: If the query string cannot be parsed.
+        """
+
+        key = query_hash(document_string)
+        document = self.get(key)
+        if document is not None and document.schema is schema:
+            return document
+
+        self.stats["misses"] += 1
+        document, _ = self._build_document(schema, document_string)
+        with self._lock:
+            self._documents[key] = document
+            self._documents.move_to_end(key)
+            while len(self._documents) > self.maxsize:
+                self._documents.popitem(last=False)
+        return document
+
+    def get(self, key: str) -> Optional[GraphQLDocument]:
+        """Returns the persisted or cached document with a hash, if any."""
+
+        with self._lock:
+            document = self._persisted.get(key)
+            if document is None:
+                document = self._documents.get(key)
+                if document is not None:
+                    self._documents.move_to_end(key)
+        if document is not None:
+            self.stats["hits"] += 1
+        return document
+
+    def get_persisted(self, key: str) -> Optional[GraphQLDocument]:
+        """Returns the persisted or registered document with a hash, if any."""
+
+        document = self.get(key)
+        if document is None or not getattr(document, "registered", False):
+            return None
+        return document
+
+    def register(self, schema: GraphQLSchema, query: str) -> GraphQLDocument:
+        """Registers a query a client sent along with its hash.
+
+        Unlike persisted queries, registered queries are cached like ad-hoc
+        ones and may be evicted, after which clients have to send them again.
+
+        Raises:
+            GraphQLSyntaxError: If the query string cannot be parsed.
+        """
+
+        document = self.document_from_string(schema, query)
+        document.registered = True
+        return document
+
+    def persist(self, schema: GraphQLSchema, query: str) -> str:
+        """Registers a persisted query, parsing and validating it up front.
+
+        Args:
+            schema: The schema to validate the query against.
+            query: The query string.
+
+        Returns:
+            The hash the query can be referred to by.
+
+        Raises:
+            ValueError: If the query is invalid.
+        """
+
+        document, errors = self._build_document(schema, query)
+        if errors:
+            raise ValueError(f"Invalid persisted query: {errors[0]}")
+        document.registered = True
+        key = query_hash(query)
+        with self._lock:
+            self._persisted[key] = document
+        return key
+
+    def load(self, schema: GraphQLSchema, path: str) -> int:
+        """Registers the persisted queries in a JSON file.
+
+        Args:
+            schema: The schema to validate the queries against.
+            path: The path of a JSON file containing a list of query strings,
+                or an object mapping their hashes to query strings.
+
+        Returns:
+            The number of persisted queries registered.
+
+        Raises:
+            ValueError: If a query is invalid or does not match its hash.
+        """
+
+        with open(path, encoding="utf-8") as f:
+            queries = json.load(f)
+        if isinstance(queries, dict):
+            for key, query in queries.items():
+                if query_hash(query) != key:
+                    raise ValueError(f"Persisted query {key} does not match its hash")
+            queries = list(queries.values())
+        for query in queries:
+            self.persist(schema, query)
+        logging.info(f"Registered {len(queries)} persisted GraphQL queries")
+        return len(queries)
@@ -0,0 +1,122 @@
+import hashlib
+import json
+import logging
+import time
+from collections import Counter
+from typing import Any, Dict, List, Optional
+
+from django.conf import settings
+from django.core import checks
+from django.core.cache import cache, caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+
+from common.transactions import on_commit_once
+
+
+class ResponseCache:
+    """Cache of the data of GraphQL responses to anonymous read-only queries.
+
+    Entries are stored in the default Django cache under a key namespaced by
+    a version, which is bumped whenever data that responses may contain
+    changes. Bumping the version orphans all previous entries at once, which
+    then expire after GRAPHQL_RESPONSE_CACHE_TIMEOUT.
+
+    The version has to be shared by all web and worker processes for their
+    changes to invalidate each other's responses, so responses are only
+    cached if GRAPHQL_RESPONSE_CACHE is enabled, which requires a shared
+    cache backend, see check_response_cache.
+
+    Attributes:
+        stats: A Counter of cache hits and misses in the current process,
+            which is logged every LOG_INTERVAL lookups.
+    """
+
+    VERSION_KEY = "graphql:response:version"
+    LOG_INTERVAL = 1000
+
+    def __init__(self):
+        self.stats = Counter()
+
+    @property
+    def enabled(self) -> bool:
+        return settings.GRAPHQL_RESPONSE_CACHE
+
+    def version(self) -> int:
+        version = cache.get(self.VERSION_KEY)
+        if version is None:
+            cache.add(self.VERSION_KEY, time.time_ns(), None)
+            version = cache.get(self.VERSION_KEY)
+        return version
+
+    def key(
+        self,
+        document_hash: str,
+        variables: Optional[Dict[str, Any]],
+        operation_name: Optional[str],
+    ) -> str:
+        """Returns the cache key of a response.
+
+        Args:
+            document_hash: A hash of the normalized query document.
+            variables: The variables of the request.
+            operation_name: The name of the operation to execute.
+        """
+
+        request_hash = hashlib.sha256(
+            json.dumps(
+                [document_hash, variables or {}, operation_name], sort_keys=True
+            ).encode("utf-8")
+        ).hexdigest()
+        return f"graphql:response:{self.version()}:{request_hash}"
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Returns the cached response data for a key, if any."""
+
+        data = cache.get(key)
+        self.stats["hits" if data is not None else "misses"] += 1
+        if sum(self.stats.values()) % self.LOG_INTERVAL == 0:
+            logging.info(
+                f"GraphQL response cache: {self.stats['hits']} hits, "
+                f"{self.stats['misses']} misses"
+            )
+        return data
+
+    def set(self, key: str, data: Dict[str, Any]):
+        cache.set(key, data, settings.GRAPHQL_RESPONSE_CACHE_TIMEOUT)
+
+    def invalidate(self, using: Optional[str] = None):
+        """Invalidates all cached responses once the transaction commits.
+
+        Args:
+            using: The alias of the database the transaction is on.
+        """
+
+        if not self.enabled:
+            return
+
+        def bump_version():
+            logging.debug("Invalidating cached GraphQL responses")
+            cache.set(self.VERSION_KEY, time.time_ns(), None)
+
+        on_commit_once("graphql_response_cache", bump_version, using=using)
+
+
+response_cache = ResponseCache()
+
+
+def check_response_cache(app_configs, **kwargs) -> List[checks.CheckMessage]:
+    """Warns if responses are cached in a cache local to each process."""
+
+    if response_cache.enabled and isinstance(
+        caches["default"], (LocMemCache, DummyCache)
+    ):
+        return [
+            checks.Warning(
+                "GRAPHQL_RESPONSE_CACHE is enabled with a per-process cache backend.",
+                hint="Set CACHE_URL to a cache shared by all processes, e.g. redis, "
+                "so that invalidations reach every web and worker process.",
+                id="api.W001",
+            )
+        ]
+    return []
@@ -0,0 +1,58 @@
+import hashlib
+import json
+from typing import Dict, List, NamedTuple
+
+from model_utils import Choices
+
+from shows.models import Member, Role, Show
+
+CHOICE_SETS = {
+    "school": Member.SCHOOLS,
+    "class_year": Member.CLASS_YEARS,
+    "position": Member.POSITIONS,
+    "show_priority": Show.PRIORITIES,
+    "show_status": Show.STATUSES,
+    "performance_role": Role.ROLES,
+}
+
+
+class Choice(NamedTuple):
+    value: int
+    label: str
+
+
+class ChoiceCatalog:
+    """Choice metadata of the models, serialized once per process.
+
+    The choices only change with a deploy, so their serialized forms are
+    computed up front instead of on every request, together with a hash of
+    the content to use as an ETag.
+
+    Attributes:
+        choices: A dict mapping the name of each choice set to its choices.
+        legacy_json: A dict mapping the name of each choice set to a JSON
+            object mapping values to labels.
+        content: The JSON encoded choices as served by the choices endpoint.
+        etag: A hash of the content.
+    """
+
+    def __init__(self, choice_sets: Dict[str, Choices]):
+        self.choices: Dict[str, List[Choice]] = {
+            name: [Choice(value, str(label)) for value, label in choice_set]
+            for name, choice_set in choice_sets.items()
+        }
+        self.legacy_json: Dict[str, str] = {
+            name: json.dumps({value: label for value, label in choices})
+            for name, choices in self.choices.items()
+        }
+        self.content = json.dumps(
+            {
+                name: [choice._asdict() for choice in choices]
+                for name, choices in self.choices.items()
+            },
+            sort_keys=True,
+        ).encode()
+        self.etag = hashlib.sha256(self.content).hexdigest()[:32]
+
+
+choice_catalog = ChoiceCatalog(CHOICE_SETS)
@@ -0,0 +1,147 @@
+from collections import defaultdict
+from functools import cached_property
+
+from django.core.exceptions import ObjectDoesNotExist
+from django.db.models import F, Model, QuerySet
+from promise import Promise
+from promise.dataloader import DataLoader
+
+from api.planner import prefetch_attr
+from shows.models import Member, Show, Round, Contact
+from users.models import User
+
+
+class ModelLoader(DataLoader):
+    """DataLoader for model instances by primary key.
+
+    All keys requested while resolving one level of a query are fetched with
+    a single `IN` query.
+    """
+
+    def __init__(self, queryset: QuerySet, **kwargs):
+        super().__init__(**kwargs)
+        self.queryset = queryset
+
+    def batch_load_fn(self, keys):
+        instances = self.queryset.in_bulk(keys)
+        return Promise.resolve([instances.get(key) for key in keys])
+
+    def load_related(self, instance: Model, name: str):
+        """Loads the instance referenced by a foreign key of another instance.
+
+        The instance is returned directly if it was already joined by the
+        prefetch planner.
+        """
+
+        field = instance._meta.get_field(name)
+        if field.is_cached(instance):
+            return getattr(instance, name)
+        key = getattr(instance, field.attname)
+        return None if key is None else self.load(key)
+
+
+class RelatedLoader(DataLoader):
+    """DataLoader for lists of model instances related to a key.
+
+    The key is a lookup path from the queried model to the parent, e.g.
+    `show_id` for the rounds of a show, so that the related instances of all
+    requested parents are fetched with a single `IN` query. With `many` set
+    to False, only the first related instance is loaded for each key.
+    """
+
+    def __init__(self, queryset: QuerySet, key: str, many: bool = True, **kwargs):
+        super().__init__(**kwargs)
+        self.queryset = queryset
+        self.key = key
+        self.many = many
+
+    def batch_load_fn(self, keys):
+        grouped = defaultdict(list)
+        instances = self.queryset.filter(**{f"{self.key}__in": keys}).annotate(
+            loader_key=F(self.key)
+        )
+        for instance in instances:
+            grouped[instance.loader_key].append(instance)
+        if not self.many:
+            return Promise.resolve(
+                [grouped[key][0] if key in grouped else None for key in keys]
+            )
+        return Promise.resolve([grouped.get(key, []) for key in keys])
+
+    def load_related(self, instance: Model, name: str):
+        """Loads the instances related to another instance by a relation.
+
+        The instances are returned directly if they were already fetched by
+        the prefetch planner.
+        """
+
+        if self.many:
+            prefetched = getattr(instance, prefetch_attr(name), None)
+            if prefetched is not None:
+                return prefetched
+        elif instance._meta.get_field(name).is_cached(instance):
+            try:
+                return getattr(instance, name)
+            except ObjectDoesNotExist:
+                return None
+        return self.load(instance.pk)
+
+
+class Loaders:
+    """Registry of the DataLoaders used to resolve a single request.
+
+    Loaders cache the instances they fetch, so a registry must not outlive
+    the request it was created for.
+    """
+
+    @cached_property
+    def user(self):
+        return ModelLoader(User.objects.all())
+
+    @cached_property
+    def member(self):
+        return ModelLoader(Member.objects.all())
+
+    @cached_property
+    def show(self):
+        return ModelLoader(Show.objects.all())
+
+    @cached_property
+    def contact(self):
+        return ModelLoader(Contact.objects.all())
+
+    @cached_property
+    def member_by_user(self):
+        return RelatedLoader(Member.objects.all(), "user_id", many=False)
+
+    @cached_property
+    def rounds_by_show(self):
+        return RelatedLoader(Round.objects.all(), "show_id")
+
+    @cached_property
+    def performers_by_show(self):
+        return RelatedLoader(Member.objects.all(), "performed_show")
+
+    @cached_property
+    def performed_shows_by_member(self):
+        return RelatedLoader(Show.objects.all(), "performers")
+
+    @cached_property
+    def pointed_shows_by_member(self):
+        return RelatedLoader(Show.objects.all(), "point_id")
+
+
+def get_loaders(info) -> Loaders:
+    """Returns the DataLoader registry for the request being resolved.
+
+    The registry is stored on the request context, so that all resolvers of
+    the same request share loaders and their batches.
+    """
+
+    context = info.context
+    loaders = getattr(context, "loaders", None)
+    if loaders is None:
+        loaders = Loaders()
+        if context is not None:
+            context.loaders = loaders
+    return loaders
@@ -0,0 +1,139 @@
+import base64
+import json
+from typing import Any, List, Optional, Sequence, Tuple
+
+from django.core.exceptions import ValidationError
+from django.db.models import F, Q, QuerySet
+from graphene.relay import PageInfo
+from graphene_django.settings import graphene_settings
+from graphql import GraphQLError
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Encodes the ordering key values of a row as an opaque cursor."""
+
+    payload = json.dumps([None if v is None else str(v) for v in values])
+    return base64.urlsafe_b64encode(payload.encode()).decode()
+
+
+def decode_cursor(queryset: QuerySet, keys: Sequence[str], cursor: str) -> List[Any]:
+    """Decodes a cursor into ordering key values of the queryset model.
+
+    Raises:
+        GraphQLError: If the cursor is malformed.
+    """
+
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        if len(values) != len(keys):
+            raise ValueError
+        fields = [queryset.model._meta.get_field(key) for key in keys]
+        return [
+            None if value is None else field.to_python(value)
+            for field, value in zip(fields, values)
+        ]
+    except (ValueError, TypeError, json.JSONDecodeError, ValidationError):
+        raise GraphQLError(f"Invalid cursor {cursor}")
+
+
+def keyset_filter(keys: Sequence[str], values: Sequence[Any], forward: bool) -> Q:
+    """Builds a filter for rows strictly after or before the given key values.
+
+    Rows are ordered ascending by the keys with nulls last, matching
+    `keyset_ordering`.
+    """
+
+    condition = Q(pk__in=[])
+    for i, (key, value) in enumerate(zip(keys, values)):
+        if forward:
+            if value is None:
+                continue
+            step = Q(**{f"{key}__gt": value}) | Q(**{f"{key}__isnull": True})
+        else:
+            step = (
+                Q(**{f"{key}__isnull": False})
+                if value is None
+                else Q(**{f"{key}__lt": value})
+            )
+        for prev_key, prev_value in zip(keys[:i], values[:i]):
+            step &= (
+                Q(**{f"{prev_key}__isnull": True})
+                if prev_value is None
+                else Q(**{prev_key: prev_value})
+            )
+        condition |= step
+    return condition
+
+
+def keyset_ordering(keys: Sequence[str], forward: bool) -> List:
+    return [
+        F(key).asc(nulls_last=True) if forward else F(key).desc(nulls_first=True)
+        for key in keys
+    ]
+
+
+def paginate(
+    connection_type,
+    queryset: QuerySet,
+    keys: Tuple[str, ...],
+    first: Optional[int] = None,
+    last: Optional[int] = None,
+    after: Optional[str] = None,
+    before: Optional[str] = None,
+    **kwargs,
+):
+    """Paginates a queryset into a Relay connection using keyset pagination.
+
+    Rather than counting offsets, cursors encode the ordering key values of
+    a row, so each page is a single indexed range query regardless of how
+    deep into the results it is. The last key must be unique, e.g. the
+    primary key.
+
+    Args:
+        connection_type: The graphene Connection type to return.
+        queryset: The filtered queryset to paginate.
+        keys: The field names to order and paginate by.
+        first: The number of rows to return after the `after` cursor.
+        last: The number of rows to return before the `before` cursor.
+        after: The cursor of the row to start after.
+        before: The cursor of the row to end before.
+
+    Returns:
+        An instance of the connection type.
+    """
+
+    max_limit = graphene_settings.RELAY_CONNECTION_MAX_LIMIT
+    if first is not None and last is not None:
+        raise GraphQLError("Provide only one of first or last")
+    forward = last is None
+    limit = first if forward else last
+    if limit is None or limit > max_limit:
+        limit = max_limit
+    if limit < 0:
+        raise GraphQLError("Page size must not be negative")
+
+    cursor = after if forward else before
+    if cursor is not None:
+        values = decode_cursor(queryset, keys, cursor)
+        queryset = queryset.filter(keyset_filter(keys, values, forward))
+    rows = list(queryset.order_by(*keyset_ordering(keys, forward))[: limit + 1])
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    if not forward:
+        rows.reverse()
+
+    edges = [
+        connection_type.Edge(
+            node=row, cursor=encode_cursor([getattr(row, key) for key in keys])
+        )
+        for row in rows
+    ]
+    return connection_type(
+        edges=edges,
+        page_info=PageInfo(
+            start_cursor=edges[0].cursor if edges else None,
+            end_cursor=edges[-1].cursor if edges else None,
+            has_next_page=has_more if forward else before is not None,
+            has_previous_page=after is not None if forward else has_more,
+        ),
+    )
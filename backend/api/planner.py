@@ -0,0 +1,186 @@
+from typing import Dict, List, Optional, Tuple
+
+from django.db.models import Model, Prefetch, QuerySet
+from graphene.utils.str_converters import to_snake_case
+from graphql.language.ast import Field, FragmentSpread, InlineFragment, SelectionSet
+
+
+def prefetch_attr(name: str) -> str:
+    """Returns the attribute a relation is prefetched to by the planner."""
+
+    return f"_prefetched_{name}"
+
+
+def plan_queryset(
+    queryset: QuerySet,
+    info,
+    path: Tuple[str, ...] = (),
+    extra_only: Tuple[str, ...] = (),
+) -> QuerySet:
+    """Optimizes a queryset for the GraphQL selection being resolved.
+
+    The selection set of the current field is walked alongside the model
+    relations, so that to-one relations are joined with `select_related`,
+    to-many relations are fetched with `prefetch_related` and only the
+    columns that are actually selected are loaded.
+
+    Fields of a DjangoObjectType that are not model fields must declare the
+    columns they read in an `only_hints` mapping on the type. Otherwise,
+    all columns of that model are loaded.
+
+    Args:
+        queryset: The queryset to optimize.
+        info: The resolve info of the field returning the queryset.
+        path: The names of the fields leading from the resolved field to the
+            model type, e.g. `("edges", "node")` for a connection.
+        extra_only: Additional columns to load, e.g. for ordering keys.
+
+    Returns:
+        The optimized queryset.
+    """
+
+    selection_set = _merge_selection_sets(info.field_asts)
+    graphql_type = _unwrap(info.return_type)
+    for name in path:
+        if selection_set is None:
+            break
+        selection_set = _merge_selection_sets(
+            [
+                field_ast
+                for field_ast in _selected_fields(selection_set, info)
+                if field_ast.name.value == name
+            ]
+        )
+        graphql_type = _unwrap(graphql_type.fields[name].type)
+    return _apply_plan(queryset, selection_set, graphql_type, info, extra_only)
+
+
+def _apply_plan(
+    queryset: QuerySet,
+    selection_set: Optional[SelectionSet],
+    graphql_type,
+    info,
+    extra_only: Tuple[str, ...] = (),
+) -> QuerySet:
+    select, prefetch, only = _plan(queryset.model, selection_set, graphql_type, info)
+    if select:
+        queryset = queryset.select_related(*select)
+    if prefetch:
+        queryset = queryset.prefetch_related(*prefetch)
+    if only:
+        queryset = queryset.only(*only, *extra_only)
+    return queryset
+
+
+def _plan(
+    model: type[Model],
+    selection_set: Optional[SelectionSet],
+    graphql_type,
+    info,
+    prefix: str = "",
+) -> Tuple[List[str], List[Prefetch], List[str]]:
+    select, prefetch, only = [], [], []
+    if selection_set is None or not hasattr(graphql_type, "fields"):
+        return select, prefetch, only
+
+    hints = getattr(getattr(graphql_type, "graphene_type", None), "only_hints", {})
+    model_fields = _model_fields(model)
+
+    # A field may be selected several times, e.g. under aliases or by several
+    # fragments, and is planned once for all of its selections.
+    field_asts: Dict[str, List[Field]] = {}
+    for field_ast in _selected_fields(selection_set, info):
+        field_asts.setdefault(field_ast.name.value, []).append(field_ast)
+
+    for name, asts in field_asts.items():
+        if name.startswith("__"):
+            continue
+        child_selection_set = _merge_selection_sets(asts)
+        field_name = to_snake_case(name)
+        field = model_fields.get(field_name)
+        if field_name in hints:
+            only.extend(prefix + column for column in hints[field_name])
+        elif field is None:
+            only.extend(prefix + f.name for f in model._meta.concrete_fields)
+        elif not field.is_relation:
+            only.append(prefix + field.name)
+        else:
+            child_type = _unwrap(graphql_type.fields[name].type)
+            if field.one_to_many or field.many_to_many:
+                child_queryset = _apply_plan(
+                    field.related_model._default_manager.all(),
+                    child_selection_set,
+                    child_type,
+                    info,
+                    extra_only=(field.field.name,) if field.one_to_many else (),
+                )
+                prefetch.append(
+                    Prefetch(
+                        prefix + field_name,
+                        queryset=child_queryset,
+                        to_attr=prefetch_attr(field_name),
+                    )
+                )
+            else:
+                if field.concrete:
+                    only.append(prefix + field_name)
+                select.append(prefix + field_name)
+                child_select, child_prefetch, child_only = _plan(
+                    field.related_model,
+                    child_selection_set,
+                    child_type,
+                    info,
+                    prefix=f"{prefix}{field_name}__",
+                )
+                select.extend(child_select)
+                prefetch.extend(child_prefetch)
+                only.extend(
+                    child_only
+                    or [f"{prefix}{field_name}__{field.related_model._meta.pk.name}"]
+                )
+
+    return select, prefetch, only
+
+
+def _model_fields(model: type[Model]) -> Dict:
+    """Maps the attribute names of model fields and relations to the fields."""
+
+    return {
+        (
+            field.get_accessor_name()
+            if field.auto_created and not field.concrete
+            else field.name
+        ): field
+        for field in model._meta.get_fields()
+    }
+
+
+def _merge_selection_sets(field_asts: List[Field]) -> Optional[SelectionSet]:
+    selections = [
+        selection
+        for field_ast in field_asts
+        if field_ast.selection_set is not None
+        for selection in field_ast.selection_set.selections
+    ]
+    return SelectionSet(selections=selections) if selections else None
+
+
+def _selected_fields(selection_set: SelectionSet, info) -> List[Field]:
+    """Flattens fragments in a selection set into the selected fields."""
+
+    fields = []
+    for selection in selection_set.selections:
+        if isinstance(selection, Field):
+            fields.append(selection)
+        elif isinstance(selection, FragmentSpread):
+            fragment = info.fragments[selection.name.value]
+            fields.extend(_selected_fields(fragment.selection_set, info))
+        elif isinstance(selection, InlineFragment):
+            fields.extend(_selected_fields(selection.selection_set, info))
+    return fields
+
+
+def _unwrap(graphql_type):
+    while hasattr(graphql_type, "of_type"):
+        graphql_type = graphql_type.of_type
+    return graphql_type
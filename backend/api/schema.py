@@ -1,13 +1,15 @@
-import json
-
 import graphene
 import graphql_jwt
+from django.db.models import Q
 from django.dispatch import receiver
 from graphql_jwt.decorators import login_required, staff_member_required
 from graphql_jwt.refresh_token.signals import refresh_token_rotated
 
-from shows.models import Member, Show, Role
+from shows.models import Member, Show
 from users.models import User
+from .choices import choice_catalog
+from .pagination import paginate
+from .planner import plan_queryset
 from .mutations import (
     CreateRoleMutation,
     DeleteRoleMutation,
@@ -18,7 +20,17 @@ from .mutations import (
     UpdateProfileMutation,
     UpdatePasswordMutation,
 )
-from .types import UserType, MemberType, ShowType
+from .types import (
+    UserType,
+    MemberType,
+    ShowType,
+    ChoicesType,
+    UserConnection,
+    MemberConnection,
+    ShowConnection,
+)
+
+SHOW_KEYS = ("date", "time", "id")
 
 
 @receiver(refresh_token_rotated)
@@ -26,65 +38,125 @@ def revoke_refresh_token(sender, request, refresh_token, **kwargs):
     refresh_token.revoke(request)
 
 
-def tuple_to_json(tuple_dict):
-    return json.dumps(dict((k, v) for k, v in tuple_dict))
-
-
 class Query(graphene.ObjectType):
     users = graphene.List(UserType)
     members = graphene.List(MemberType)
     shows = graphene.List(ShowType)
     me = graphene.Field(UserType)
 
-    school_choices = graphene.String()
-    class_year_choices = graphene.String()
-    position_choices = graphene.String()
-    show_priority_choices = graphene.String()
-    show_status_choices = graphene.String()
-    performance_role_choices = graphene.String()
+    users_connection = graphene.relay.ConnectionField(UserConnection)
+    members_connection = graphene.relay.ConnectionField(MemberConnection)
+    shows_connection = graphene.relay.ConnectionField(
+        ShowConnection,
+        date_from=graphene.Date(),
+        date_to=graphene.Date(),
+        status=graphene.Int(),
+        priority=graphene.Int(),
+        is_open=graphene.Boolean(),
+        performer=graphene.ID(),
+    )
+
+    choices = graphene.Field(ChoicesType, required=True)
+    school_choices = graphene.String(deprecation_reason="Use choices.school")
+    class_year_choices = graphene.String(deprecation_reason="Use choices.classYear")
+    position_choices = graphene.String(deprecation_reason="Use choices.position")
+    show_priority_choices = graphene.String(
+        deprecation_reason="Use choices.showPriority"
+    )
+    show_status_choices = graphene.String(deprecation_reason="Use choices.showStatus")
+    performance_role_choices = graphene.String(
+        deprecation_reason="Use choices.performanceRole"
+    )
 
     @staticmethod
     @staff_member_required
     def resolve_users(root, info, **kwargs):
-        return User.objects.all()
+        return plan_queryset(User.objects.all(), info)
 
     @staticmethod
     @login_required
     def resolve_members(root, info, **kwargs):
-        return Member.objects.all()
+        return plan_queryset(Member.objects.all(), info)
 
     @staticmethod
     def resolve_shows(root, info, **kwargs):
-        return Show.objects.filter(status__gt=Show.STATUSES.draft)
+        return plan_queryset(Show.objects.filter(status__gt=Show.STATUSES.draft), info)
 
     @staticmethod
     @login_required
     def resolve_me(root, info, **kwargs):
-        return User.objects.get(pk=info.context.user.pk)
+        return plan_queryset(User.objects.all(), info).get(pk=info.context.user.pk)
+
+    @staticmethod
+    @staff_member_required
+    def resolve_users_connection(root, info, **kwargs):
+        queryset = plan_queryset(User.objects.all(), info, path=("edges", "node"))
+        return paginate(UserConnection, queryset, ("id",), **kwargs)
+
+    @staticmethod
+    @login_required
+    def resolve_members_connection(root, info, **kwargs):
+        queryset = plan_queryset(Member.objects.all(), info, path=("edges", "node"))
+        return paginate(MemberConnection, queryset, ("id",), **kwargs)
+
+    @staticmethod
+    def resolve_shows_connection(
+        root,
+        info,
+        date_from=None,
+        date_to=None,
+        status=None,
+        priority=None,
+        is_open=None,
+        performer=None,
+        **kwargs,
+    ):
+        queryset = Show.objects.filter(status__gt=Show.STATUSES.draft)
+        if date_from is not None:
+            queryset = queryset.filter(date__gte=date_from)
+        if date_to is not None:
+            queryset = queryset.filter(date__lte=date_to)
+        if status is not None:
+            queryset = queryset.filter(status=status)
+        if priority is not None:
+            queryset = queryset.filter(priority=priority)
+        if is_open is not None:
+            open_filter = Q(status=Show.STATUSES.published)
+            queryset = queryset.filter(open_filter if is_open else ~open_filter)
+        if performer is not None:
+            queryset = queryset.filter(performers=performer)
+        queryset = plan_queryset(
+            queryset, info, path=("edges", "node"), extra_only=SHOW_KEYS
+        )
+        return paginate(ShowConnection, queryset, SHOW_KEYS, **kwargs)
+
+    @staticmethod
+    def resolve_choices(root, info, **kwargs):
+        return choice_catalog.choices
 
     @staticmethod
     def resolve_school_choices(root, info, **kwargs):
-        return tuple_to_json(Member.SCHOOLS)
+        return choice_catalog.legacy_json["school"]
 
     @staticmethod
     def resolve_class_year_choices(root, info, **kwargs):
-        return tuple_to_json(Member.CLASS_YEARS)
+        return choice_catalog.legacy_json["class_year"]
 
     @staticmethod
     def resolve_position_choices(root, info, **kwargs):
-        return tuple_to_json(Member.POSITIONS)
+        return choice_catalog.legacy_json["position"]
 
     @staticmethod
     def resolve_show_priority_choices(root, info, **kwargs):
-        return tuple_to_json(Show.PRIORITIES)
+        return choice_catalog.legacy_json["show_priority"]
 
     @staticmethod
     def resolve_show_status_choices(root, info, **kwargs):
-        return tuple_to_json(Show.STATUSES)
+        return choice_catalog.legacy_json["show_status"]
 
     @staticmethod
     def resolve_performance_role_choices(root, info, **kwargs):
-        return tuple_to_json(Role.ROLES)
+        return choice_catalog.legacy_json["performance_role"]
 
 
 class Mutation(graphene.ObjectType):
@@ -0,0 +1,22 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from api.cache import response_cache
+from shows.models import Contact, Member, Role, Round, Show
+from users.models import User
+
+
+@receiver(post_save, sender=Show)
+@receiver(post_delete, sender=Show)
+@receiver(post_save, sender=Round)
+@receiver(post_delete, sender=Round)
+@receiver(post_save, sender=Role)
+@receiver(post_delete, sender=Role)
+@receiver(post_save, sender=Contact)
+@receiver(post_delete, sender=Contact)
+@receiver(post_save, sender=Member)
+@receiver(post_delete, sender=Member)
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_response_cache(sender, **kwargs):
+    response_cache.invalidate()
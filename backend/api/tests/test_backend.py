@@ -0,0 +1,139 @@
+import json
+import os
+import tempfile
+from unittest.mock import patch
+
+from django.test import TestCase, SimpleTestCase
+from graphql.error import GraphQLSyntaxError
+
+import api.backend
+from api.backend import DocumentCacheBackend, query_hash
+from api.schema import schema
+
+# logging.disable(logging.WARNING)
+
+CHOICES_QUERY = "query { choices { showStatus { value label } } }"
+
+
+class TestDocumentCacheBackend(SimpleTestCase):
+    def setUp(self):
+        self.backend = DocumentCacheBackend(maxsize=2)
+
+    def test_document_is_parsed_once(self):
+        with patch("api.backend.parse", wraps=api.backend.parse) as mock_parse:
+            first = self.backend.document_from_string(schema, CHOICES_QUERY)
+            second = self.backend.document_from_string(schema, CHOICES_QUERY)
+        self.assertIs(first, second)
+        mock_parse.assert_called_once()
+        self.assertEqual(self.backend.stats, {"hits": 1, "misses": 1})
+
+        result = second.execute()
+        self.assertIsNone(result.errors)
+        self.assertTrue(result.data["choices"]["showStatus"])
+
+    def test_least_recently_used_document_is_evicted(self):
+        queries = [
+            f"query Q{i} {{ choices {{ school {{ value }} }} }}" for i in range(3)
+        ]
+        for query in queries:
+            self.backend.document_from_string(schema, query)
+        self.assertIsNone(self.backend.get(query_hash(queries[0])))
+        self.assertIsNotNone(self.backend.get(query_hash(queries[2])))
+
+    def test_invalid_document_is_validated_once(self):
+        with patch("api.backend.validate", wraps=api.backend.validate) as mock_validate:
+            for _ in range(2):
+                result = self.backend.document_from_string(
+                    schema, "query { unknownField }"
+                ).execute()
+                self.assertTrue(result.invalid)
+        mock_validate.assert_called_once()
+
+    def test_syntax_error_is_not_cached(self):
+        with self.assertRaises(GraphQLSyntaxError):
+            self.backend.document_from_string(schema, "query {")
+        self.assertEqual(len(self.backend._documents), 0)
+
+    def test_persisted_documents_are_not_evicted(self):
+        key = self.backend.persist(schema, CHOICES_QUERY)
+        for i in range(3):
+            self.backend.document_from_string(
+                schema, f"query Q{i} {{ choices {{ school {{ value }} }} }}"
+            )
+        self.assertEqual(key, query_hash(CHOICES_QUERY))
+        self.assertIsNotNone(self.backend.get(key))
+
+    def test_persist_invalid_query_error(self):
+        with self.assertRaises(ValueError):
+            self.backend.persist(schema, "query { unknownField }")
+
+    def test_load_persisted_queries(self):
+        with tempfile.NamedTemporaryFile("w", suffix=".json", delete=False) as f:
+            json.dump({query_hash(CHOICES_QUERY): CHOICES_QUERY}, f)
+        self.addCleanup(os.remove, f.name)
+        self.assertEqual(self.backend.load(schema, f.name), 1)
+        self.assertIsNotNone(self.backend.get(query_hash(CHOICES_QUERY)))
+
+
+class TestPersistedQueryView(TestCase):
+    def setUp(self):
+        backend_patcher = patch(
+            "api.views._document_backend", DocumentCacheBackend(maxsize=2)
+        )
+        backend_patcher.start()
+        self.addCleanup(backend_patcher.stop)
+
+    def post(self, **data):
+        return self.client.post(
+            "/graphql/", json.dumps(data), content_type="application/json"
+        )
+
+    def persisted_query(self, key):
+        return {"persistedQuery": {"version": 1, "sha256Hash": key}}
+
+    def test_query(self):
+        response = self.post(query=CHOICES_QUERY)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.json()["data"]["choices"]["showStatus"])
+
+    def test_persisted_query_flow(self):
+        extensions = self.persisted_query(query_hash(CHOICES_QUERY))
+
+        response = self.post(extensions=extensions)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.json()["errors"][0]["message"], "PersistedQueryNotFound"
+        )
+
+        response = self.post(query=CHOICES_QUERY, extensions=extensions)
+        self.assertEqual(response.status_code, 200)
+
+        response = self.post(extensions=extensions)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.json()["data"]["choices"]["showStatus"])
+
+    def test_persisted_query_get(self):
+        self.post(
+            query=CHOICES_QUERY,
+            extensions=self.persisted_query(query_hash(CHOICES_QUERY)),
+        )
+        response = self.client.get(
+            "/graphql/",
+            {"extensions": json.dumps(self.persisted_query(query_hash(CHOICES_QUERY)))},
+            HTTP_ACCEPT="application/json",
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.json()["data"]["choices"]["showStatus"])
+
+    def test_ad_hoc_query_is_not_persisted(self):
+        self.post(query=CHOICES_QUERY)
+        response = self.post(extensions=self.persisted_query(query_hash(CHOICES_QUERY)))
+        self.assertEqual(
+            response.json()["errors"][0]["message"], "PersistedQueryNotFound"
+        )
+
+    def test_persisted_query_hash_mismatch_error(self):
+        response = self.post(
+            query=CHOICES_QUERY, extensions=self.persisted_query("0" * 64)
+        )
+        self.assertEqual(response.status_code, 400)
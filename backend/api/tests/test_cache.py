@@ -0,0 +1,118 @@
+import json
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from faker import Faker
+
+from api.backend import DocumentCacheBackend
+from api.cache import check_response_cache, response_cache
+from shows.models import Round, Show
+from shows.tests.utils import fake_show_data
+from slack.tests.utils import PatchSlackBossMixin
+from users.tests.utils import fake_user_data
+
+# logging.disable(logging.WARNING)
+
+User = get_user_model()
+
+SHOWS_QUERY = "query { shows { id name rounds { time } } }"
+
+
+@override_settings(GRAPHQL_RESPONSE_CACHE=True)
+class TestResponseCache(PatchSlackBossMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        backend_patcher = patch(
+            "api.views._document_backend", DocumentCacheBackend(maxsize=8)
+        )
+        backend_patcher.start()
+        self.addCleanup(backend_patcher.stop)
+
+        self.faker = Faker()
+        Faker.seed(0)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.show = Show.objects.create(
+                **fake_show_data(self.faker), status=Show.STATUSES.published
+            )
+
+    def post(self, query: str, **data):
+        return self.client.post(
+            "/graphql/",
+            json.dumps({"query": query, **data}),
+            content_type="application/json",
+        )
+
+    def test_anonymous_query_is_cached(self):
+        stats = response_cache.stats.copy()
+
+        response = self.post(SHOWS_QUERY)
+        self.assertEqual(response["X-Cache"], "MISS")
+
+        with self.assertNumQueries(0):
+            cached_response = self.post(
+                "query {\n  shows { id name rounds { time } }\n}"
+            )
+        self.assertEqual(cached_response["X-Cache"], "HIT")
+        self.assertEqual(cached_response.json(), response.json())
+        self.assertEqual(response_cache.stats["hits"] - stats["hits"], 1)
+        self.assertEqual(response_cache.stats["misses"] - stats["misses"], 1)
+
+    def test_variables_are_part_of_key(self):
+        query = "query Shows($first: Int) { showsConnection(first: $first) { edges { node { id } } } }"
+        self.post(query, variables={"first": 1})
+        self.assertEqual(self.post(query, variables={"first": 2})["X-Cache"], "MISS")
+        self.assertEqual(self.post(query, variables={"first": 1})["X-Cache"], "HIT")
+
+    def test_save_invalidates_cache(self):
+        self.post(SHOWS_QUERY)
+        with self.captureOnCommitCallbacks(execute=True):
+            Round.objects.create(show=self.show, time="12:00")
+
+        response = self.post(SHOWS_QUERY)
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertEqual(
+            response.json()["data"]["shows"][0]["rounds"], [{"time": "12:00:00"}]
+        )
+
+    def test_delete_invalidates_cache(self):
+        self.post(SHOWS_QUERY)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.show.delete()
+
+        response = self.post(SHOWS_QUERY)
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertEqual(response.json()["data"]["shows"], [])
+
+    def test_authenticated_query_is_not_cached(self):
+        user = User.objects.create(**fake_user_data(self.faker))
+        self.client.force_login(user)
+        self.assertFalse(self.post(SHOWS_QUERY).has_header("X-Cache"))
+
+    def test_query_with_errors_is_not_cached(self):
+        self.post("query { me { id } }")
+        self.assertEqual(self.post("query { me { id } }")["X-Cache"], "MISS")
+
+    def test_mutation_is_not_cached(self):
+        response = self.post("mutation { logoutUser { success } }")
+        self.assertFalse(response.has_header("X-Cache"))
+
+    def test_stats_are_logged(self):
+        with patch.object(response_cache, "LOG_INTERVAL", 2), self.assertLogs(
+            level="INFO"
+        ) as logs:
+            self.post(SHOWS_QUERY)
+            self.post(SHOWS_QUERY)
+        self.assertTrue(any("GraphQL response cache" in line for line in logs.output))
+
+    @override_settings(GRAPHQL_RESPONSE_CACHE=False)
+    def test_disabled_cache(self):
+        self.post(SHOWS_QUERY)
+        self.assertFalse(self.post(SHOWS_QUERY).has_header("X-Cache"))
+        self.assertEqual(check_response_cache(None), [])
+
+    def test_per_process_cache_warning(self):
+        self.assertEqual(check_response_cache(None)[0].id, "api.W001")
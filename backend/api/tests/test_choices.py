@@ -0,0 +1,69 @@
+import json
+
+from django.test import RequestFactory, SimpleTestCase
+
+from api.choices import choice_catalog
+from api.schema import schema
+from shows.models import Member, Role, Show
+
+# logging.disable(logging.WARNING)
+
+
+class TestChoicesQuery(SimpleTestCase):
+    def execute(self, query: str):
+        result = schema.execute(query, context_value=RequestFactory().get("/"))
+        self.assertIsNone(result.errors)
+        return result.data
+
+    def test_choices_query(self):
+        data = self.execute("""
+            query {
+                choices {
+                    school { value label }
+                    showStatus { value label }
+                    performanceRole { value label }
+                }
+            }
+            """)
+        self.assertEqual(
+            data["choices"]["showStatus"],
+            [{"value": value, "label": label} for value, label in Show.STATUSES],
+        )
+        self.assertEqual(len(data["choices"]["school"]), len(Member.SCHOOLS))
+        self.assertEqual(len(data["choices"]["performanceRole"]), len(Role.ROLES))
+
+    def test_legacy_choices_query(self):
+        data = self.execute("query { showStatusChoices classYearChoices }")
+        self.assertEqual(
+            json.loads(data["showStatusChoices"]),
+            {str(value): label for value, label in Show.STATUSES},
+        )
+        self.assertEqual(
+            json.loads(data["classYearChoices"]),
+            {str(value): label for value, label in Member.CLASS_YEARS},
+        )
+
+
+class TestChoicesView(SimpleTestCase):
+    def test_get_choices(self):
+        response = self.client.get("/api/choices/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["ETag"], f'"{choice_catalog.etag}"')
+        self.assertIn("no-cache", response["Cache-Control"])
+        self.assertEqual(
+            response.json()["position"][0],
+            {"value": Member.POSITIONS.general_member, "label": "General Member"},
+        )
+
+    def test_get_choices_not_modified(self):
+        etag = self.client.get("/api/choices/")["ETag"]
+        response = self.client.get("/api/choices/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b"")
+
+    def test_get_choices_stale_etag(self):
+        response = self.client.get("/api/choices/", HTTP_IF_NONE_MATCH='"stale"')
+        self.assertEqual(response.status_code, 200)
+
+    def test_post_choices_not_allowed(self):
+        self.assertEqual(self.client.post("/api/choices/").status_code, 405)
@@ -0,0 +1,250 @@
+import base64
+import json
+from datetime import date, time
+
+from django.contrib.auth import get_user_model
+from django.contrib.sessions.models import Session
+from django.test import TestCase, RequestFactory
+from faker import Faker
+
+from api.schema import schema
+from shows.models import Show, Round, Role, Contact
+from shows.tests.utils import fake_show_data, fake_round_data
+from slack.tests.utils import PatchSlackBossMixin
+from users.tests.utils import fake_user_data
+
+# logging.disable(logging.WARNING)
+
+User = get_user_model()
+
+SHOWS_QUERY = """
+    query {
+        shows {
+            id
+            name
+            rounds { id time show { id } }
+            point { id user { email } }
+            contact { id firstName }
+            performers { id user { email member { id } } }
+        }
+    }
+"""
+
+
+class TestShowsQuery(PatchSlackBossMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+
+        self.faker = Faker()
+        Faker.seed(0)
+
+        self.members = [
+            User.objects.create(**user_data).member
+            for user_data in fake_user_data(self.faker, count=3)
+        ]
+        self.contact = Contact.objects.create(first_name="Tom", last_name="Hanks")
+
+    def create_shows(self, count: int):
+        show_data_list = fake_show_data(self.faker, count=count)
+        if count == 1:
+            show_data_list = [show_data_list]
+        for show_data in show_data_list:
+            show = Show.objects.create(
+                **show_data,
+                point=self.members[0],
+                contact=self.contact,
+                status=Show.STATUSES.published,
+            )
+            for round_data in fake_round_data(self.faker, count=2):
+                Round.objects.create(show=show, time=round_data["time"])
+            for performer in self.members:
+                Role.objects.create(show=show, performer=performer)
+
+    def execute(self, query: str):
+        result = schema.execute(query, context_value=RequestFactory().get("/"))
+        self.assertIsNone(result.errors)
+        return result.data
+
+    def test_shows_query_is_batched(self):
+        self.create_shows(count=2)
+        with self.assertNumQueries(3):
+            data = self.execute(SHOWS_QUERY)
+        self.assertEqual(len(data["shows"]), 2)
+
+        self.create_shows(count=5)
+        with self.assertNumQueries(3):
+            data = self.execute(SHOWS_QUERY)
+        self.assertEqual(len(data["shows"]), 7)
+
+    def test_shows_query_only_fetches_selected_columns(self):
+        self.create_shows(count=1)
+        query = """
+            query {
+                shows { ...ShowFields }
+            }
+            fragment ShowFields on ShowType {
+                name
+                isOpen
+            }
+        """
+        with self.assertNumQueries(1) as context:
+            data = self.execute(query)
+        self.assertTrue(data["shows"][0]["isOpen"])
+        sql = context.captured_queries[0]["sql"]
+        self.assertIn('"shows_show"."status"', sql)
+        self.assertNotIn('"shows_show"."address"', sql)
+
+    def test_shows_query_resolves_relations(self):
+        self.create_shows(count=1)
+        show = self.execute(SHOWS_QUERY)["shows"][0]
+        self.assertEqual(len(show["rounds"]), 2)
+        self.assertEqual(show["rounds"][0]["show"]["id"], show["id"])
+        self.assertEqual(show["point"]["user"]["email"], self.members[0].user.email)
+        self.assertEqual(show["contact"]["firstName"], self.contact.first_name)
+        self.assertEqual(
+            sorted(performer["user"]["email"] for performer in show["performers"]),
+            sorted(member.user.email for member in self.members),
+        )
+
+    def test_shows_query_with_repeated_relations(self):
+        self.create_shows(count=1)
+
+        with self.assertNumQueries(2):
+            data = self.execute(
+                "{ shows { performers { id } performers { user { email } } } }"
+            )
+        performers = data["shows"][0]["performers"]
+        self.assertEqual(len(performers), 3)
+        self.assertTrue(all(p["id"] and p["user"]["email"] for p in performers))
+
+        with self.assertNumQueries(2):
+            data = self.execute(
+                "{ shows { a: performers { id } b: performers { position } } }"
+            )
+        self.assertEqual(len(data["shows"][0]["a"]), 3)
+        self.assertEqual(len(data["shows"][0]["b"]), 3)
+
+        query = """
+            query {
+                shows { ...RoundTimes ...RoundIds }
+            }
+            fragment RoundTimes on ShowType { rounds { time } }
+            fragment RoundIds on ShowType { rounds { id } }
+        """
+        with self.assertNumQueries(2):
+            data = self.execute(query)
+        rounds = data["shows"][0]["rounds"]
+        self.assertEqual(len(rounds), 2)
+        self.assertTrue(all(r["id"] and r["time"] for r in rounds))
+
+
+SHOWS_CONNECTION_QUERY = """
+    query ($first: Int, $after: String, $last: Int, $before: String, $dateFrom: Date) {
+        showsConnection(
+            first: $first, after: $after, last: $last, before: $before, dateFrom: $dateFrom
+        ) {
+            edges { cursor node { id date time } }
+            pageInfo { hasNextPage hasPreviousPage startCursor endCursor }
+        }
+    }
+"""
+
+
+class TestShowsConnectionQuery(PatchSlackBossMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+
+        faker = Faker()
+        Faker.seed(0)
+
+        self.shows = []
+        for i, show_data in enumerate(fake_show_data(faker, count=5)):
+            show = Show.objects.create(
+                name=show_data["name"],
+                date=date(2023, 1, 1 + i // 2),
+                status=Show.STATUSES.published,
+            )
+            if i % 2 == 0:
+                Round.objects.create(show=show, time=time(10 + i))
+            self.shows.append(show)
+        Show.objects.create(name="Draft show", date=date(2023, 1, 1))
+
+        self.ordered_ids = [
+            str(show.id)
+            for show in sorted(
+                self.shows, key=lambda s: (s.date, s.time is None, s.time, s.id)
+            )
+        ]
+
+    def execute(self, **variables):
+        result = schema.execute(
+            SHOWS_CONNECTION_QUERY,
+            variables=variables,
+            context_value=RequestFactory().get("/"),
+        )
+        self.assertIsNone(result.errors)
+        return result.data["showsConnection"]
+
+    def test_paginate_forward(self):
+        ids, after, has_next_page = [], None, True
+        while has_next_page:
+            with self.assertNumQueries(1):
+                page = self.execute(first=2, after=after)
+            ids.extend(edge["node"]["id"] for edge in page["edges"])
+            after = page["pageInfo"]["endCursor"]
+            has_next_page = page["pageInfo"]["hasNextPage"]
+        self.assertEqual(ids, self.ordered_ids)
+
+    def test_paginate_backward(self):
+        page = self.execute(last=2)
+        self.assertEqual(
+            [edge["node"]["id"] for edge in page["edges"]], self.ordered_ids[-2:]
+        )
+        self.assertTrue(page["pageInfo"]["hasPreviousPage"])
+
+        page = self.execute(last=2, before=page["pageInfo"]["startCursor"])
+        self.assertEqual(
+            [edge["node"]["id"] for edge in page["edges"]], self.ordered_ids[-4:-2]
+        )
+
+    def test_filter_date_from(self):
+        page = self.execute(first=10, dateFrom="2023-01-02")
+        self.assertEqual(
+            [edge["node"]["id"] for edge in page["edges"]], self.ordered_ids[2:]
+        )
+        self.assertFalse(page["pageInfo"]["hasNextPage"])
+
+    def test_invalid_cursor(self):
+        bad_date = base64.urlsafe_b64encode(
+            json.dumps(["not-a-date", "12:00:00", 1]).encode()
+        ).decode()
+        for cursor in ["invalid", bad_date]:
+            result = schema.execute(
+                SHOWS_CONNECTION_QUERY,
+                variables={"first": 1, "after": cursor},
+                context_value=RequestFactory().get("/"),
+            )
+            self.assertEqual(result.errors[0].message, f"Invalid cursor {cursor}")
+
+
+class TestLogoutUserMutation(PatchSlackBossMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+
+        faker = Faker()
+        Faker.seed(0)
+
+        self.user = User.objects.create(**fake_user_data(faker))
+
+    def test_logout_user_ends_sessions(self):
+        self.client.force_login(self.user)
+        request = RequestFactory().post("/")
+        request.user = self.user
+
+        result = schema.execute(
+            "mutation { logoutUser { success } }", context_value=request
+        )
+
+        self.assertIsNone(result.errors)
+        self.assertTrue(result.data["logoutUser"]["success"])
+        self.assertFalse(Session.objects.exists())
@@ -3,6 +3,7 @@ from graphene import Scalar
 from graphene_django import DjangoObjectType
 from graphene_django.utils import camelize
 
+from api.loaders import get_loaders
 from common.exceptions import WrongUsage
 from shows.models import Member, Show, Round, Contact, Role
 from users.models import User
@@ -13,6 +14,9 @@ class UserType(DjangoObjectType):
         model = User
         fields = ("id", "email", "first_name", "last_name", "phone", "member")
 
+    def resolve_member(self, info):
+        return get_loaders(info).member_by_user.load_related(self, "member")  # noqa
+
 
 class MemberType(DjangoObjectType):
     class Meta:
@@ -28,6 +32,19 @@ class MemberType(DjangoObjectType):
         )
         convert_choices_to_enum = False
 
+    def resolve_user(self, info):
+        return get_loaders(info).user.load_related(self, "user")  # noqa
+
+    def resolve_performed_shows(self, info):
+        return get_loaders(info).performed_shows_by_member.load_related(
+            self, "performed_shows"
+        )
+
+    def resolve_pointed_shows(self, info):
+        return get_loaders(info).pointed_shows_by_member.load_related(
+            self, "pointed_shows"
+        )
+
 
 class ShowType(DjangoObjectType):
     class Meta:
@@ -56,18 +73,35 @@ class ShowType(DjangoObjectType):
     is_open = graphene.Boolean()
     is_pending = graphene.Boolean()
 
+    only_hints = {"is_open": ["status"], "is_pending": ["pending"]}
+
     def resolve_is_open(self, info):
         return self.is_open()  # noqa
 
     def resolve_is_pending(self, info):
         return self.pending  # noqa
 
+    def resolve_rounds(self, info):
+        return get_loaders(info).rounds_by_show.load_related(self, "rounds")  # noqa
+
+    def resolve_performers(self, info):
+        return get_loaders(info).performers_by_show.load_related(self, "performers")
+
+    def resolve_point(self, info):
+        return get_loaders(info).member.load_related(self, "point")  # noqa
+
+    def resolve_contact(self, info):
+        return get_loaders(info).contact.load_related(self, "contact")  # noqa
+
 
 class RoundType(DjangoObjectType):
     class Meta:
         model = Round
         fields = ("id", "show", "time")
 
+    def resolve_show(self, info):
+        return get_loaders(info).show.load_related(self, "show")  # noqa
+
 
 class ContactType(DjangoObjectType):
     class Meta:
@@ -80,6 +114,41 @@ class RoleType(DjangoObjectType):
         model = Role
         fields = ("id", "show", "performer", "role")
 
+    def resolve_show(self, info):
+        return get_loaders(info).show.load_related(self, "show")  # noqa
+
+    def resolve_performer(self, info):
+        return get_loaders(info).member.load_related(self, "performer")  # noqa
+
+
+class ChoiceType(graphene.ObjectType):
+    value = graphene.Int(required=True)
+    label = graphene.String(required=True)
+
+
+class ChoicesType(graphene.ObjectType):
+    school = graphene.List(graphene.NonNull(ChoiceType), required=True)
+    class_year = graphene.List(graphene.NonNull(ChoiceType), required=True)
+    position = graphene.List(graphene.NonNull(ChoiceType), required=True)
+    show_priority = graphene.List(graphene.NonNull(ChoiceType), required=True)
+    show_status = graphene.List(graphene.NonNull(ChoiceType), required=True)
+    performance_role = graphene.List(graphene.NonNull(ChoiceType), required=True)
+
+
+class UserConnection(graphene.relay.Connection):
+    class Meta:
+        node = UserType
+
+
+class MemberConnection(graphene.relay.Connection):
+    class Meta:
+        node = MemberType
+
+
+class ShowConnection(graphene.relay.Connection):
+    class Meta:
+        node = ShowType
+
 
 class ExpectedErrorType(Scalar):
     @staticmethod
@@ -0,0 +1,156 @@
+import json
+import os
+
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseBadRequest
+from django.utils.cache import patch_cache_control
+from django.views.decorators.http import condition, require_safe
+from graphene_django.settings import graphene_settings
+from graphene_django.views import GraphQLView, HttpError
+from graphql.error import GraphQLError
+from graphql.execution import ExecutionResult
+from graphql_jwt.settings import jwt_settings
+
+from api.backend import DocumentCacheBackend, query_hash
+from api.cache import response_cache
+from api.choices import choice_catalog
+
+_document_backend = None
+
+
+def get_document_backend() -> DocumentCacheBackend:
+    """Returns the document cache backend shared by all GraphQL views.
+
+    Persisted queries are loaded from GRAPHQL_PERSISTED_QUERIES on first use,
+    if the file exists.
+    """
+
+    global _document_backend
+    if _document_backend is None:
+        backend = DocumentCacheBackend(maxsize=settings.GRAPHQL_DOCUMENT_CACHE_SIZE)
+        path = settings.GRAPHQL_PERSISTED_QUERIES
+        if path and os.path.exists(path):
+            backend.load(graphene_settings.SCHEMA, path)
+        _document_backend = backend
+    return _document_backend
+
+
+class PersistedQueryView(GraphQLView):
+    """GraphQL view which accepts persisted queries by their sha256 hash.
+
+    Follows the automatic persisted queries protocol of Apollo: the hash is
+    sent in `extensions.persistedQuery.sha256Hash`, optionally along with the
+    query string to register it for subsequent requests. Requests for a hash
+    which is neither persisted nor registered fail with a
+    PersistedQueryNotFound error, so that clients retry with the full query.
+
+    Responses to queries by anonymous users are served from the response
+    cache, which is reported in the X-Cache header. When the request is
+    profiled for debugging, see InstrumentationMiddleware, the profile is
+    returned in `extensions.performance`.
+    """
+
+    def __init__(self, *args, **kwargs):
+        kwargs.setdefault("backend", get_document_backend())
+        super().__init__(*args, **kwargs)
+
+    def get_graphql_params(self, request, data):
+        query, variables, operation_name, id = super().get_graphql_params(request, data)
+        extensions = request.GET.get("extensions") or data.get("extensions")
+        if isinstance(extensions, str):
+            try:
+                extensions = json.loads(extensions)
+            except ValueError:
+                raise HttpError(HttpResponseBadRequest("Extensions are invalid JSON."))
+        persisted_query = (extensions or {}).get("persistedQuery")
+        if not persisted_query:
+            return query, variables, operation_name, id
+
+        key = persisted_query.get("sha256Hash")
+        if query:
+            if query_hash(query) != key:
+                raise HttpError(
+                    HttpResponseBadRequest("provided sha does not match query")
+                )
+            try:
+                self.backend.register(self.schema, query)
+            except GraphQLError:
+                pass  # Reported when the query is executed
+            return query, variables, operation_name, id
+
+        document = self.backend.get_persisted(key) if key else None
+        if document is None:
+            # Reported with status 200 like Apollo Server does, since Apollo
+            # clients stop sending hashes after a 400 response
+            raise HttpError(HttpResponse(), "PersistedQueryNotFound")
+        return document.document_string, variables, operation_name, id
+
+    def dispatch(self, request, *args, **kwargs):
+        response = super().dispatch(request, *args, **kwargs)
+        cache_status = getattr(request, "graphql_cache_status", None)
+        if cache_status is not None:
+            response["X-Cache"] = cache_status
+        return response
+
+    def execute_graphql_request(
+        self, request, data, query, variables, operation_name, show_graphiql=False
+    ):
+        key = self.response_cache_key(request, query, variables, operation_name)
+        if key is not None:
+            cached_data = response_cache.get(key)
+            request.graphql_cache_status = "MISS" if cached_data is None else "HIT"
+            if cached_data is not None:
+                return ExecutionResult(data=cached_data)
+
+        result = super().execute_graphql_request(
+            request, data, query, variables, operation_name, show_graphiql
+        )
+        if key is not None and result is not None and not result.errors:
+            response_cache.set(key, result.data)
+        return result
+
+    def json_encode(self, request, d, pretty=False):
+        profile = getattr(request, "profile", None)
+        if profile is not None and profile.debug and isinstance(d, dict):
+            d = {**d, "extensions": {"performance": profile.as_dict()}}
+        return super().json_encode(request, d, pretty)
+
+    def response_cache_key(self, request, query, variables, operation_name):
+        """Returns the response cache key of a request, if it may be cached.
+
+        Only queries by anonymous users are cached, since their responses do
+        not depend on who makes the request, and only if the response cache
+        is enabled.
+        """
+
+        user = getattr(request, "user", None)
+        if (
+            not response_cache.enabled
+            or not query
+            or (user is not None and user.is_authenticated)
+            or "HTTP_AUTHORIZATION" in request.META
+            or jwt_settings.JWT_COOKIE_NAME in request.COOKIES
+        ):
+            return None
+        try:
+            document = self.backend.document_from_string(self.schema, query)
+        except Exception:
+            return None
+        if document.get_operation_type(operation_name) != "query":
+            return None
+        return response_cache.key(document.normalized_hash, variables, operation_name)
+
+
+@require_safe
+@condition(etag_func=lambda request: choice_catalog.etag)
+def choices_view(request):
+    """Serves the model choices as JSON.
+
+    The choices are static per deploy, so responses carry a content hash
+    ETag, and conditional requests with a matching If-None-Match header are
+    answered with 304 Not Modified.
+    """
+
+    response = HttpResponse(choice_catalog.content, content_type="application/json")
+    patch_cache_control(response, public=True, no_cache=True)
+    return response
@@ -0,0 +1,58 @@
+from typing import Dict, Sequence
+
+from django.contrib import admin
+from django.utils import timezone
+
+
+class MemoizedChoicesMixin:
+    """Admin mixin rendering the options of foreign key selects once per request.
+
+    A model choice field queries its options, and renders a label for each of
+    them, every time a form is rendered. Inline forms and the repeated
+    formset construction of the change view multiply this per row. For the
+    fields in `memoized_choice_fields`, the options are instead evaluated once
+    per request and shared by all forms, with the relations used by their
+    labels joined in.
+
+    Attributes:
+        memoized_choice_fields: A dict mapping the names of foreign key fields
+            to the relations to select_related() for their option labels.
+    """
+
+    memoized_choice_fields: Dict[str, Sequence[str]] = {}
+
+    def formfield_for_foreignkey(self, db_field, request, **kwargs):
+        if (
+            db_field.name not in self.memoized_choice_fields
+            or db_field.name in self.get_autocomplete_fields(request)
+            or db_field.name in self.raw_id_fields
+        ):
+            return super().formfield_for_foreignkey(db_field, request, **kwargs)
+
+        if "queryset" not in kwargs:
+            queryset = self.get_field_queryset(None, db_field, request)
+            if queryset is None:
+                queryset = db_field.remote_field.model._default_manager.all()
+            kwargs["queryset"] = queryset.select_related(
+                *self.memoized_choice_fields[db_field.name]
+            )
+        formfield = super().formfield_for_foreignkey(db_field, request, **kwargs)
+
+        if not hasattr(request, "memoized_choices"):
+            request.memoized_choices = {}
+        if db_field not in request.memoized_choices:
+            request.memoized_choices[db_field] = [
+                (getattr(value, "value", value), label)
+                for value, label in formfield.choices
+            ]
+        formfield.choices = request.memoized_choices[db_field]
+        return formfield
+
+
+@admin.action(description="Retry selected %(verbose_name_plural)s")
+def retry(modeladmin, request, queryset):
+    """Admin action making entries of an outbox model due for a fresh attempt."""
+
+    queryset.update(
+        status=queryset.model.STATUSES.pending, attempts=0, run_after=timezone.now()
+    )
@@ -0,0 +1,52 @@
+import time
+from typing import Type
+
+from django.core.management.base import BaseCommand
+
+from common.models import OutboxModel
+
+
+class OutboxCommand(BaseCommand):
+    """Base management command for workers polling a transactional outbox.
+
+    Attributes:
+        model: The outbox model whose due entries are processed.
+        verb: The past tense of the operation, used in the output, e.g.
+            "Delivered".
+    """
+
+    model: Type[OutboxModel]
+    verb = "Executed"
+
+    def add_arguments(self, parser):
+        noun = self.model._meta.verbose_name_plural
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help=f"Keep polling for new {noun} instead of exiting when none are due",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=5.0,
+            help=f"Seconds to wait between polls when no {noun} are due",
+        )
+        parser.add_argument(
+            "--limit",
+            type=int,
+            default=50,
+            help=f"Maximum number of {noun} to process per poll",
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            succeeded, failed = self.model.objects.process(limit=options["limit"])
+            if succeeded or failed:
+                self.stdout.write(
+                    f"{self.verb} {succeeded + failed} "
+                    f"{self.model._meta.verbose_name_plural} ({failed} failed)"
+                )
+            if not options["loop"]:
+                break
+            if not (succeeded or failed):
+                time.sleep(options["interval"])
@@ -1,13 +1,43 @@
-import inspect
+from contextlib import contextmanager
+from contextvars import ContextVar
 from functools import wraps
 
+_raw_loading = ContextVar("raw_loading", default=False)
+
+
+@contextmanager
+def raw_loading():
+    """Disables signal handlers decorated with disable_for_loaddata.
+
+    Use this when loading data in bulk outside of the loaddata command, which
+    already marks its saves as raw.
+    """
+
+    token = _raw_loading.set(True)
+    try:
+        yield
+    finally:
+        _raw_loading.reset(token)
+
+
+def is_raw_loading() -> bool:
+    """Returns whether data is being loaded within raw_loading."""
+
+    return _raw_loading.get()
+
 
 def disable_for_loaddata(signal_handler):
+    """Skips a model signal handler while fixtures or bulk data are loaded.
+
+    Fixture saves are detected through the `raw` argument that Django sends
+    with pre_save and post_save during loaddata, other bulk loads through
+    the raw_loading context manager.
+    """
+
     @wraps(signal_handler)
     def wrapper(*args, **kwargs):
-        for fr in inspect.stack():
-            if inspect.getmodulename(fr[1]) == "loaddata":
-                return
+        if kwargs.get("raw") or _raw_loading.get():
+            return
         signal_handler(*args, **kwargs)
 
     return wrapper
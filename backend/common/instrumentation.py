@@ -0,0 +1,239 @@
+import hmac
+import random
+import time
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, Optional
+
+from django.conf import settings
+from django.db import connections
+from django.db.models import QuerySet
+from graphql_jwt.exceptions import JSONWebTokenError
+from graphql_jwt.shortcuts import get_user_by_token
+from graphql_jwt.utils import get_http_authorization
+
+CATEGORIES = {"sql": "queries", "slack": "calls", "email": "emails"}
+
+DEBUG_HEADER = "HTTP_X_DEBUG_PERFORMANCE"
+
+
+class Timing:
+    """Number and total duration of the operations of a category."""
+
+    __slots__ = ["count", "duration"]
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+    def add(self, seconds: float, count: int = 1):
+        self.count += count
+        self.duration += seconds
+
+    def as_dict(self) -> dict:
+        return {"count": self.count, "duration": round(self.duration * 1000, 3)}
+
+
+class RequestProfile:
+    """Counts and times the SQL queries, Slack calls and emails of a request.
+
+    Operations are also attributed to the top-level GraphQL field whose
+    subtree was being resolved when they happened, see
+    ResolverProfilingMiddleware.
+
+    Attributes:
+        debug: Whether the summary should be returned to the client.
+        totals: The Timing of each category over the whole request.
+        fields: The Timings of the resolvers and of each category, by
+            top-level field.
+    """
+
+    def __init__(self, debug: bool = False):
+        self.debug = debug
+        self.start = time.perf_counter()
+        self.totals: Dict[str, Timing] = {category: Timing() for category in CATEGORIES}
+        self.fields: Dict[str, Dict[str, Timing]] = {}
+        self.field: Optional[str] = None
+
+    def record(self, category: str, seconds: float, count: int = 1):
+        self.totals[category].add(seconds, count)
+        if self.field is not None:
+            self.fields[self.field][category].add(seconds, count)
+
+    def enter_field(self, name: str):
+        """Attributes subsequent operations to a top-level GraphQL field.
+
+        Args:
+            name: The response key of the field.
+        """
+
+        if name not in self.fields:
+            self.fields[name] = {
+                category: Timing() for category in ["resolve", *CATEGORIES]
+            }
+        self.field = name
+
+    def duration(self) -> float:
+        return time.perf_counter() - self.start
+
+    def as_dict(self) -> dict:
+        """Returns a summary of the profile, with durations in milliseconds."""
+
+        return {
+            "duration": round(self.duration() * 1000, 3),
+            **{category: timing.as_dict() for category, timing in self.totals.items()},
+            "fields": {
+                name: {
+                    category: timing.as_dict() for category, timing in timings.items()
+                }
+                for name, timings in self.fields.items()
+            },
+        }
+
+    def server_timing(self) -> str:
+        """Returns the summary of the profile as a Server-Timing header."""
+
+        metrics = [
+            f'{category};desc="{timing.count} {CATEGORIES[category]}";'
+            f"dur={timing.duration * 1000:.3f}"
+            for category, timing in self.totals.items()
+        ]
+        metrics.append(f"total;dur={self.duration() * 1000:.3f}")
+        return ", ".join(metrics)
+
+
+current_profile: ContextVar[Optional[RequestProfile]] = ContextVar(
+    "current_profile", default=None
+)
+
+
+def record(category: str, seconds: float, count: int = 1):
+    """Records an operation in the profile of the current request, if any.
+
+    Args:
+        category: One of `sql`, `slack` or `email`.
+        seconds: The duration of the operation.
+        count: The number of operations.
+    """
+
+    profile = current_profile.get()
+    if profile is not None:
+        profile.record(category, seconds, count)
+
+
+@contextmanager
+def timed(category: str, count: int = 1) -> Iterator[None]:
+    """Records the enclosed operations in the profile of the current request.
+
+    Args:
+        category: One of `sql`, `slack` or `email`.
+        count: The number of operations enclosed.
+    """
+
+    profile = current_profile.get()
+    if profile is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        profile.record(category, time.perf_counter() - start, count)
+
+
+def time_query(execute, sql, params, many, context):
+    with timed("sql"):
+        return execute(sql, params, many, context)
+
+
+@contextmanager
+def profiling(profile: RequestProfile) -> Iterator[RequestProfile]:
+    """Makes a profile current, timing the queries on all databases."""
+
+    token = current_profile.set(profile)
+    try:
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(time_query))
+            yield profile
+    finally:
+        current_profile.reset(token)
+
+
+class InstrumentationMiddleware:
+    """Profiles a sample of requests, reporting them in a Server-Timing header.
+
+    A fraction INSTRUMENTATION_SAMPLE_RATE of requests is profiled, so that
+    the middleware can stay enabled in production. Requests with an
+    authorized X-Debug-Performance header, whose value matches
+    INSTRUMENTATION_DEBUG_TOKEN or which is sent by staff, signed in with a
+    session or a JSON Web Token, or with DEBUG enabled, are always profiled, and the summary is also returned in the
+    `extensions` of GraphQL responses. An unauthorized header is ignored, so
+    that it cannot be used to force profiling.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        debug = self.debug_requested(request)
+        if not debug and random.random() >= settings.INSTRUMENTATION_SAMPLE_RATE:
+            return self.get_response(request)
+
+        request.profile = RequestProfile(debug=debug)
+        with profiling(request.profile):
+            response = self.get_response(request)
+        response["Server-Timing"] = request.profile.server_timing()
+        return response
+
+    @staticmethod
+    def debug_requested(request) -> bool:
+        """Returns whether a request carries an authorized debug header."""
+
+        token = request.META.get(DEBUG_HEADER)
+        if not token:
+            return False
+        if settings.INSTRUMENTATION_DEBUG_TOKEN and hmac.compare_digest(
+            token.encode(), settings.INSTRUMENTATION_DEBUG_TOKEN.encode()
+        ):
+            return True
+        if settings.DEBUG:
+            return True
+        user = getattr(request, "user", None)
+        if user is not None and user.is_authenticated:
+            return user.is_staff
+        # Users signed in with a JSON Web Token are only authenticated by the
+        # GraphQL middleware, once profiling has already been decided.
+        jwt = get_http_authorization(request)
+        if not jwt:
+            return False
+        try:
+            return get_user_by_token(jwt, request).is_staff
+        except JSONWebTokenError:
+            return False
+
+
+class ResolverProfilingMiddleware:
+    """Graphene middleware attributing operations to top-level fields.
+
+    graphql-core completes the values returned by resolvers, e.g. iterates
+    over the querysets of list fields, once all the top-level fields have been
+    resolved. Resolvers at every depth thus mark their top-level field as the
+    current one again, and querysets returned by top-level resolvers are
+    evaluated while it is current.
+    """
+
+    def resolve(self, next, root, info, **args):
+        profile = current_profile.get()
+        if profile is None:
+            return next(root, info, **args)
+
+        name = str(info.path[0])
+        start = time.perf_counter()
+        profile.enter_field(name)
+        result = next(root, info, **args)
+        if len(info.path) == 1 and result.is_fulfilled:
+            if isinstance(result.value, QuerySet):
+                len(result.value)
+        profile.fields[name]["resolve"].add(time.perf_counter() - start)
+        return result
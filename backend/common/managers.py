@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Iterable, Tuple
+
+from django.db import models
+from django.db.models import F, QuerySet
+from django.utils import timezone
+
+if TYPE_CHECKING:
+    from common.models import OutboxModel
+
+
+class OutboxManager(models.Manager):
+    """Model manager for subclasses of OutboxModel"""
+
+    def due(self) -> QuerySet:
+        """Returns pending entries which are ready to be attempted."""
+
+        return self.filter(
+            status=self.model.STATUSES.pending, run_after__lte=timezone.now()
+        )
+
+    def claim(self, entry: OutboxModel) -> bool:
+        """Claims an entry for execution by the current worker.
+
+        The claim is a conditional update on the attempt counter, so that
+        concurrent workers never execute the same attempt twice. The entry is
+        leased until the retry delay passes, after which it becomes due again
+        if the worker dies mid-attempt.
+
+        Args:
+            entry: The entry to claim.
+
+        Returns:
+            A bool indicating whether the entry was claimed.
+        """
+
+        claimed = self.filter(
+            pk=entry.pk, status=self.model.STATUSES.pending, attempts=entry.attempts
+        ).update(
+            attempts=F("attempts") + 1,
+            run_after=timezone.now() + entry.retry_delay(),
+        )
+        if claimed:
+            entry.attempts += 1
+        return bool(claimed)
+
+    def process(self, limit: int = 50) -> Tuple[int, int]:
+        """Claims and executes due entries in the order they were recorded.
+
+        Args:
+            limit: The maximum number of entries to execute.
+
+        Returns:
+            A tuple containing the number of entries which succeeded and the
+            number of entries which failed.
+        """
+
+        return self.run([entry for entry in self.due()[:limit] if self.claim(entry)])
+
+    def run(self, entries: Iterable[OutboxModel], **kwargs) -> Tuple[int, int]:
+        """Executes claimed entries, recording the outcome of each attempt.
+
+        Args:
+            entries: The claimed entries to execute.
+            **kwargs: Arguments passed on to the execute() method of each
+                entry.
+
+        Returns:
+            A tuple containing the number of entries which succeeded and the
+            number of entries which failed.
+        """
+
+        succeeded, failed = 0, 0
+        for entry in entries:
+            if entry.run(**kwargs):
+                succeeded += 1
+            else:
+                failed += 1
+        return succeeded, failed
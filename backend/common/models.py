@@ -0,0 +1,186 @@
+import logging
+from datetime import timedelta
+from typing import Any, Iterable, List, Optional, Sequence
+
+from django.conf import settings
+from django.db import models
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+from model_utils import Choices
+
+from common.managers import OutboxManager
+
+
+class DirtyFieldsMixin(models.Model):
+    """Tracks changes to the concrete fields of a model instance in memory.
+
+    Field values are snapshotted when an instance is loaded from the database
+    and after every save, so that changed fields can be determined without
+    querying the previous state of the row. Fields of a new instance count as
+    changed if they are not None.
+
+    Saving an existing instance without `update_fields` only writes the
+    fields that have changed, and skips the write if none have. A skipped
+    write sends neither pre_save nor post_save, so receivers only run for
+    saves that change the row. Fields changed by pre_save receivers or
+    mutated in place, e.g. a dict, are not detected and must be passed in
+    `update_fields` explicitly. An instance whose primary key was changed or
+    cleared, e.g. to save a copy, is saved in full.
+    """
+
+    class Meta:
+        abstract = True
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._field_snapshot = {}
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._snapshot_fields()
+        return instance
+
+    def refresh_from_db(self, using=None, fields=None):
+        super().refresh_from_db(using=using, fields=fields)
+        self._snapshot_fields(
+            None
+            if fields is None
+            else [self._meta.get_field(f).attname for f in fields]
+        )
+
+    def _snapshot_fields(self, attnames: Optional[Iterable[str]] = None):
+        for field in self._meta.concrete_fields:
+            if field.attname in self.__dict__ and (
+                attnames is None or field.attname in attnames
+            ):
+                self._field_snapshot[field.attname] = getattr(self, field.attname)
+
+    def original_value(self, name: str) -> Any:
+        """Returns the value of a field as of the last load or save.
+
+        Args:
+            name: The name of the field.
+
+        Returns:
+            The previous value of the field. None for new instances.
+        """
+
+        return self._field_snapshot.get(self._meta.get_field(name).attname)
+
+    def get_dirty_fields(self) -> List[str]:
+        """Returns the names of the fields changed since the last load or save."""
+
+        return [
+            field.name
+            for field in self._meta.concrete_fields
+            if field.attname in self.__dict__
+            and getattr(self, field.attname) != self._field_snapshot.get(field.attname)
+        ]
+
+    def save(self, *args, update_fields: Optional[Iterable[str]] = None, **kwargs):
+        if (
+            update_fields is None
+            and not self._state.adding
+            and self.pk is not None
+            and self._field_snapshot.get(self._meta.pk.attname) == self.pk
+        ):
+            update_fields = self.get_dirty_fields()
+            if update_fields:
+                update_fields += [
+                    field.name
+                    for field in self._meta.concrete_fields
+                    if getattr(field, "auto_now", False)
+                ]
+        super().save(*args, update_fields=update_fields, **kwargs)
+        self._snapshot_fields(
+            None
+            if update_fields is None
+            else [self._meta.get_field(f).attname for f in update_fields]
+        )
+
+
+class OutboxModel(models.Model):
+    """Abstract model for an operation waiting in a transactional outbox.
+
+    Entries are recorded in the same transaction as the change that triggers
+    them, and executed out-of-band by a worker polling the outbox, see
+    common.commands.OutboxCommand. Failed attempts are retried with
+    exponential backoff until the maximum number of attempts is reached.
+
+    Subclasses hold the payload of the operation and implement execute().
+
+    Attributes:
+        max_attempts_setting: The name of the setting holding the maximum
+            number of attempts for an entry.
+        retry_delay_setting: The name of the setting holding the delay to
+            wait after the first attempt, doubled after each further attempt.
+        completed_fields: The names of fields set by execute() which are saved
+            along with the outcome of a successful attempt.
+    """
+
+    STATUSES = Choices(
+        (0, "pending", _("Pending")),
+        (1, "done", _("Done")),
+        (2, "failed", _("Failed")),
+    )
+
+    status = models.PositiveSmallIntegerField(
+        choices=STATUSES, default=STATUSES.pending
+    )
+    attempts = models.PositiveSmallIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    run_after = models.DateTimeField(
+        default=timezone.now,
+        help_text=_("Earliest time at which the entry may be attempted"),
+    )
+
+    objects = OutboxManager()
+
+    max_attempts_setting: str
+    retry_delay_setting: str
+    completed_fields: Sequence[str] = ()
+
+    class Meta:
+        abstract = True
+        ordering = ["created_at", "id"]
+        indexes = [models.Index(fields=["status", "run_after"])]
+
+    def retry_delay(self) -> timedelta:
+        """Returns the backoff delay to wait after the current attempt."""
+
+        return getattr(settings, self.retry_delay_setting) * (2**self.attempts)
+
+    def execute(self, **kwargs):
+        """Performs the operation recorded by the entry."""
+
+        raise NotImplementedError
+
+    def run(self, **kwargs) -> bool:
+        """Executes the entry, recording the outcome of the attempt.
+
+        Args:
+            **kwargs: Arguments passed on to execute().
+
+        Returns:
+            A bool indicating whether the attempt succeeded.
+        """
+
+        try:
+            self.execute(**kwargs)
+        except Exception as error:
+            logging.exception(
+                f"{self._meta.verbose_name.capitalize()} {self.pk} failed on "
+                f"attempt {self.attempts}"
+            )
+            self.last_error = str(error)
+            if self.attempts >= getattr(settings, self.max_attempts_setting):
+                self.status = self.STATUSES.failed
+            self.save(update_fields=["status", "last_error"])
+            return False
+
+        self.status = self.STATUSES.done
+        self.last_error = ""
+        self.save(update_fields=["status", "last_error", *self.completed_fields])
+        return True
@@ -1,27 +1,31 @@
-from unittest.mock import MagicMock, patch
+from unittest.mock import MagicMock
 
 from django.test import SimpleTestCase
 
-from common.decorators import disable_for_loaddata
+from common.decorators import disable_for_loaddata, is_raw_loading, raw_loading
 
 
-@patch("inspect.getmodulename")
 class TestDisableForLoadData(SimpleTestCase):
     def setUp(self):
         self.mock_handler_inner = MagicMock()
 
         @disable_for_loaddata
-        def mock_handler():
+        def mock_handler(**kwargs):
             self.mock_handler_inner()
 
         self.mock_handler = mock_handler
 
-    def test_disable_for_load_data_disables(self, mock_getmodulename):
-        mock_getmodulename.return_value = "loaddata"
-        self.mock_handler()
+    def test_disable_for_load_data_disables_raw_saves(self):
+        self.mock_handler(raw=True)
         self.mock_handler_inner.assert_not_called()
 
-    def test_disable_for_load_data_does_not_disable(self, mock_getmodulename):
-        mock_getmodulename.return_value = ""
-        self.mock_handler()
+    def test_disable_for_load_data_disables_within_raw_loading(self):
+        with raw_loading():
+            self.assertTrue(is_raw_loading())
+            self.mock_handler(raw=False)
+        self.assertFalse(is_raw_loading())
+        self.mock_handler_inner.assert_not_called()
+
+    def test_disable_for_load_data_does_not_disable(self):
+        self.mock_handler(raw=False)
         self.mock_handler_inner.assert_called_once()
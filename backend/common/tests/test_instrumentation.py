@@ -0,0 +1,173 @@
+import json
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase, override_settings
+from faker import Faker
+from graphql_jwt.shortcuts import get_token
+
+from api.backend import DocumentCacheBackend
+from common.instrumentation import RequestProfile, profiling, record, timed
+from shows.models import Show
+from shows.tests.utils import fake_show_data
+from slack.fake_server import FakeSlackServer
+from slack.service import SlackBoss
+from slack.tests.utils import PatchSlackBossMixin
+from users.models import OutgoingEmail
+from users.tests.utils import fake_user_data
+
+# logging.disable(logging.WARNING)
+
+User = get_user_model()
+
+QUERY = "query { shows { id name rounds { time } } schoolChoices }"
+
+SERVER_TIMING = (
+    r'^sql;desc="\d+ queries";dur=[\d.]+, slack;desc="0 calls";dur=[\d.]+, '
+    r'email;desc="0 emails";dur=[\d.]+, total;dur=[\d.]+$'
+)
+
+
+class TestRequestProfile(TestCase):
+    def test_record_without_profile(self):
+        record("sql", 1.0)
+        with timed("slack"):
+            pass
+
+    def test_queries(self):
+        with profiling(RequestProfile()) as profile:
+            User.objects.count()
+            User.objects.exists()
+        self.assertEqual(profile.totals["sql"].count, 2)
+        self.assertGreater(profile.totals["sql"].duration, 0)
+
+        User.objects.count()
+        self.assertEqual(profile.totals["sql"].count, 2)
+
+    def test_fields(self):
+        profile = RequestProfile()
+        with profiling(profile):
+            User.objects.count()
+            profile.enter_field("users")
+            User.objects.count()
+            User.objects.count()
+            profile.enter_field("choices")
+            record("slack", 0.5)
+        summary = profile.as_dict()
+        self.assertEqual(summary["sql"]["count"], 3)
+        self.assertEqual(summary["slack"], {"count": 1, "duration": 500.0})
+        self.assertEqual(summary["fields"]["users"]["sql"]["count"], 2)
+        self.assertEqual(summary["fields"]["users"]["slack"]["count"], 0)
+        self.assertEqual(summary["fields"]["choices"]["sql"]["count"], 0)
+        self.assertEqual(summary["fields"]["choices"]["slack"]["count"], 1)
+
+    def test_emails(self):
+        emails = [
+            OutgoingEmail(subject="subject", body="body", recipients=[email])
+            for email in ["a@example.com", "b@example.com"]
+        ]
+        with profiling(RequestProfile()) as profile:
+            OutgoingEmail.objects.enqueue(emails)
+            self.assertEqual(profile.totals["email"].count, 2)
+            self.assertEqual(profile.totals["email"].duration, 0.0)
+            self.assertEqual(profile.totals["sql"].count, 1)
+            emails[0].run()
+        self.assertEqual(profile.totals["email"].count, 3)
+        self.assertGreater(profile.totals["email"].duration, 0.0)
+
+
+class TestSlackProfile(SimpleTestCase):
+    def test_slack_calls(self):
+        with FakeSlackServer() as server:
+            slack_boss = SlackBoss(token="xoxb-fake")
+            slack_boss.client.base_url = server.url
+            with profiling(RequestProfile()) as profile:
+                channel_id = slack_boss.create_channel(name="01-01-show")
+                slack_boss.list_channel_members(channel_id=channel_id)
+        self.assertEqual(profile.totals["slack"].count, 2)
+        self.assertRegex(profile.server_timing(), 'slack;desc="2 calls"')
+
+
+@override_settings(
+    INSTRUMENTATION_SAMPLE_RATE=0.0, INSTRUMENTATION_DEBUG_TOKEN="secret"
+)
+class TestInstrumentationMiddleware(PatchSlackBossMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        backend_patcher = patch(
+            "api.views._document_backend", DocumentCacheBackend(maxsize=8)
+        )
+        backend_patcher.start()
+        self.addCleanup(backend_patcher.stop)
+
+        self.faker = Faker()
+        Faker.seed(0)
+        Show.objects.create(
+            **fake_show_data(self.faker), status=Show.STATUSES.published
+        )
+
+    def post(self, **headers):
+        return self.client.post(
+            "/graphql/",
+            json.dumps({"query": QUERY}),
+            content_type="application/json",
+            **headers,
+        )
+
+    def test_not_sampled(self):
+        response = self.post()
+        self.assertNotIn("Server-Timing", response)
+        self.assertNotIn("extensions", response.json())
+
+    @override_settings(INSTRUMENTATION_SAMPLE_RATE=1.0)
+    def test_sampled(self):
+        response = self.post()
+        self.assertRegex(response["Server-Timing"], SERVER_TIMING)
+        self.assertNotIn("extensions", response.json())
+
+    def test_debug_header(self):
+        response = self.post(HTTP_X_DEBUG_PERFORMANCE="secret")
+        self.assertRegex(response["Server-Timing"], SERVER_TIMING)
+
+        performance = response.json()["extensions"]["performance"]
+        self.assertEqual(set(performance["fields"]), {"shows", "schoolChoices"})
+        self.assertEqual(performance["fields"]["shows"]["sql"]["count"], 2)
+        self.assertEqual(performance["fields"]["shows"]["resolve"]["count"], 4)
+        self.assertEqual(performance["fields"]["schoolChoices"]["sql"]["count"], 0)
+        self.assertEqual(performance["sql"]["count"], 2)
+
+    def test_debug_header_with_wrong_token(self):
+        response = self.post(HTTP_X_DEBUG_PERFORMANCE="wrong")
+        self.assertNotIn("Server-Timing", response)
+        self.assertNotIn("extensions", response.json())
+
+    @override_settings(INSTRUMENTATION_SAMPLE_RATE=1.0)
+    def test_sampled_with_wrong_token(self):
+        response = self.post(HTTP_X_DEBUG_PERFORMANCE="wrong")
+        self.assertRegex(response["Server-Timing"], SERVER_TIMING)
+        self.assertNotIn("extensions", response.json())
+
+    def test_debug_header_from_staff(self):
+        user = User.objects.create(**fake_user_data(self.faker), is_staff=True)
+        self.client.force_login(user)
+        response = self.post(HTTP_X_DEBUG_PERFORMANCE="1")
+        self.assertIn("performance", response.json()["extensions"])
+
+    def test_debug_header_from_staff_with_jwt(self):
+        user = User.objects.create(**fake_user_data(self.faker), is_staff=True)
+        response = self.post(
+            HTTP_X_DEBUG_PERFORMANCE="1", HTTP_AUTHORIZATION=f"JWT {get_token(user)}"
+        )
+        self.assertIn("performance", response.json()["extensions"])
+
+        user.is_staff = False
+        user.save()
+        response = self.post(
+            HTTP_X_DEBUG_PERFORMANCE="1", HTTP_AUTHORIZATION=f"JWT {get_token(user)}"
+        )
+        self.assertNotIn("Server-Timing", response)
+
+        response = self.post(HTTP_X_DEBUG_PERFORMANCE="1", HTTP_AUTHORIZATION="JWT x")
+        self.assertNotIn("Server-Timing", response)
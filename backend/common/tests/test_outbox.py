@@ -0,0 +1,52 @@
+from io import StringIO
+from smtplib import SMTPException
+from unittest.mock import patch
+
+from django.core import mail
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+from faker import Faker
+
+from slack.tests.utils import PatchSlackBossMixin
+from users.models import OutgoingEmail, User
+from users.tests.utils import fake_user_data
+
+# logging.disable(logging.WARNING)
+
+
+class TestOutbox(PatchSlackBossMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        faker = Faker()
+        Faker.seed(3107)
+
+        self.admin_user = User.objects.create_superuser(**fake_user_data(faker))
+
+        OutgoingEmail.objects.enqueue(
+            OutgoingEmail(subject="subject", body="body", recipients=[email])
+            for email in ["a@example.com", "b@example.com"]
+        )
+        with patch.object(
+            mail.EmailMultiAlternatives, "send", side_effect=SMTPException("down")
+        ):
+            OutgoingEmail.objects.process()
+
+    def test_command_processes_due_entries(self):
+        OutgoingEmail.objects.update(run_after=timezone.now())
+        stdout = StringIO()
+        call_command("process_emails", stdout=stdout)
+        self.assertEqual(stdout.getvalue(), "Delivered 3 outgoing emails (0 failed)\n")
+        self.assertEqual(len(mail.outbox), 3)
+
+    def test_retry_action(self):
+        self.client.force_login(self.admin_user)
+        self.client.post(
+            "/admin/users/outgoingemail/",
+            {
+                "action": "retry",
+                "_selected_action": OutgoingEmail.objects.values_list("pk", flat=True),
+            },
+        )
+        self.assertFalse(OutgoingEmail.objects.exclude(attempts=0).exists())
+        self.assertEqual(OutgoingEmail.objects.process(), (3, 0))
@@ -0,0 +1,38 @@
+from unittest.mock import MagicMock
+
+from django.db import IntegrityError, transaction
+from django.test import TestCase
+
+from common.transactions import on_commit_once
+
+
+class TestOnCommitOnce(TestCase):
+    def test_on_commit_once_coalesces_by_key(self):
+        func, other_func = MagicMock(), MagicMock()
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            on_commit_once("key", func)
+            on_commit_once("key", func)
+            on_commit_once("other_key", other_func)
+        self.assertEqual(len(callbacks), 2)
+        func.assert_called_once()
+        other_func.assert_called_once()
+
+    def test_on_commit_once_runs_again_in_next_transaction(self):
+        func = MagicMock()
+        for _ in range(2):
+            with self.captureOnCommitCallbacks(execute=True):
+                on_commit_once("key", func)
+        self.assertEqual(func.call_count, 2)
+
+    def test_on_commit_once_after_rollback(self):
+        func = MagicMock()
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            try:
+                with transaction.atomic():
+                    on_commit_once("key", func)
+                    raise IntegrityError
+            except IntegrityError:
+                pass
+            on_commit_once("key", func)
+        self.assertEqual(len(callbacks), 1)
+        func.assert_called_once()
@@ -0,0 +1,38 @@
+from typing import Callable, Hashable, Optional
+from weakref import WeakKeyDictionary, WeakValueDictionary
+
+from django.db import transaction
+
+# Callbacks waiting for commit, by key, for each database connection. Only
+# weak references are kept, so that callbacks discarded by a rollback, which
+# Django no longer references, release their key.
+_pending: WeakKeyDictionary = WeakKeyDictionary()
+
+
+def on_commit_once(
+    key: Hashable, func: Callable[[], None], using: Optional[str] = None
+):
+    """Runs a function once the current transaction commits, at most once per key.
+
+    Callbacks registered with a key that is already waiting for the same
+    transaction to commit are dropped, so that repeated updates within one
+    transaction are coalesced. Outside a transaction, the function is run
+    immediately.
+
+    Args:
+        key: Identifies the update the function performs.
+        func: The function to run.
+        using: The alias of the database the transaction is on.
+    """
+
+    connection = transaction.get_connection(using)
+    pending = _pending.setdefault(connection, WeakValueDictionary())
+    if key in pending:
+        return
+
+    def callback():
+        pending.pop(key, None)
+        func()
+
+    pending[key] = callback
+    transaction.on_commit(callback, using=using)
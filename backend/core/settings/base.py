@@ -9,6 +9,7 @@ https://docs.djangoproject.com/en/4.0/topics/settings/
 For the full list of settings and their values, see
 https://docs.djangoproject.com/en/4.0/ref/settings/
 """
+
 import os
 from datetime import timedelta
 
@@ -43,6 +44,7 @@ INSTALLED_APPS = [
     "users.apps.UsersConfig",
     "shows.apps.ShowsConfig",
     "slack.apps.SlackConfig",
+    "api.apps.ApiConfig",
     "coverage",
 ]
 
@@ -52,6 +54,7 @@ MIDDLEWARE = [
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "common.instrumentation.InstrumentationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
@@ -60,6 +63,7 @@ GRAPHENE = {
     "SCHEMA": "api.schema.schema",
     "MIDDLEWARE": [
         "graphql_jwt.middleware.JSONWebTokenMiddleware",
+        "common.instrumentation.ResolverProfilingMiddleware",
     ],
 }
 
@@ -105,6 +109,11 @@ DATABASES = {
     }
 }
 
+# Cache
+# https://docs.djangoproject.com/en/4.1/topics/cache/
+
+CACHES = {"default": env.cache("CACHE_URL", default="locmemcache://")}
+
 # Password validation
 # https://docs.djangoproject.com/en/4.0/ref/settings/#auth-password-validators
 
@@ -173,6 +182,13 @@ PHONENUMBER_DEFAULT_REGION = "US"
 PASSWORD_RESET_TIMEOUT_DAYS = 1
 
 SLACK_TOKEN = env("SLACK_TOKEN", default=None)
+SLACK_MAX_RETRIES = 3
+SLACK_MAX_CONCURRENCY = 8
+SLACK_TASK_MAX_ATTEMPTS = 5
+SLACK_TASK_RETRY_DELAY = timedelta(seconds=30)
+SLACK_DIRECTORY_TTL = 60 * 60 * 24
+SLACK_DIRECTORY_NEGATIVE_TTL = 60 * 60
+SLACK_CHANNEL_MEMBERS_TTL = 60 * 10
 
 EMAIL_BACKEND = "django.core.mail.backends.smtp.EmailBackend"
 EMAIL_HOST = "smtp.gmail.com"
@@ -181,3 +197,21 @@ EMAIL_PORT = 587
 EMAIL_HOST_USER = env("EMAIL_HOST_USER", default=None)
 EMAIL_HOST_PASSWORD = env("EMAIL_HOST_PASSWORD", default=None)
 DEFAULT_FROM_EMAIL = "CU Lion Dance"
+EMAIL_OUTBOX_MAX_ATTEMPTS = 5
+EMAIL_OUTBOX_RETRY_DELAY = timedelta(minutes=1)
+
+GRAPHQL_DOCUMENT_CACHE_SIZE = 256
+# Responses to anonymous queries are only cached in a cache shared by all web
+# and worker processes, since invalidations have to reach all of them. The
+# default local memory cache is per process.
+GRAPHQL_RESPONSE_CACHE = env.bool(
+    "GRAPHQL_RESPONSE_CACHE", default=bool(env("CACHE_URL", default=""))
+)
+GRAPHQL_RESPONSE_CACHE_TIMEOUT = 60 * 5
+# Optional registry of queries to pin, mapping sha256 hashes to query strings.
+# The frontend registers its queries at runtime through automatic persisted
+# queries, so no registry is shipped.
+GRAPHQL_PERSISTED_QUERIES = os.path.join(BASE_DIR, "api", "persisted_queries.json")
+
+INSTRUMENTATION_SAMPLE_RATE = env.float("INSTRUMENTATION_SAMPLE_RATE", default=0.01)
+INSTRUMENTATION_DEBUG_TOKEN = env("INSTRUMENTATION_DEBUG_TOKEN", default=None)
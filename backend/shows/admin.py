@@ -1,34 +1,85 @@
 from django.contrib import admin
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
 
+from common.admin import MemoizedChoicesMixin
 from shows.models import Show, Round, Member, Contact, Role
+from slack.admin import message_channel_results
+from slack.models import SlackChannel
 
 
 class RoundInlineAdmin(admin.TabularInline):
     model = Round
 
 
-class RoleInlineAdmin(admin.TabularInline):
+class RoleInlineAdmin(MemoizedChoicesMixin, admin.TabularInline):
     model = Role
+    memoized_choice_fields = {"performer": ["user"]}
+
+    def get_queryset(self, request):
+        # Existing roles are labelled with their show and performer names.
+        return super().get_queryset(request).select_related("show", "performer__user")
 
 
 @admin.action(description="Refresh show Slack channels")
 def refresh_channels(modeladmin, request, queryset):
-    for show in queryset:
-        if show.has_slack_channel:
-            show.channel.force_refresh()
+    results = SlackChannel.objects.filter(show__in=queryset).refresh()
+    message_channel_results(modeladmin, request, results, "Refreshed")
 
 
 @admin.action(description="Archive show Slack channels")
 def archive_channels(modeladmin, request, queryset):
-    for show in queryset:
-        if show.has_slack_channel:
-            show.channel.archive(rename=False)
-
-
-class ShowAdmin(admin.ModelAdmin):
-    @staticmethod
-    def rounds(show):
-        count = show.rounds.count()
+    results = SlackChannel.objects.filter(show__in=queryset).archive(rename=False)
+    message_channel_results(modeladmin, request, results, "Archived")
+
+
+def count_subquery(model, field: str = "show") -> Coalesce:
+    """Returns an expression counting the related rows of a model per show."""
+
+    counts = (
+        model.objects.filter(**{field: OuterRef("pk")})
+        .order_by()
+        .values(field)
+        .annotate(count=Count("pk"))
+        .values("count")
+    )
+    return Coalesce(
+        Subquery(counts, output_field=IntegerField()),
+        Value(0),
+        output_field=IntegerField(),
+    )
+
+
+class ShowAdmin(MemoizedChoicesMixin, admin.ModelAdmin):
+    """Admin for shows.
+
+    The changelist queryset is annotated with the performer and round counts
+    and joins the Slack channel, so that the page renders in a constant number
+    of queries regardless of the number of shows.
+    """
+
+    def get_queryset(self, request):
+        return (
+            super()
+            .get_queryset(request)
+            .select_related("channel", "point__user", "contact")
+            .annotate(
+                performer_total=count_subquery(Role),
+                round_total=count_subquery(Round),
+            )
+        )
+
+    @admin.display(description="Performers", ordering="performer_total")
+    def performer_count(self, show):
+        if hasattr(show, "performer_total"):
+            return show.performer_total
+        return show.performer_count()
+
+    @admin.display(description="Rounds", ordering="round_total")
+    def rounds(self, show):
+        count = getattr(show, "round_total", None)
+        if count is None:
+            count = show.rounds.count()
         return count if count > 0 else None
 
     list_display = [
@@ -47,7 +98,10 @@ class ShowAdmin(admin.ModelAdmin):
         "rate",
         "payment_method",
     ]
+    list_filter = ["status", "priority", ("date", admin.DateFieldListFilter)]
+    search_fields = ["name"]
     empty_value_display = "TBD"
+    memoized_choice_fields = {"point": ["user"]}
 
     inlines = [RoundInlineAdmin, RoleInlineAdmin]
 
@@ -61,6 +115,20 @@ class MemberAdmin(admin.ModelAdmin):
         "school",
         "class_year",
     ]
+    list_select_related = ["user"]
+    search_fields = ["user__first_name", "user__last_name", "user__email"]
+    ordering = ["user__first_name", "user__last_name"]
+
+    def get_queryset(self, request):
+        # Members are labelled by their user, also in autocomplete results.
+        return super().get_queryset(request).select_related("user")
+
+
+class RoleAdmin(admin.ModelAdmin):
+    list_display = ["show", "performer", "role"]
+    list_select_related = ["show", "performer__user"]
+    list_filter = ["role"]
+    autocomplete_fields = ["show", "performer"]
 
 
 class MemberInlineAdmin(admin.TabularInline):
@@ -70,4 +138,4 @@ class MemberInlineAdmin(admin.TabularInline):
 admin.site.register(Show, ShowAdmin)
 admin.site.register(Member, MemberAdmin)
 admin.site.register(Contact)
-admin.site.register(Role)
+admin.site.register(Role, RoleAdmin)
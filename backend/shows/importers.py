@@ -0,0 +1,503 @@
+import csv
+import json
+import logging
+from collections import Counter, defaultdict
+from itertools import islice
+from typing import IO, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Type
+
+from django.apps import apps
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.core.management.color import no_style
+from django.db import connections, models
+from django.db.models import OuterRef, Subquery
+
+from api.cache import response_cache
+from common.decorators import raw_loading
+from shows.models import Member, Role, Round, Show
+from slack.directory import slack_directory
+from slack.models import SlackChannel, SlackTask, SlackUser
+
+# Models that can be imported, in the order their rows must be written.
+IMPORT_ORDER = [
+    "auth.group",
+    "users.user",
+    "shows.contact",
+    "shows.member",
+    "shows.show",
+    "shows.round",
+    "shows.role",
+]
+
+_JSON_SEPARATORS = " \t\r\n,[]"
+
+
+def iter_json_records(stream: IO[str], chunk_size: int = 1 << 16) -> Iterator[Dict]:
+    """Yields the objects of a JSON array or JSON Lines stream one at a time.
+
+    The stream is decoded incrementally, so that files produced by dumpdata
+    can be imported without reading them into memory as a whole.
+
+    Args:
+        stream: A text stream containing a JSON array of objects, or one
+            object per line.
+        chunk_size: The number of characters read from the stream at a time.
+
+    Raises:
+        ValueError: If the stream does not contain valid JSON.
+    """
+
+    decoder = json.JSONDecoder()
+    buffer = ""
+    while True:
+        chunk = stream.read(chunk_size)
+        buffer += chunk
+        pos = 0
+        while True:
+            while pos < len(buffer) and buffer[pos] in _JSON_SEPARATORS:
+                pos += 1
+            if pos == len(buffer):
+                break
+            try:
+                record, pos = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                if not chunk:
+                    raise
+                break
+            yield record
+        buffer = buffer[pos:]
+        if not chunk:
+            return
+
+
+def iter_csv_records(stream: IO[str]) -> Iterator[Dict]:
+    """Yields the rows of a CSV stream with a header row as dicts."""
+
+    yield from csv.DictReader(stream)
+
+
+def batched(iterable: Iterable, size: int) -> Iterator[List]:
+    """Yields lists of up to `size` consecutive items of an iterable."""
+
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+class SeasonImportError(Exception):
+    """Raised when records of a season file fail validation.
+
+    Attributes:
+        errors: A list of messages describing each invalid record.
+    """
+
+    def __init__(self, errors: List[str]):
+        super().__init__(f"{len(errors)} invalid record(s)")
+        self.errors = errors
+
+
+class SeasonImporter:
+    """Imports shows, rounds, members and roles from season files in bulk.
+
+    Records are validated and written in batches with bulk_create, which
+    bypasses model save methods and signals, so that importing a season
+    sends no Slack messages or activation emails. Derived data normally
+    maintained by those code paths, i.e., show times and cached GraphQL
+    responses, is updated in bulk by finish. Slack channels and users are left
+    to reconcile.
+
+    Validation errors abort the batch they occur in, and should be handled
+    by rolling back the surrounding transaction.
+
+    Attributes:
+        batch_size: The number of records validated and written at a time.
+        counts: The number of rows written per model label.
+        show_ids: The primary keys of the imported shows.
+    """
+
+    def __init__(self, batch_size: int = 1000, using: str = "default"):
+        self.batch_size = batch_size
+        self.using = using
+        self.counts = Counter()
+        self.show_ids = []
+        self._natural_keys = defaultdict(dict)
+        self._explicit_pks = set()
+
+    def import_fixture(self, records: Iterable[Dict]):
+        """Imports records in the format written by dumpdata.
+
+        Foreign keys may be given as primary keys or natural keys. Records of
+        models outside IMPORT_ORDER are skipped.
+
+        Args:
+            records: An iterable of dicts with "model", "fields" and optionally
+                "pk" keys.
+
+        Raises:
+            SeasonImportError: If a record in the current batch is invalid.
+        """
+
+        with raw_loading():
+            for batch in batched(records, self.batch_size):
+                self._import_fixture_batch(batch)
+
+    def import_csv(self, rows: Iterable[Dict]):
+        """Imports shows from CSV rows with one show per row.
+
+        Besides Show fields, a row may have a "rounds" column with round times
+        separated by semicolons, and a "performers" column with performer
+        emails separated by semicolons, each optionally followed by a colon
+        and a role, e.g., "jane@example.com:drum". Choice fields accept
+        either their stored value or their identifier, e.g., "published".
+
+        Args:
+            rows: An iterable of dicts mapping column names to values.
+
+        Raises:
+            SeasonImportError: If a row in the current batch is invalid.
+        """
+
+        with raw_loading():
+            for offset, batch in enumerate(batched(rows, self.batch_size)):
+                self._import_csv_batch(batch, start=offset * self.batch_size + 2)
+
+    def finish(self):
+        """Updates data derived from imported rows.
+
+        Sets the time of each imported show to that of its first round,
+        resets database sequences of models imported with explicit primary
+        keys, and invalidates cached GraphQL responses once the import
+        commits.
+        """
+
+        first_round = (
+            Round.objects.filter(show=OuterRef("pk"), time__isnull=False)
+            .order_by("time")
+            .values("time")
+        )
+        for batch in batched(self.show_ids, self.batch_size):
+            Show.objects.using(self.using).filter(pk__in=batch).update(
+                time=Subquery(first_round[:1])
+            )
+
+        if self._explicit_pks:
+            connection = connections[self.using]
+            statements = connection.ops.sequence_reset_sql(
+                no_style(), list(self._explicit_pks)
+            )
+            with connection.cursor() as cursor:
+                for sql in statements:
+                    cursor.execute(sql)
+
+        response_cache.invalidate(using=self.using)
+
+    def reconcile(self) -> Dict[str, int]:
+        """Brings Slack up to date with the imported data in a single pass.
+
+        Links members to Slack users with one users.list scan, records one
+        sync task for each published imported show without a Slack channel,
+        and reconciles the members of the channels of the other imported
+        shows concurrently. This replaces the Slack calls that saving the
+        rows one by one would have made.
+
+        Returns:
+            A dict with the number of linked members, queued sync tasks and
+            reconciled channels.
+
+        Raises:
+            SlackBossException: If there was an error listing the Slack users.
+        """
+
+        emails = Member.objects.filter(
+            user__isnull=False, slack_user__isnull=True
+        ).values_list("user__email", flat=True)
+        linked = SlackUser.objects.link_members(slack_directory.warm(emails=emails))
+
+        queued, reconciled = 0, 0
+        for batch in batched(self.show_ids, self.batch_size):
+            unsynced = (
+                Show.objects.filter(pk__in=batch, status__gt=Show.STATUSES.draft)
+                .filter(channel__isnull=True)
+                .exclude(slack_tasks__status=SlackTask.STATUSES.pending)
+                .values_list("pk", flat=True)
+            )
+            tasks = SlackTask.objects.bulk_create(
+                [
+                    SlackTask(show_id=show_id, action=SlackTask.ACTIONS.sync_show)
+                    for show_id in unsynced
+                ]
+            )
+            queued += len(tasks)
+            reconciled += len(
+                SlackChannel.objects.filter(show__in=batch).reconcile_members()
+            )
+        return {"linked": len(linked), "queued": queued, "reconciled": reconciled}
+
+    def _import_fixture_batch(self, records: List[Dict]):
+        rows = defaultdict(list)
+        for record in records:
+            label = record.get("model", "").lower()
+            if label in IMPORT_ORDER:
+                rows[label].append(record)
+            else:
+                self.counts["skipped"] += 1
+
+        errors = []
+        for label in IMPORT_ORDER:
+            if label not in rows:
+                continue
+            model = apps.get_model(label)
+            self._resolve_natural_keys(model, rows[label])
+            instances, m2m_data = [], []
+            for record in rows[label]:
+                try:
+                    instance, m2m = self._build_instance(model, record)
+                    self._validate(instance)
+                except (ValidationError, FieldDoesNotExist, LookupError) as e:
+                    errors.append(f"{label} {record.get('pk', '')}: {_message(e)}")
+                    continue
+                instances.append(instance)
+                m2m_data.append(m2m)
+            if errors:
+                raise SeasonImportError(errors)
+            self._write(model, instances)
+            self._write_m2m(model, instances, m2m_data)
+
+    def _import_csv_batch(self, rows: List[Dict], start: int):
+        errors = []
+        shows, show_rows = [], []
+        for line, row in enumerate(rows, start=start):
+            try:
+                show = Show(
+                    **{
+                        name: _parse_choice(Show, name, value)
+                        for name, value in row.items()
+                        if name not in ("rounds", "performers") and value != ""
+                    }
+                )
+                self._validate(show)
+            except (ValidationError, TypeError, AttributeError) as e:
+                errors.append(f"line {line}: {_message(e)}")
+                continue
+            shows.append(show)
+            show_rows.append((line, row))
+
+        emails = {
+            email
+            for _, row in show_rows
+            for email, _ in _split_performers(row.get("performers", ""))
+        }
+        performer_ids = dict(
+            Member.objects.using(self.using)
+            .filter(user__email__in=emails)
+            .values_list("user__email", "id")
+        )
+        for email in sorted(emails - performer_ids.keys()):
+            errors.append(f"no member with email {email}")
+        if errors:
+            raise SeasonImportError(errors)
+
+        rounds, roles = [], []
+        for show, (line, row) in zip(shows, show_rows):
+            times = []
+            for value in row.get("rounds", "").split(";"):
+                if value.strip():
+                    try:
+                        times.append(Round._meta.get_field("time").clean(value, None))
+                    except ValidationError as e:
+                        errors.append(f"line {line}: {_message(e)}")
+            show.time = min(times, default=None)
+            rounds.append(times)
+            try:
+                roles.append(
+                    [
+                        (performer_ids[email], _parse_choice(Role, "role", role))
+                        for email, role in _split_performers(row.get("performers", ""))
+                    ]
+                )
+            except AttributeError as e:
+                errors.append(f"line {line}: {_message(e)}")
+        if errors:
+            raise SeasonImportError(errors)
+
+        self._write(Show, shows)
+        self._write(
+            Round,
+            [
+                Round(show=show, time=time)
+                for show, times in zip(shows, rounds)
+                for time in set(times)
+            ],
+        )
+        self._write(
+            Role,
+            [
+                Role(show=show, performer_id=performer_id, role=role)
+                for show, show_roles in zip(shows, roles)
+                for performer_id, role in dict(show_roles).items()
+            ],
+        )
+
+    def _build_instance(
+        self, model: Type[models.Model], record: Dict
+    ) -> Tuple[models.Model, Dict[str, List]]:
+        data, m2m = {}, {}
+        for name, value in record.get("fields", {}).items():
+            field = model._meta.get_field(name)
+            if field.many_to_many:
+                if field.remote_field.through._meta.auto_created:
+                    m2m[name] = [
+                        self._related_pk(field.related_model, key) for key in value
+                    ]
+            elif field.is_relation:
+                data[field.attname] = (
+                    None
+                    if value is None
+                    else self._related_pk(field.related_model, value)
+                )
+            else:
+                data[field.attname] = field.to_python(value)
+        if record.get("pk") is not None:
+            data[model._meta.pk.attname] = model._meta.pk.to_python(record["pk"])
+            self._explicit_pks.add(model)
+        return model(**data), m2m
+
+    def _resolve_natural_keys(self, model: Type[models.Model], records: List[Dict]):
+        """Looks up the natural keys referenced by a batch of records at once.
+
+        Natural keys of models with a single-field natural key, such as users
+        keyed by email, are resolved with one query per related model. Other
+        natural keys are resolved one by one when the instance is built.
+        """
+
+        keys = defaultdict(set)
+        for record in records:
+            for name, value in record.get("fields", {}).items():
+                try:
+                    field = model._meta.get_field(name)
+                except FieldDoesNotExist:
+                    continue
+                if not field.is_relation or not value:
+                    continue
+                values = value if field.many_to_many else [value]
+                for key in values:
+                    if isinstance(key, list) and len(key) == 1:
+                        keys[field.related_model].add(key[0])
+
+        for related_model, values in keys.items():
+            lookup = _natural_key_field(related_model)
+            if lookup is None:
+                continue
+            cache = self._natural_keys[related_model]
+            missing = [value for value in values if (value,) not in cache]
+            for value, pk in (
+                related_model._default_manager.db_manager(self.using)
+                .filter(**{f"{lookup}__in": missing})
+                .values_list(lookup, "pk")
+            ):
+                cache[(value,)] = pk
+
+    def _related_pk(self, model: Type[models.Model], value):
+        if not isinstance(value, list):
+            return model._meta.pk.to_python(value)
+        key = tuple(value)
+        cache = self._natural_keys[model]
+        if key not in cache:
+            try:
+                cache[key] = (
+                    model._default_manager.db_manager(self.using)
+                    .get_by_natural_key(*key)
+                    .pk
+                )
+            except model.DoesNotExist:
+                raise ValidationError(
+                    f"{model._meta.label} with natural key {value} does not exist"
+                )
+        return cache[key]
+
+    @staticmethod
+    def _validate(instance: models.Model):
+        """Validates an instance without querying the database.
+
+        Relations and uniqueness are left to database constraints, which
+        fail the import transaction if violated.
+        """
+
+        instance.clean_fields(
+            exclude=[f.name for f in instance._meta.fields if f.is_relation]
+        )
+        instance.clean()
+
+    def _write(self, model: Type[models.Model], instances: List[models.Model]):
+        if not instances:
+            return
+        model._default_manager.db_manager(self.using).bulk_create(
+            instances, batch_size=self.batch_size
+        )
+        self.counts[model._meta.label_lower] += len(instances)
+        if model is Show:
+            self.show_ids += [show.pk for show in instances]
+        logging.info(f"Imported {len(instances)} {model._meta.verbose_name_plural}")
+
+    def _write_m2m(
+        self,
+        model: Type[models.Model],
+        instances: List[models.Model],
+        m2m_data: List[Dict[str, List]],
+    ):
+        links = defaultdict(list)
+        for instance, m2m in zip(instances, m2m_data):
+            for name, pks in m2m.items():
+                field = model._meta.get_field(name)
+                through = field.remote_field.through
+                links[through] += [
+                    through(
+                        **{
+                            field.m2m_column_name(): instance.pk,
+                            field.m2m_reverse_name(): pk,
+                        }
+                    )
+                    for pk in pks
+                ]
+        for through, rows in links.items():
+            through._default_manager.db_manager(self.using).bulk_create(
+                rows, batch_size=self.batch_size, ignore_conflicts=True
+            )
+
+
+def _natural_key_field(model: Type[models.Model]) -> Optional[str]:
+    """Returns the field a model's single-field natural key is looked up by."""
+
+    if hasattr(model, "USERNAME_FIELD"):
+        return model.USERNAME_FIELD
+    unique = [
+        f.name
+        for f in model._meta.fields
+        if f.unique and not f.primary_key and not f.is_relation
+    ]
+    if hasattr(model._default_manager, "get_by_natural_key") and len(unique) == 1:
+        return unique[0]
+    return None
+
+
+def _parse_choice(model: Type[models.Model], name: str, value: str):
+    """Converts a choice identifier such as "published" to its stored value."""
+
+    choices = model._meta.get_field(name).choices
+    if value and choices and not value.lstrip("-").isdigit():
+        return getattr(choices, value.strip())
+    return value or None
+
+
+def _split_performers(value: str) -> Set[Tuple[str, str]]:
+    performers = set()
+    for entry in value.split(";"):
+        email, _, role = entry.strip().partition(":")
+        if email:
+            performers.add((email.strip(), role.strip()))
+    return performers
+
+
+def _message(error: Exception) -> str:
+    if isinstance(error, ValidationError):
+        return "; ".join(error.messages)
+    return str(error)
@@ -0,0 +1,66 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import IntegrityError, transaction
+
+from shows.importers import (
+    SeasonImporter,
+    SeasonImportError,
+    iter_csv_records,
+    iter_json_records,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Imports shows, rounds, members and roles from a JSON fixture or CSV file "
+        "in bulk, without Slack side effects"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="Path to the JSON or CSV season file")
+        parser.add_argument(
+            "--format",
+            choices=["json", "csv"],
+            help="Format of the file, inferred from its extension by default",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Number of records to validate and write at a time",
+        )
+        parser.add_argument(
+            "--reconcile",
+            action="store_true",
+            help="Link Slack users and sync the imported shows' channels afterwards",
+        )
+
+    def handle(self, *args, **options):
+        file_format = options["format"] or (
+            "csv" if options["path"].lower().endswith(".csv") else "json"
+        )
+        importer = SeasonImporter(batch_size=options["batch_size"])
+        try:
+            with open(options["path"], newline="", encoding="utf-8") as stream:
+                with transaction.atomic():
+                    if file_format == "csv":
+                        importer.import_csv(iter_csv_records(stream))
+                    else:
+                        importer.import_fixture(iter_json_records(stream))
+                    importer.finish()
+        except SeasonImportError as e:
+            raise CommandError("\n".join([str(e)] + e.errors))
+        except (OSError, ValueError, IntegrityError) as e:
+            raise CommandError(e)
+
+        self.stdout.write(
+            "Imported "
+            + ", ".join(
+                f"{count} {label}" for label, count in sorted(importer.counts.items())
+            )
+        )
+        if options["reconcile"]:
+            results = importer.reconcile()
+            self.stdout.write(
+                f"Linked {results['linked']} members, queued {results['queued']} "
+                f"Slack syncs, reconciled {results['reconciled']} channels"
+            )
@@ -0,0 +1,19 @@
+# Generated by Django 4.1.2 on 2026-10-16 23:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("shows", "0007_add_payment_method"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="show",
+            index=models.Index(
+                fields=["date", "time", "id"], name="shows_show_date_9baee0_idx"
+            ),
+        ),
+    ]
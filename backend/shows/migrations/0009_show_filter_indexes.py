@@ -0,0 +1,26 @@
+# Generated by Django 4.1.2 on 2026-10-17 00:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("shows", "0008_show_date_time_index"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="show",
+            index=models.Index(
+                fields=["status", "date", "time"], name="shows_show_status_374482_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="show",
+            index=models.Index(
+                fields=["priority", "date", "time"],
+                name="shows_show_priorit_80f86c_idx",
+            ),
+        ),
+    ]
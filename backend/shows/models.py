@@ -1,4 +1,5 @@
 import re
+from typing import List, Optional
 
 from django.contrib import admin
 from django.core.exceptions import ValidationError
@@ -7,7 +8,8 @@ from django.utils.translation import gettext as _
 from model_utils import Choices
 from phonenumber_field.modelfields import PhoneNumberField
 
-from slack.models import SlackUser, SlackChannel
+from common.models import DirtyFieldsMixin
+from slack.models import SlackUser, SlackChannel, SlackTask
 
 # User = get_user_model()
 from users.models import User
@@ -75,7 +77,7 @@ class Member(models.Model):
         return SlackUser.objects.get_or_create(member=self)[0]
 
 
-class Show(models.Model):
+class Show(DirtyFieldsMixin, models.Model):
     """Model for a show.
 
     Each Show stores information pertaining to the show, such as the date,
@@ -153,6 +155,11 @@ class Show(models.Model):
 
     class Meta:
         ordering = ["date", "time"]
+        indexes = [
+            models.Index(fields=["date", "time", "id"]),
+            models.Index(fields=["status", "date", "time"]),
+            models.Index(fields=["priority", "date", "time"]),
+        ]
 
     def __str__(self):
         return self.name
@@ -169,31 +176,21 @@ class Show(models.Model):
             )
 
     def save(self, *args, **kwargs):
-        old_instance = Show.objects.filter(pk=self.pk).first()
+        dirty_fields = self.get_dirty_fields()
         updated_fields = [
             field
             for field in ["name", "date", "time", "address", "lions", "point"]
-            if getattr(self, field) != getattr(old_instance, field, None)
+            if field in dirty_fields
         ]
 
         super().save(*args, **kwargs)
         if self.status > Show.STATUSES.draft:
-            channel, created = self.fetch_slack_channel()
-            if not channel.is_archived():
-                if created:
-                    channel.send_or_update_briefing()
-                    channel.invite_performers()
-                else:
-                    if updated_fields:
-                        channel.send_or_update_briefing()
-                        channel.send_update_message(
-                            [
-                                self._meta.get_field(field).verbose_name.lower()
-                                for field in updated_fields
-                            ]
-                        )
-                        if "name" in updated_fields or "date" in updated_fields:
-                            channel.update_name()
+            if not self.has_slack_channel():
+                SlackTask.objects.enqueue(self, SlackTask.ACTIONS.sync_show)
+            elif updated_fields and not self.channel.is_archived():
+                SlackTask.objects.enqueue(
+                    self, SlackTask.ACTIONS.sync_show, updated_fields=updated_fields
+                )
 
     def delete(self, *args, **kwargs):
         self.status = self.STATUSES.draft
@@ -202,6 +199,51 @@ class Show(models.Model):
             self.channel.archive(rename=True)
         super().delete(*args, **kwargs)
 
+    def update_time(self):
+        """Sets the show time to the time of the earliest round.
+
+        The show is only saved if its time has changed.
+        """
+
+        time = self.rounds.aggregate(time=models.Min("time"))["time"]
+        if time != self.time:
+            self.time = time
+            self.save()
+
+    def sync_slack_channel(self, updated_fields: Optional[List[str]] = None):
+        """Brings the Slack channel for the show up to date.
+
+        Creates the channel with a briefing and invites performers if it does
+        not exist yet. Otherwise, updates the briefing, announces the updated
+        fields and renames the channel as necessary. This is executed by the
+        Slack task worker rather than inline with the save.
+
+        Args:
+            updated_fields: The names of the show fields that have changed.
+
+        Raises:
+            SlackBossException: If there was an error with the Slack API.
+        """
+
+        if self.status == Show.STATUSES.draft:
+            return
+        channel, created = self.fetch_slack_channel()
+        if channel.is_archived():
+            return
+        if created:
+            channel.send_or_update_briefing()
+            channel.invite_performers()
+        elif updated_fields:
+            channel.schedule_briefing()
+            channel.send_update_message(
+                [
+                    self._meta.get_field(field).verbose_name.lower()
+                    for field in updated_fields
+                ]
+            )
+            if "name" in updated_fields or "date" in updated_fields:
+                channel.update_name()
+
     def fetch_slack_channel(self):
         """Fetches Slack channel, or creates one if necessary.
 
@@ -1,11 +1,17 @@
+import logging
+
 from django.contrib.auth import get_user_model
 from django.core.exceptions import ObjectDoesNotExist
 from django.db.models.signals import post_save, post_delete, pre_save
 from django.dispatch import receiver
 
 from common.decorators import disable_for_loaddata
+from common.transactions import on_commit_once
 from shows.models import Member, Round, Show
-from users.signals.signals import user_activated
+from slack.directory import slack_directory
+from slack.exceptions import SlackBossException
+from slack.models import SlackUser
+from users.signals.signals import user_activated, users_activated
 
 User = get_user_model()
 
@@ -15,12 +21,30 @@ def create_member_for_user(sender, user, **kwargs):
     Member.objects.get_or_create(user=user)
 
 
+@receiver(users_activated)
+def create_members_for_users(sender, users, **kwargs):
+    Member.objects.bulk_create(
+        [Member(user=user) for user in users], ignore_conflicts=True
+    )
+    try:
+        directory = slack_directory.warm(emails=[user.email for user in users])
+    except SlackBossException as error:
+        logging.warning(f"Failed to link activated users to Slack: {error}")
+        return
+    SlackUser.objects.link_members(directory)
+
+
 @receiver(post_save, sender=Round)
 @receiver(post_delete, sender=Round)
 def update_show_time(sender, instance, **kwargs):
-    rounds = instance.show.rounds.all()
-    instance.show.time = min(r.time for r in rounds) if rounds else None
-    instance.show.save()
+    show_id = instance.show_id
+
+    def update_time():
+        show = Show.objects.filter(pk=show_id).first()
+        if show is not None:
+            show.update_time()
+
+    on_commit_once(("show_time", show_id), update_time)
 
 
 @receiver(post_delete, sender=Member)
@@ -1,11 +1,16 @@
 from django.contrib.admin import AdminSite
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from faker import Faker
 
 from shows.admin import ShowAdmin
-from shows.models import Show
-from shows.tests.utils import fake_show_data
-
+from shows.models import Member, Role, Round, Show
+from shows.tests.utils import fake_round_data, fake_show_data
+from slack.models import SlackChannel
+from slack.tests.utils import PatchSlackBossMixin, fake_slack_id
+from users.models import User
+from users.tests.utils import fake_user_data
 
 # logging.disable(logging.WARNING)
 
@@ -28,3 +33,141 @@ class TestShowAdmin(TestCase):
     def test_admin_board(self):
         show_admin = ShowAdmin(Show, self.site)
         self.assertIsNone(show_admin.rounds(self.show))
+
+
+class TestShowAdminChangelist(PatchSlackBossMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.faker = Faker()
+        Faker.seed(0)
+
+        admin_user = User.objects.create_superuser(**fake_user_data(self.faker))
+        self.client.force_login(admin_user)
+        self.members = [
+            User.objects.create(**data).member
+            for data in fake_user_data(self.faker, count=3)
+        ]
+
+    def create_shows(self, count: int):
+        for _ in range(count):
+            show = Show.objects.create(**fake_show_data(self.faker))
+            Round.objects.bulk_create(
+                [
+                    Round(show=show, **round_data)
+                    for round_data in fake_round_data(self.faker, count=2)
+                ]
+            )
+            Role.objects.bulk_create(
+                [Role(show=show, performer=member) for member in self.members]
+            )
+            SlackChannel.objects.bulk_create(
+                [SlackChannel(id=fake_slack_id(self.faker), show=show)]
+            )
+
+    def get_changelist(self, **params):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get("/admin/shows/show/", params)
+        self.assertEqual(response.status_code, 200)
+        return response, len(queries)
+
+    def test_changelist_query_count_is_constant(self):
+        self.create_shows(2)
+        _, few_queries = self.get_changelist()
+        self.create_shows(10)
+        _, many_queries = self.get_changelist()
+        self.assertEqual(few_queries, many_queries)
+
+    def test_changelist_counts(self):
+        self.create_shows(1)
+        Show.objects.create(**fake_show_data(self.faker))
+        response, _ = self.get_changelist(o="9")
+        results = list(response.context["cl"].result_list)
+        self.assertEqual(
+            [(show.performer_total, show.round_total) for show in results],
+            [(0, 0), (len(self.members), 2)],
+        )
+
+    def test_changelist_filters(self):
+        self.create_shows(2)
+        Show.objects.filter(pk=Show.objects.first().pk).update(
+            status=Show.STATUSES.closed, priority=Show.PRIORITIES.urgent
+        )
+        response, _ = self.get_changelist(
+            status__exact=Show.STATUSES.closed, priority__exact=Show.PRIORITIES.urgent
+        )
+        self.assertEqual(response.context["cl"].result_count, 1)
+
+    def test_change_view_query_count_is_constant(self):
+        show = Show.objects.create(**fake_show_data(self.faker))
+        Role.objects.bulk_create(
+            [Role(show=show, performer=member) for member in self.members]
+        )
+        self.get_change_view(show)
+        _, few_queries = self.get_change_view(show)
+
+        more_members = [
+            User.objects.create(**data).member
+            for data in fake_user_data(self.faker, count=10)
+        ]
+        Role.objects.bulk_create(
+            [Role(show=show, performer=member) for member in more_members]
+        )
+        response, many_queries = self.get_change_view(show)
+        self.assertEqual(few_queries, many_queries)
+        self.assertContains(response, str(more_members[0]))
+
+    def get_change_view(self, show: Show):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(f"/admin/shows/show/{show.pk}/change/")
+        self.assertEqual(response.status_code, 200)
+        return response, len(queries)
+
+
+class TestRoleAdmin(PatchSlackBossMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.faker = Faker()
+        Faker.seed(0)
+
+        admin_user = User.objects.create_superuser(**fake_user_data(self.faker))
+        self.client.force_login(admin_user)
+        self.show = Show.objects.create(**fake_show_data(self.faker))
+
+    def add_roles(self, count: int):
+        members = [
+            User.objects.create(**data).member
+            for data in fake_user_data(self.faker, count=count)
+        ]
+        Role.objects.bulk_create(
+            [Role(show=self.show, performer=member) for member in members]
+        )
+        return members
+
+    def test_changelist_query_count_is_constant(self):
+        self.add_roles(2)
+        with CaptureQueriesContext(connection) as few_queries:
+            self.client.get("/admin/shows/role/")
+        self.add_roles(8)
+        with CaptureQueriesContext(connection) as many_queries:
+            response = self.client.get("/admin/shows/role/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(few_queries), len(many_queries))
+
+    def test_member_autocomplete(self):
+        members = self.add_roles(5)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(
+                "/admin/autocomplete/",
+                {
+                    "app_label": "shows",
+                    "model_name": "role",
+                    "field_name": "performer",
+                    "term": members[0].user.last_name,
+                },
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(
+            {"id": str(members[0].pk), "text": str(members[0])},
+            response.json()["results"],
+        )
+        self.assertLessEqual(len(queries), 5)
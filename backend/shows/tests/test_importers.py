@@ -0,0 +1,257 @@
+import io
+import json
+import os
+import tempfile
+from datetime import time
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from faker import Faker
+
+from api.cache import response_cache
+from shows.importers import (
+    SeasonImporter,
+    SeasonImportError,
+    iter_csv_records,
+    iter_json_records,
+)
+from shows.models import Member, Role, Round, Show
+from slack.models import SlackTask, SlackUser
+from slack.service import SlackBoss
+from slack.tests.utils import PatchSlackBossMixin, fake_slack_id
+from users.tests.utils import fake_user_data
+
+# logging.disable(logging.WARNING)
+
+User = get_user_model()
+
+
+class TestIterJsonRecords(SimpleTestCase):
+    def setUp(self):
+        self.records = [
+            {"model": "shows.show", "pk": i, "fields": {}} for i in range(5)
+        ]
+
+    def test_iter_json_array_across_chunks(self):
+        stream = io.StringIO(json.dumps(self.records, indent=2))
+        self.assertEqual(list(iter_json_records(stream, chunk_size=7)), self.records)
+
+    def test_iter_json_lines(self):
+        stream = io.StringIO("\n".join(json.dumps(r) for r in self.records))
+        self.assertEqual(list(iter_json_records(stream, chunk_size=7)), self.records)
+
+    def test_iter_invalid_json_error(self):
+        with self.assertRaises(ValueError):
+            list(iter_json_records(io.StringIO('[{"model": "shows.show",'), 4))
+
+
+class TestSeasonImporter(PatchSlackBossMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+
+        faker = Faker()
+        Faker.seed(0)
+
+        self.faker = faker
+        self.user_data = fake_user_data(faker, count=3)
+        Group.objects.get_or_create(name="slack_admins")
+
+    def fixture(self, show_count: int = 2):
+        records = [
+            {
+                "model": "users.user",
+                "fields": {
+                    "email": user["email"],
+                    "password": "!",
+                    "first_name": user["first_name"],
+                    "last_name": user["last_name"],
+                    "is_active": True,
+                    "groups": [["slack_admins"]] if i == 0 else [],
+                },
+            }
+            for i, user in enumerate(self.user_data)
+        ]
+        records += [
+            {
+                "model": "shows.member",
+                "pk": i + 1,
+                "fields": {"user": [user["email"]], "class_year": 2},
+            }
+            for i, user in enumerate(self.user_data)
+        ]
+        for show_id in range(1, show_count + 1):
+            records.append(
+                {
+                    "model": "shows.show",
+                    "pk": show_id,
+                    "fields": {
+                        "name": self.faker.word(),
+                        "date": "2023-02-01",
+                        "status": Show.STATUSES.published,
+                        "point": 1,
+                    },
+                }
+            )
+            records += [
+                {
+                    "model": "shows.round",
+                    "fields": {"show": show_id, "time": f"1{hour}:30:00"},
+                }
+                for hour in (4, 2)
+            ]
+            records += [
+                {
+                    "model": "shows.role",
+                    "fields": {"show": show_id, "performer": member_id, "role": 1},
+                }
+                for member_id in (1, 2)
+            ]
+        return records
+
+    def test_import_fixture(self):
+        importer = SeasonImporter(batch_size=4)
+        importer.import_fixture(self.fixture())
+        importer.finish()
+
+        self.assertEqual(User.objects.count(), 3)
+        self.assertEqual(Member.objects.count(), 3)
+        self.assertEqual(Show.objects.count(), 2)
+        self.assertEqual(Round.objects.count(), 4)
+        self.assertEqual(Role.objects.count(), 4)
+        self.assertEqual(
+            User.objects.get(email=self.user_data[0]["email"]).member.pk, 1
+        )
+        self.assertTrue(
+            User.objects.filter(
+                email=self.user_data[0]["email"], groups__name="slack_admins"
+            ).exists()
+        )
+        self.assertEqual(sorted(importer.show_ids), [1, 2])
+        self.assertEqual(Show.objects.get(pk=1).time, time(12, 30))
+
+    def test_import_fixture_has_no_slack_side_effects(self):
+        importer = SeasonImporter()
+        importer.import_fixture(self.fixture())
+        importer.finish()
+
+        self.mock_fetch_user.assert_not_called()
+        self.mock_create_channel.assert_not_called()
+        self.mock_invite_users_to_channel.assert_not_called()
+        self.assertFalse(SlackTask.objects.exists())
+
+    @override_settings(GRAPHQL_RESPONSE_CACHE=True)
+    def test_finish_invalidates_response_cache(self):
+        version = response_cache.version()
+        importer = SeasonImporter()
+        with self.captureOnCommitCallbacks(execute=True):
+            importer.import_fixture(self.fixture())
+            importer.finish()
+        self.assertNotEqual(response_cache.version(), version)
+
+    def test_import_fixture_queries_do_not_scale_with_records(self):
+        with CaptureQueriesContext(connection) as small:
+            SeasonImporter().import_fixture(self.fixture(show_count=2))
+        Show.objects.all().delete()
+        with CaptureQueriesContext(connection) as large:
+            SeasonImporter().import_fixture(self.fixture(show_count=20)[6:])
+        self.assertLessEqual(len(large.captured_queries), len(small.captured_queries))
+
+    def test_import_fixture_invalid_record_error(self):
+        records = self.fixture()
+        records[3]["fields"]["class_year"] = 42
+        with self.assertRaises(SeasonImportError) as context:
+            SeasonImporter().import_fixture(records)
+        self.assertEqual(len(context.exception.errors), 1)
+
+    def test_import_fixture_skips_unknown_models(self):
+        importer = SeasonImporter()
+        importer.import_fixture([{"model": "sessions.session", "fields": {}}])
+        self.assertEqual(importer.counts["skipped"], 1)
+
+    def test_import_csv(self):
+        SeasonImporter().import_fixture(self.fixture(show_count=0))
+        emails = [user["email"] for user in self.user_data]
+        rows = io.StringIO(
+            "name,date,status,priority,rounds,performers\n"
+            f"Show A,2023-02-01,published,urgent,14:00;12:30,{emails[0]}:drum;{emails[1]}\n"
+            f"Show B,,0,1,,{emails[2]}\n"
+        )
+
+        importer = SeasonImporter()
+        importer.import_csv(iter_csv_records(rows))
+        importer.finish()
+
+        show = Show.objects.get(name="Show A")
+        self.assertEqual(show.status, Show.STATUSES.published)
+        self.assertEqual(show.priority, Show.PRIORITIES.urgent)
+        self.assertEqual(show.time, time(12, 30))
+        self.assertEqual(show.rounds.count(), 2)
+        self.assertEqual(
+            Role.objects.get(show=show, performer__user__email=emails[0]).role,
+            Role.ROLES.drum,
+        )
+        self.assertEqual(Show.objects.get(name="Show B").performers.count(), 1)
+        self.assertEqual(importer.counts["shows.show"], 2)
+
+    def test_import_csv_unknown_performer_error(self):
+        rows = io.StringIO("name,performers\nShow A,nobody@example.com\n")
+        with self.assertRaises(SeasonImportError) as context:
+            SeasonImporter().import_csv(iter_csv_records(rows))
+        self.assertIn("nobody@example.com", context.exception.errors[0])
+
+    def test_import_csv_invalid_row_error(self):
+        rows = io.StringIO("name,status\nShow A,published\n")
+        with self.assertRaises(SeasonImportError) as context:
+            SeasonImporter().import_csv(iter_csv_records(rows))
+        self.assertIn("line 2", context.exception.errors[0])
+
+    def test_reconcile(self):
+        importer = SeasonImporter()
+        importer.import_fixture(self.fixture())
+        importer.finish()
+        slack_ids = fake_slack_id(self.faker, count=3)
+        slack_users = [
+            {"id": slack_id, "profile": {"email": user["email"]}}
+            for slack_id, user in zip(slack_ids, self.user_data)
+        ]
+
+        with patch.object(SlackBoss, "list_users", return_value=slack_users):
+            results = importer.reconcile()
+            self.assertEqual(importer.reconcile()["queued"], 0)
+
+        self.assertEqual(results, {"linked": 3, "queued": 2, "reconciled": 0})
+        self.assertEqual(SlackUser.objects.count(), 3)
+        self.assertEqual(SlackTask.objects.count(), 2)
+
+
+class TestImportSeasonCommand(PatchSlackBossMixin, TestCase):
+    def import_file(self, content: str, suffix: str):
+        with tempfile.NamedTemporaryFile("w", suffix=suffix, delete=False) as f:
+            f.write(content)
+        self.addCleanup(os.remove, f.name)
+        stdout = io.StringIO()
+        call_command("import_season", f.name, stdout=stdout)
+        return stdout.getvalue()
+
+    def test_import_csv_file(self):
+        output = self.import_file("name,rounds\nShow A,14:00\n", suffix=".csv")
+        self.assertEqual(Show.objects.get().time, time(14, 0))
+        self.assertIn("1 shows.show", output)
+
+    def test_invalid_file_rolls_back(self):
+        content = "name,lions\nShow A,2\nShow B,many\n"
+        with self.assertRaises(CommandError):
+            self.import_file(content, suffix=".csv")
+        self.assertFalse(Show.objects.exists())
+
+    def test_conflicting_rows_roll_back(self):
+        records = [{"model": "shows.show", "pk": 1, "fields": {"name": "Show A"}}] * 2
+        with self.assertRaises(CommandError):
+            self.import_file(json.dumps(records), suffix=".json")
+        self.assertFalse(Show.objects.exists())
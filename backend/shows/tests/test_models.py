@@ -1,7 +1,12 @@
+from unittest.mock import MagicMock
+
 from django.contrib.auth import get_user_model
 from django.core.exceptions import ValidationError
+from django.db import connection
+from django.db.models.signals import post_save
 from django.db.utils import IntegrityError
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from faker import Faker
 
 from shows.models import Member, Show, Round, Role, Contact
@@ -75,8 +80,10 @@ class TestShowModel(PatchSlackBossMixin, TestCase):
         )
 
         self.round_data = fake_round_data(faker, count=3)
-        for show_round in self.round_data:
-            Round.objects.create(show=self.show, time=show_round["time"])
+        with self.captureOnCommitCallbacks(execute=True):
+            for show_round in self.round_data:
+                Round.objects.create(show=self.show, time=show_round["time"])
+        self.show.refresh_from_db()
 
         for performer in self.members:
             Role.objects.create(show=self.show, performer=performer)
@@ -126,11 +133,69 @@ class TestShowModel(PatchSlackBossMixin, TestCase):
         show = Show.objects.create(name=self.show_data["name"])
         self.assertIsNone(show.time)
         for i, show_round in enumerate(self.round_data):
-            Round.objects.create(show=show, time=show_round["time"])
+            with self.captureOnCommitCallbacks(execute=True):
+                Round.objects.create(show=show, time=show_round["time"])
+            show.refresh_from_db()
             min_time = min([r["time"] for r in self.round_data[: i + 1]])
             self.assertEqual(show.time, min_time)
         self.assertEqual(show.rounds.count(), len(self.round_data))
 
+    def test_update_time_coalesced_per_transaction(self):
+        show = Show.objects.create(name=self.show_data["name"])
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            for show_round in self.round_data:
+                Round.objects.create(show=show, time=show_round["time"])
+        self.assertEqual(len(callbacks), 1)
+        show.refresh_from_db()
+        self.assertEqual(show.time, min(r["time"] for r in self.round_data))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            show.rounds.all().delete()
+        show.refresh_from_db()
+        self.assertIsNone(show.time)
+
+    def test_save_writes_only_dirty_fields(self):
+        show = Show.objects.get(pk=self.show.pk)
+        with self.assertNumQueries(0):
+            show.save()
+
+        show.lions += 1
+        self.assertEqual(show.get_dirty_fields(), ["lions"])
+        self.assertEqual(show.original_value("lions"), self.show_data["lions"])
+        with CaptureQueriesContext(connection) as queries:
+            show.save()
+        update = next(q["sql"] for q in queries if q["sql"].startswith("UPDATE"))
+        self.assertIn('"lions"', update)
+        self.assertNotIn('"address"', update)
+        self.assertFalse(
+            any(q["sql"].startswith("SELECT") and "lions" in q["sql"] for q in queries)
+        )
+        self.assertEqual(show.get_dirty_fields(), [])
+
+    def test_save_without_changes_skips_signals(self):
+        show = Show.objects.get(pk=self.show.pk)
+        receiver = MagicMock()
+        post_save.connect(receiver, sender=Show)
+        self.addCleanup(post_save.disconnect, receiver, sender=Show)
+
+        show.save()
+        receiver.assert_not_called()
+
+        show.lions += 1
+        show.save()
+        receiver.assert_called_once()
+        self.assertEqual(receiver.call_args.kwargs["update_fields"], {"lions"})
+
+    def test_save_copy_with_cleared_pk(self):
+        show = Show.objects.get(pk=self.show.pk)
+        show.pk = None
+        show.save()
+
+        self.assertNotEqual(show.pk, self.show.pk)
+        self.assertEqual(Show.objects.count(), 2)
+        self.assertEqual(Show.objects.get(pk=show.pk).name, self.show.name)
+        self.assertEqual(show.get_dirty_fields(), [])
+
     def test_publish_show_without_date(self):
         show = Show.objects.create(name=self.show_data["name"])
         with self.assertRaises(ValidationError):
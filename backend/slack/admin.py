@@ -1,6 +1,10 @@
-from django.contrib import admin
+from typing import List
 
-from slack.models import SlackUser, SlackChannel
+from django.contrib import admin, messages
+
+from common.admin import retry
+from slack.managers import ChannelResult
+from slack.models import SlackUser, SlackChannel, SlackTask
 
 
 class SlackUserAdmin(admin.ModelAdmin):
@@ -8,16 +12,37 @@ class SlackUserAdmin(admin.ModelAdmin):
     list_display = ["id", "member"]
 
 
+def message_channel_results(
+    modeladmin, request, results: List[ChannelResult], verb: str
+):
+    """Reports the results of a bulk Slack channel operation to the admin.
+
+    Args:
+        modeladmin: The admin the action was run from.
+        request: The request of the action.
+        results: The results of the bulk operation.
+        verb: The past tense of the operation, e.g. "Archived".
+    """
+
+    failed = [result for result in results if not result.ok]
+    modeladmin.message_user(
+        request,
+        f"{verb} {len(results) - len(failed)} Slack channels"
+        + (f", {len(failed)} failed" if failed else ""),
+        level=messages.WARNING if failed else messages.SUCCESS,
+    )
+
+
 @admin.action(description="Refresh Slack channels")
 def force_refresh(modeladmin, request, queryset):
-    for slack_channel in queryset:
-        slack_channel.force_refresh()
+    results = queryset.refresh()
+    message_channel_results(modeladmin, request, results, "Refreshed")
 
 
 @admin.action(description="Archive Slack channels")
 def archive(modeladmin, request, queryset):
-    for slack_channel in queryset:
-        slack_channel.archive(rename=False)
+    results = queryset.archive(rename=False)
+    message_channel_results(modeladmin, request, results, "Archived")
 
 
 class SlackChannelAdmin(admin.ModelAdmin):
@@ -26,5 +51,13 @@ class SlackChannelAdmin(admin.ModelAdmin):
     actions = [force_refresh, archive]
 
 
+class SlackTaskAdmin(admin.ModelAdmin):
+    readonly_fields = ["show", "action", "payload", "attempts", "last_error"]
+    list_display = ["id", "show", "action", "status", "attempts", "run_after"]
+    list_filter = ["status", "action"]
+    actions = [retry]
+
+
 admin.site.register(SlackUser, SlackUserAdmin)
 admin.site.register(SlackChannel, SlackChannelAdmin)
+admin.site.register(SlackTask, SlackTaskAdmin)
@@ -0,0 +1,231 @@
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import Any, Callable, Optional, TYPE_CHECKING, Union, List, Tuple
+
+from django.conf import settings
+from django.utils.functional import lazy
+
+from common.exceptions import WrongUsage
+from slack.exceptions import SlackBossException, SlackTokenException
+
+if TYPE_CHECKING:
+    from users.models import User
+    from shows.models import Member, Show
+    from slack.models import SlackUser, SlackChannel
+
+
+def lazy_label(func: Callable[..., Any], *args) -> str:
+    """Returns a logging label which is only rendered when it is used.
+
+    Labels may follow relations, e.g. the show of a SlackChannel, which costs
+    a query each time. Lazy labels are rendered at most once, and only if a
+    log record containing them is emitted, as long as they are passed to the
+    logging call as arguments rather than formatted into the message.
+
+    Args:
+        func: The function rendering the label.
+        *args: The arguments to call the function with.
+    """
+
+    @lru_cache(maxsize=None)
+    def render() -> str:
+        return str(func(*args))
+
+    return lazy(render, str)()
+
+
+class SlackArgsMixin:
+    """Argument processing shared by the Slack API wrappers.
+
+    The Slack API wrappers accept Slack IDs as well as the models they belong
+    to, e.g. a channel ID, a SlackChannel or a Show. These helpers normalize
+    such arguments into the Slack IDs to send along with labels to log. Labels
+    which depend on related models are lazy, see `lazy_label`.
+    """
+
+    @staticmethod
+    def _get_token_arg(token: Optional[str] = None) -> str:
+        """Processes Slack access token argument.
+
+        If no token is provided, the Slack access token configured with the
+        `SLACK_TOKEN` project setting is used.
+
+        Args:
+            token: The Slack access token.
+
+        Returns:
+            The Slack access token to use.
+
+        Raises:
+            SlackTokenException: If no Slack token is configured.
+        """
+
+        if token:
+            return token
+        if hasattr(settings, "SLACK_TOKEN"):
+            return settings.SLACK_TOKEN
+        raise SlackTokenException(
+            "SLACK_TOKEN must be configured in default settings if slack_token is None"
+        )
+
+    @staticmethod
+    def _get_email_arg(
+        email: Optional[str] = None,
+        user: Optional[User] = None,
+        member: Optional[Member] = None,
+    ) -> Tuple[str, str]:
+        """Processes email argument from various types.
+
+        Args:
+            email: The email address.
+            user: The user to get the email address for.
+            member: The member to get the email address for.
+
+        Returns:
+            A tuple containing the email address along with a user label
+            depending on input type to use for logging purposes.
+
+        Raises:
+            WrongUsage: If none of the optional inputs are provided.
+        """
+
+        if email is not None:
+            return email, email
+        elif user is not None:
+            return user.email, lazy_label(str, user)
+        elif member is not None:
+            if member.user:
+                return member.user.email, lazy_label(str, member)
+            raise SlackBossException(f"Member does not have an associated user")
+        raise WrongUsage("At least one of email, user, or member must be specified")
+
+    @staticmethod
+    def _get_channel_name_arg(
+        name: Optional[str] = None,
+        show: Optional[Show] = None,
+    ) -> Tuple[str, str]:
+        """Processes Slack channel name argument from various types.
+
+        Args:
+            name: The channel name.
+            show: The show to get the channel name for.
+
+        Returns:
+            A tuple containing the channel name along with a channel label
+            depending on input type to use for logging purposes.
+
+        Raises:
+            WrongUsage: If none of the optional inputs are provided.
+        """
+
+        if name is not None:
+            return name, name
+        elif show is not None:
+            return show.default_channel_name(), lazy_label(str, show)
+        raise WrongUsage("At least one of name or show must be specified")
+
+    @staticmethod
+    def _get_slack_channel_id_arg(
+        channel_id: Optional[str] = None,
+        channel: Optional[SlackChannel] = None,
+        show: Optional[Show] = None,
+    ) -> Tuple[str, str]:
+        """Processes Slack channel ID argument from various types.
+
+        Args:
+            channel_id: The Slack channel ID.
+            channel: The Slack channel to get the ID for.
+            show: The show to get the Slack channel ID for.
+
+        Returns:
+            A tuple containing the Slack channel ID along with a channel
+            label depending on input type to use for logging purposes.
+
+        Raises:
+            WrongUsage: If none of the optional inputs are provided.
+        """
+
+        if channel_id is not None:
+            return channel_id, channel_id
+        elif channel is not None:
+            return channel.id, lazy_label(lambda: channel.show.default_channel_name())
+        elif show is not None:
+            if hasattr(show, "channel"):
+                return show.channel.id, lazy_label(show.default_channel_name)
+            raise SlackBossException(f"Show {show} does not have a Slack channel")
+        raise WrongUsage(
+            "At least one of channel_id, channel, or show must be specified"
+        )
+
+    @staticmethod
+    def _get_slack_user_ids_arg(
+        user_ids: Optional[Union[str, List[str]]] = None,
+        users: Optional[Union[SlackUser, List[SlackUser]]] = None,
+    ) -> Tuple[Union[str, List[str]], str]:
+        """Processes Slack user ID arguments from various types.
+
+        Args:
+            user_ids: The Slack user ID or IDs.
+            users: The Slack user or users to get the ID or IDs for.
+
+        Returns:
+            A tuple containing the Slack user ID or IDs along with a Slack users
+            label depending on input type to use for logging purposes.
+
+        Raises:
+            WrongUsage: If none of the optional inputs are provided.
+        """
+
+        if user_ids is not None:
+            return user_ids, str(user_ids)
+        elif users is not None:
+            if isinstance(users, list):
+                return [user.id for user in users], lazy_label(
+                    lambda: [user.member for user in users]
+                )
+            return users.id, str(users)
+        raise WrongUsage("At least one of user_ids or users must be specified")
+
+    @staticmethod
+    def _get_show_arg(
+        show: Optional[Show] = None,
+        channel: Optional[SlackChannel] = None,
+    ) -> Tuple[Show, str]:
+        """Processes show argument from various types.
+
+        Args:
+            show: The show to return.
+            channel: The channel to get the show for.
+
+        Returns:
+            A tuple containing the show along with a show label depending on
+            input type to use for logging purposes.
+
+        Raises:
+            WrongUsage: If none of the optional inputs are provided.
+        """
+
+        if show is not None:
+            return show, lazy_label(str, show)
+        elif channel is not None:
+            return channel.show, lazy_label(str, channel.show)
+        raise WrongUsage("At least one of show or channel must be specified")
+
+    @staticmethod
+    def _get_message_timestamp_arg(
+        ts: Optional[str] = None,
+    ) -> Tuple[Optional[str], str]:
+        """Processes Slack ts argument from various types.
+
+        Args:
+            ts: The unique Slack timestamp of the message.
+
+        Returns:
+            A tuple containing the timestamp along with a timestamp label
+            depending on input type to use for logging purposes.
+        """
+
+        if ts is not None and ts != "":
+            return ts, ts
+        return None, ""
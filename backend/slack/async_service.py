@@ -0,0 +1,603 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections import Counter
+from typing import (
+    Awaitable,
+    List,
+    Optional,
+    TYPE_CHECKING,
+    Tuple,
+    TypeVar,
+    Union,
+)
+from weakref import WeakKeyDictionary
+
+from django.conf import settings
+from slack_sdk.errors import SlackApiError
+from slack_sdk.web.async_client import AsyncWebClient
+from slack_sdk.web.async_slack_response import AsyncSlackResponse
+
+from common.exceptions import WrongUsage
+from common.instrumentation import timed
+from slack.args import SlackArgsMixin
+from slack.exceptions import SlackBossException
+from slack.throttling import TokenBucket, TokenBuckets, retry_after
+
+if TYPE_CHECKING:
+    from users.models import User
+    from shows.models import Member, Show
+    from slack.models import SlackUser, SlackChannel
+
+T = TypeVar("T")
+
+
+class AsyncRateLimitedWebClient(AsyncWebClient):
+    """Async Slack WebClient that schedules calls according to Slack rate limits.
+
+    This is the asyncio counterpart of RateLimitedWebClient, and shares its
+    token buckets, see TokenBuckets. Waiting for a token or for a
+    `Retry-After` delay suspends only the calling task, so concurrent calls
+    to other methods are not held back.
+
+    At most `max_concurrency` calls are in flight at a time on each event
+    loop, however many tasks, possibly nested, issue them.
+
+    Attributes:
+        max_retries: The maximum number of retries for a rate limited call.
+        max_concurrency: The maximum number of calls in flight at a time.
+        stats: Counters of calls, throttled calls and retried calls.
+    """
+
+    def __init__(self, *args, max_retries: int = 3, max_concurrency: int = 8, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.max_retries = max_retries
+        self.max_concurrency = max_concurrency
+        self.stats = Counter()
+        self.buckets = TokenBuckets.for_token(self.token)
+        self.semaphores: WeakKeyDictionary = WeakKeyDictionary()
+
+    def bucket(self, api_method: str) -> TokenBucket:
+        return self.buckets.get(api_method)
+
+    def semaphore(self) -> asyncio.Semaphore:
+        """Returns the semaphore bounding the calls on the running event loop."""
+
+        loop = asyncio.get_running_loop()
+        if loop not in self.semaphores:
+            self.semaphores[loop] = asyncio.Semaphore(self.max_concurrency)
+        return self.semaphores[loop]
+
+    async def api_call(self, api_method: str, **kwargs) -> AsyncSlackResponse:
+        with timed("slack"):
+            bucket = self.bucket(api_method)
+            attempt = 0
+            while True:
+                wait = bucket.reserve()
+                if wait > 0:
+                    self.stats["throttled"] += 1
+                    await asyncio.sleep(wait)
+                self.stats["calls"] += 1
+                try:
+                    async with self.semaphore():
+                        return await super().api_call(api_method, **kwargs)
+                except SlackApiError as api_error:
+                    delay = retry_after(api_error.response)
+                    if delay is None or attempt >= self.max_retries:
+                        raise
+                    attempt += 1
+                    self.stats["retried"] += 1
+                    logging.warning(
+                        f"Slack {api_method} is rate limited, retrying in {delay}s ..."
+                    )
+                    bucket.pause(delay)
+
+
+class AsyncSlackBoss(SlackArgsMixin):
+    """Custom Slack API AsyncWebClient wrapper.
+
+    AsyncSlackBoss mirrors SlackBoss for use from async views, and from
+    management commands through `asyncio.run`, e.g. by the bulk operations of
+    SlackChannelQuerySet. Operations on multiple users issue their Slack
+    calls concurrently, with at most `max_concurrency` calls in flight at a
+    time across all of them, see AsyncRateLimitedWebClient.
+
+    The ORM cannot be queried from async code, so model arguments must have
+    the relations used for logging labels loaded already, e.g. the show of
+    a SlackChannel or the member of a SlackUser.
+
+    Attributes:
+        token: The Slack access token to use, typically a bot token
+        client: The rate limited async Slack web client
+        max_concurrency: The maximum number of concurrent Slack calls
+    """
+
+    token: str
+    client: AsyncRateLimitedWebClient
+    max_concurrency: int
+
+    def __init__(
+        self, token: Optional[str] = None, max_concurrency: Optional[int] = None
+    ):
+        """Initializes AsyncSlackBoss by creating a Slack API AsyncWebClient.
+
+        Args:
+            token: Slack access token to configure the AsyncWebClient
+            max_concurrency: The maximum number of concurrent Slack calls,
+                defaulting to the `SLACK_MAX_CONCURRENCY` project setting.
+
+        Raises:
+            SlackTokenException: If no Slack token is configured.
+        """
+
+        self.token = self._get_token_arg(token)
+        self.max_concurrency = max_concurrency or settings.SLACK_MAX_CONCURRENCY
+        self.client = AsyncRateLimitedWebClient(
+            token=self.token,
+            max_retries=settings.SLACK_MAX_RETRIES,
+            max_concurrency=self.max_concurrency,
+        )
+
+    def stats(self) -> dict:
+        """Returns counters of Slack API calls, throttled calls and retries."""
+
+        return dict(self.client.stats)
+
+    async def gather(
+        self, *aws: Awaitable[T], return_exceptions: bool = False
+    ) -> List[Union[T, BaseException]]:
+        """Awaits the given awaitables concurrently.
+
+        The Slack calls they make are bounded by the client, so gathers can be
+        nested without multiplying the number of calls in flight.
+
+        Args:
+            *aws: The awaitables to run, typically AsyncSlackBoss calls.
+            return_exceptions: Whether to return exceptions as results
+                instead of raising the first one.
+
+        Returns:
+            The results of the awaitables in the order they were given.
+        """
+
+        return await asyncio.gather(*aws, return_exceptions=return_exceptions)
+
+    async def fetch_user(
+        self,
+        email: Optional[str] = None,
+        user: Optional[User] = None,
+        member: Optional[Member] = None,
+    ) -> str:
+        """Fetches Slack user ID for the specified member by email.
+
+        One of email, user, or member should be provided.
+
+        Args:
+            email: The email address associated with the Slack user.
+            user: The user to fetch the Slack user ID for.
+            member: The member to fetch the Slack user ID for.
+
+        Returns:
+            The fetched user's Slack ID. None if there was no match.
+
+        Raises:
+            SlackBossException: If there was an error fetching the user ID.
+        """
+
+        email, member_label = self._get_email_arg(email=email, user=user, member=member)
+
+        logging.info("Fetching Slack user for %s ...", member_label)
+        try:
+            response = await self.client.users_lookupByEmail(email=email)
+        except SlackApiError as api_error:
+            error = api_error.response.get("error")
+            if error == "users_not_found":
+                logging.warning(f"{email} is not in the Slack workspace")
+            else:
+                raise SlackBossException(error)
+        else:
+            logging.debug(response)
+            return response["user"]["id"]
+
+    async def fetch_channel_name(
+        self,
+        channel_id: Optional[str] = None,
+        channel: Optional[SlackChannel] = None,
+        show: Optional[Show] = None,
+    ):
+        """Fetches the name of the specified Slack channel.
+
+        One of channel_id, channel, or show should be provided.
+
+        Args:
+            channel_id: The Slack ID for the channel to fetch the name for.
+            channel: The Slack channel to fetch the name for.
+            show: The show to fetch the name of the Slack channel for.
+
+        Raises:
+            SlackBossException: If there was an error fetching info on the channel.
+        """
+
+        channel_id, channel_label = self._get_slack_channel_id_arg(
+            channel_id=channel_id, channel=channel, show=show
+        )
+
+        logging.info("Fetching info on channel %s ...", channel_label)
+        try:
+            response = await self.client.conversations_info(channel=channel_id)
+        except SlackApiError as api_error:
+            error = api_error.response.get("error")
+            raise SlackBossException(error)
+        else:
+            logging.debug(response)
+            return response["channel"]["name"]
+
+    async def list_channel_members(
+        self,
+        channel_id: Optional[str] = None,
+        channel: Optional[SlackChannel] = None,
+        show: Optional[Show] = None,
+        limit: int = 200,
+    ) -> List[str]:
+        """Lists the members of the specified Slack channel.
+
+        The conversations.members results are paginated, so this follows the
+        response cursors until all pages have been fetched.
+
+        One of channel_id, channel, or show should be provided.
+
+        Args:
+            channel_id: The Slack ID for the channel to list the members of.
+            channel: The Slack channel to list the members of.
+            show: The show to list the Slack channel members for.
+            limit: The maximum number of members to fetch per page.
+
+        Returns:
+            The Slack user IDs of all members of the channel.
+
+        Raises:
+            SlackBossException: If there was an error listing the members.
+        """
+
+        channel_id, channel_label = self._get_slack_channel_id_arg(
+            channel_id=channel_id, channel=channel, show=show
+        )
+
+        members, cursor = [], None
+        while True:
+            logging.info("Listing members of channel %s ...", channel_label)
+            try:
+                response = await self.client.conversations_members(
+                    channel=channel_id, cursor=cursor, limit=limit
+                )
+            except SlackApiError as api_error:
+                error = api_error.response.get("error")
+                raise SlackBossException(error)
+            members.extend(response["members"])
+            cursor = response.get("response_metadata", {}).get("next_cursor")
+            if not cursor:
+                return members
+
+    async def create_channel(
+        self, name: Optional[str] = None, show: Optional[Show] = None
+    ):
+        """Creates Slack channel for the specified show.
+
+        One of name or show should be provided.
+
+        Args:
+            name: The name to use for the Slack channel.
+            show: The show to create the Slack channel for.
+
+        Returns:
+            The created channel's Slack ID.
+
+        Raises:
+            SlackBossException: If there was an error creating the channel.
+        """
+
+        name, show_label = self._get_channel_name_arg(name=name, show=show)
+
+        logging.info("Creating Slack channel for %s ...", show_label)
+        try:
+            response = await self.client.conversations_create(
+                name=name, is_private=False
+            )
+        except SlackApiError as api_error:
+            error = api_error.response.get("error")
+            raise SlackBossException(error)
+        else:
+            logging.debug(response)
+            return response["channel"]["id"]
+
+    async def archive_channel(
+        self,
+        channel_id: Optional[str] = None,
+        channel: Optional[SlackChannel] = None,
+        show: Optional[Show] = None,
+    ):
+        """Archives the specified Slack channel.
+
+        One of channel_id, channel, or show should be provided.
+
+        Args:
+            channel_id: The Slack ID for the channel to archive.
+            channel: The Slack channel to archive.
+            show: The show to archive the Slack channel for.
+
+        Raises:
+            SlackBossException: If there was an error archiving the channel.
+        """
+
+        channel_id, channel_label = self._get_slack_channel_id_arg(
+            channel_id=channel_id, channel=channel, show=show
+        )
+
+        logging.info("Archiving channel %s ...", channel_label)
+        try:
+            response = await self.client.conversations_archive(channel=channel_id)
+        except SlackApiError as api_error:
+            error = api_error.response.get("error")
+            raise SlackBossException(error)
+        else:
+            logging.debug(response)
+            return True
+
+    async def rename_channel(
+        self,
+        channel_id: Optional[str] = None,
+        channel: Optional[SlackChannel] = None,
+        show: Optional[Show] = None,
+        name: Optional[str] = None,
+        check: bool = False,
+    ):
+        """Renames the specified Slack channel.
+
+        One of channel_id, channel, or show should be provided.
+        One of name or show should be provided.
+
+        Args:
+            channel_id: The Slack ID for the channel to rename.
+            channel: The Slack channel to rename.
+            show: The show to rename the Slack channel for.
+            name: The name to use for the Slack channel.
+            check: Whether to check current channel name to avoid unnecessary updates
+
+        Returns:
+            A bool indicating whether the channel name was updated.
+
+        Raises:
+            SlackBossException: If there was an error renaming the channel.
+        """
+
+        name, _ = self._get_channel_name_arg(name=name, show=show)
+        channel_id, channel_label = self._get_slack_channel_id_arg(
+            channel_id=channel_id, channel=channel, show=show
+        )
+
+        if check:
+            current_name = await self.fetch_channel_name(channel_id=channel_id)
+            if name == current_name:
+                return False
+
+        logging.info("Renaming channel %s ...", channel_label)
+        try:
+            response = await self.client.conversations_rename(
+                channel=channel_id, name=name
+            )
+        except SlackApiError as api_error:
+            error = api_error.response.get("error")
+            raise SlackBossException(error)
+        else:
+            logging.debug(response)
+            return True
+
+    async def invite_users_to_channel(
+        self,
+        channel_id: Optional[str] = None,
+        channel: Optional[SlackChannel] = None,
+        show: Optional[Show] = None,
+        user_ids: Union[str, List[str]] = None,
+        users: Union[SlackUser, List[SlackUser]] = None,
+    ):
+        """Invites specified Slack users to the specified channel.
+
+        One of channel_id, channel, or show should be provided.
+        One of user_ids or users should be provided.
+
+        Args:
+            channel_id: The Slack ID for the channel to invite users to.
+            channel: The Slack channel to invite users to.
+            show: The show to invite users to the Slack channel for.
+            user_ids: The Slack IDs of the user or users to invite.
+            users: The Slack user or users to invite.
+
+        Raises:
+            SlackBossException: If there was an error inviting the users.
+        """
+
+        channel_id, channel_label = self._get_slack_channel_id_arg(
+            channel_id=channel_id, channel=channel, show=show
+        )
+        user_ids, members_label = self._get_slack_user_ids_arg(
+            user_ids=user_ids, users=users
+        )
+
+        logging.info("Inviting %s to channel %s ...", members_label, channel_label)
+        try:
+            response = await self.client.conversations_invite(
+                channel=channel_id, users=user_ids
+            )
+        except SlackApiError as api_error:
+            error = api_error.response.get("error")
+            if error == "already_in_channel":
+                logging.info(f"{user_ids} is already in the Slack channel")
+            else:
+                raise SlackBossException(error)
+        else:
+            logging.debug(response)
+        return True
+
+    async def remove_users_from_channel(
+        self,
+        channel_id: Optional[str] = None,
+        channel: Optional[SlackChannel] = None,
+        show: Optional[Show] = None,
+        user_ids: Union[str, List[str]] = None,
+        users: Union[SlackUser, List[SlackUser]] = None,
+    ):
+        """Removes specified Slack users from the specified channel.
+
+        Slack only kicks one user per call, so the calls for multiple users
+        are made concurrently.
+
+        One of channel_id, channel, or show should be provided.
+        One of user_ids or users should be provided.
+
+        Args:
+            channel_id: The Slack ID for the channel to remove users from.
+            channel: The Slack channel to remove users from.
+            show: The show to removes users from the Slack channel for.
+            user_ids: The Slack IDs of the user or users to remove.
+            users: The Slack user or users to remove.
+
+        Raises:
+            SlackBossException: If there was an error removing the users.
+        """
+
+        channel_id, channel_label = self._get_slack_channel_id_arg(
+            channel_id=channel_id, channel=channel, show=show
+        )
+        user_ids, members_label = self._get_slack_user_ids_arg(
+            user_ids=user_ids, users=users
+        )
+
+        logging.info("Removing %s from channel %s ...", members_label, channel_label)
+        if not isinstance(user_ids, list):
+            user_ids = [user_ids]
+        await self.gather(
+            *(self._kick_user(channel_id, user_id) for user_id in user_ids)
+        )
+        return True
+
+    async def _kick_user(self, channel_id: str, user_id: str):
+        try:
+            response = await self.client.conversations_kick(
+                channel=channel_id, user=user_id
+            )
+        except SlackApiError as api_error:
+            error = api_error.response.get("error")
+            if error == "not_in_channel":
+                logging.info(f"{user_id} is not in the Slack channel")
+            else:
+                raise SlackBossException(error)
+        else:
+            logging.debug(response)
+
+    async def send_message_in_channel(
+        self,
+        channel_id: Optional[str] = None,
+        channel: Optional[SlackChannel] = None,
+        show: Optional[Show] = None,
+        ts: Optional[str] = None,
+        blocks: List = None,
+        text: Optional[str] = None,
+    ) -> Tuple[str, bool]:
+        """Sends or updates a message in the specified channel.
+
+        If ts is provided, the message with timestamp ts will be updated.
+        Otherwise, a new message will be sent.
+
+        One of channel_id, channel, or show should be provided.
+
+        Args:
+            channel_id: The Slack ID for the channel to send the message in.
+            channel: The Slack channel to send the message in.
+            show: The show to send the message in the Slack channel for.
+            ts: The unique Slack timestamp of the message to update.
+            blocks: the Slack blocks for the message
+            text: the text to use for Slack message notifications
+
+        Returns:
+            The ts of the message that was sent or updated, along with a bool
+            indicating whether a new message was sent.
+
+        Raises:
+            SlackBossException: If there was an error sending the message.
+        """
+
+        if not blocks:
+            raise WrongUsage("Blocks must be provided")
+
+        channel_id, channel_label = self._get_slack_channel_id_arg(
+            channel_id=channel_id, channel=channel, show=show
+        )
+        ts, _ = self._get_message_timestamp_arg(ts=ts)
+
+        is_new_message = ts is None
+
+        try:
+            if is_new_message:
+                logging.info("Sending message in channel %s ...", channel_label)
+                response = await self.client.chat_postMessage(
+                    channel=channel_id, blocks=blocks, text=text
+                )
+            else:
+                logging.info("Updating message in channel %s ...", channel_label)
+                response = await self.client.chat_update(
+                    channel=channel_id, ts=ts, blocks=blocks, text=text
+                )
+        except SlackApiError as api_error:
+            error = api_error.response.get("error")
+            raise SlackBossException(error)
+        else:
+            logging.debug(response)
+            return response["ts"], is_new_message
+
+    async def pin_message_in_channel(
+        self,
+        channel_id: Optional[str] = None,
+        channel: Optional[SlackChannel] = None,
+        show: Optional[Show] = None,
+        ts: str = None,
+    ):
+        """Pins the specified message in the channel.
+
+        One of channel_id, channel, or show should be provided.
+
+        Args:
+            channel_id: The Slack ID for the channel to pin the message in.
+            channel: The Slack channel to pin the message in.
+            show: The show to pin the message in the Slack channel for.
+            ts: The unique Slack timestamp of the message to pin.
+
+        Raises:
+            SlackBossException: If there was an error pinning the message.
+        """
+
+        if not ts:
+            raise WrongUsage("Message timestamp must be provided")
+
+        channel_id, channel_label = self._get_slack_channel_id_arg(
+            channel_id=channel_id, channel=channel, show=show
+        )
+        ts, ts_label = self._get_message_timestamp_arg(ts=ts)
+
+        logging.info("Pinning message %s in channel %s ...", ts_label, channel_label)
+        try:
+            response = await self.client.pins_add(channel=channel_id, timestamp=ts)
+        except SlackApiError as api_error:
+            error = api_error.response.get("error")
+            if error == "already_pinned":
+                logging.info("Message %s is already pinned", ts_label)
+            elif error == "not_pinnable":
+                logging.info("Message %s is not pinnable", ts_label)
+            else:
+                raise SlackBossException(error)
+        else:
+            logging.debug(response)
+            return True
+
+
+async_slack_boss = AsyncSlackBoss()
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import logging
+from typing import Dict, Iterable, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+
+from slack.service import SlackBoss, slack_boss
+
+
+class SlackDirectory:
+    """Cache of Slack user IDs keyed by email address.
+
+    Lookups that miss the cache fall back to users.lookupByEmail. Emails that
+    are not in the Slack workspace are cached as negative entries with a
+    shorter TTL, so that members who have not joined Slack do not trigger a
+    lookup on every save.
+
+    Attributes:
+        boss: The SlackBoss used to query the Slack API on cache misses.
+    """
+
+    NOT_FOUND = ""
+
+    def __init__(self, boss: SlackBoss):
+        self.boss = boss
+
+    @staticmethod
+    def _key(email: str) -> str:
+        return f"slack:user:{email.lower()}"
+
+    def _set(self, email: str, user_id: Optional[str]):
+        if user_id is None:
+            cache.set(
+                self._key(email),
+                self.NOT_FOUND,
+                settings.SLACK_DIRECTORY_NEGATIVE_TTL,
+            )
+        else:
+            cache.set(self._key(email), user_id, settings.SLACK_DIRECTORY_TTL)
+
+    def lookup(self, email: str) -> Optional[str]:
+        """Returns the Slack user ID for an email address.
+
+        Args:
+            email: The email address associated with the Slack user.
+
+        Returns:
+            The Slack user ID. None if the email is not in the workspace.
+
+        Raises:
+            SlackBossException: If there was an error fetching the user ID.
+        """
+
+        user_id = cache.get(self._key(email))
+        if user_id is None:
+            user_id = self.boss.fetch_user(email=email)
+            self._set(email, user_id)
+        return user_id or None
+
+    def warm(self, emails: Iterable[str] = ()) -> Dict[str, str]:
+        """Populates the cache from a single paginated users.list scan.
+
+        Args:
+            emails: Email addresses to cache negative entries for if they
+                are not in the Slack workspace.
+
+        Returns:
+            A dict mapping lowercase email addresses to Slack user IDs.
+
+        Raises:
+            SlackBossException: If there was an error listing the users.
+        """
+
+        directory = {
+            user["profile"]["email"].lower(): user["id"]
+            for user in self.boss.list_users()
+            if not user.get("deleted") and user.get("profile", {}).get("email")
+        }
+        logging.info(f"Caching {len(directory)} Slack users ...")
+        cache.set_many(
+            {self._key(email): user_id for email, user_id in directory.items()},
+            settings.SLACK_DIRECTORY_TTL,
+        )
+        for email in emails:
+            if email.lower() not in directory:
+                self._set(email, None)
+        return directory
+
+
+slack_directory = SlackDirectory(slack_boss)
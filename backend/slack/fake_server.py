@@ -0,0 +1,386 @@
+from __future__ import annotations
+
+import json
+import logging
+import random
+import threading
+import time
+from collections import Counter, defaultdict, deque
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Deque, Dict, Iterable, Iterator, Optional, Tuple
+from urllib.parse import parse_qsl, urlsplit
+
+from slack.async_service import async_slack_boss
+from slack.service import slack_boss
+
+
+class FakeSlackError(Exception):
+    """Slack Web API error returned by the fake Slack server."""
+
+    def __init__(self, error: str):
+        super().__init__(error)
+        self.error = error
+
+
+class FakeSlackWorkspace:
+    """In-memory state of the workspace served by the fake Slack server.
+
+    Implements the subset of the Slack Web API used by SlackBoss and
+    AsyncSlackBoss, returning the same errors as Slack for the conditions
+    SlackBoss handles, e.g. `already_in_channel` or `already_pinned`.
+    """
+
+    def __init__(self):
+        self.users: Dict[str, str] = {}
+        self.channels: Dict[str, dict] = {}
+        self.lock = threading.Lock()
+        self._ids = Counter()
+
+    def _next_id(self, prefix: str) -> str:
+        self._ids[prefix] += 1
+        return f"{prefix}{self._ids[prefix]:09d}"
+
+    def add_user(self, email: str) -> str:
+        """Adds a user to the workspace, returning their Slack ID."""
+
+        with self.lock:
+            if email not in self.users:
+                self.users[email] = self._next_id("U")
+            return self.users[email]
+
+    def _channel(self, channel_id: str, active: bool = True) -> dict:
+        channel = self.channels.get(channel_id)
+        if channel is None:
+            raise FakeSlackError("channel_not_found")
+        if active and channel["is_archived"]:
+            raise FakeSlackError("is_archived")
+        return channel
+
+    @staticmethod
+    def _page(items: list, args: dict) -> Tuple[list, dict]:
+        start = int(args.get("cursor") or 0)
+        limit = int(args.get("limit") or 100)
+        end = start + limit
+        next_cursor = str(end) if end < len(items) else ""
+        return items[start:end], {"next_cursor": next_cursor}
+
+    @staticmethod
+    def _info(channel: dict) -> dict:
+        return {key: channel[key] for key in ["id", "name", "is_archived", "created"]}
+
+    def call(self, api_method: str, args: dict) -> dict:
+        """Performs a Slack Web API method.
+
+        Args:
+            api_method: The Slack API method name, e.g. `chat.postMessage`.
+            args: The arguments of the call.
+
+        Returns:
+            The response body of a successful call, without `ok`.
+
+        Raises:
+            FakeSlackError: If the call fails.
+        """
+
+        handler = getattr(self, api_method.replace(".", "_"), None)
+        if handler is None:
+            raise FakeSlackError("unknown_method")
+        with self.lock:
+            return handler(args)
+
+    def users_lookupByEmail(self, args: dict) -> dict:
+        email = args.get("email")
+        if email not in self.users:
+            raise FakeSlackError("users_not_found")
+        return {"user": {"id": self.users[email], "profile": {"email": email}}}
+
+    def users_list(self, args: dict) -> dict:
+        users = [
+            {"id": user_id, "profile": {"email": email}}
+            for email, user_id in self.users.items()
+        ]
+        members, metadata = self._page(users, args)
+        return {"members": members, "response_metadata": metadata}
+
+    def conversations_create(self, args: dict) -> dict:
+        name = args.get("name")
+        if not name:
+            raise FakeSlackError("invalid_name_required")
+        if any(channel["name"] == name for channel in self.channels.values()):
+            raise FakeSlackError("name_taken")
+        channel = {
+            "id": self._next_id("C"),
+            "name": name,
+            "is_archived": False,
+            "created": int(time.time()),
+            "members": set(),
+            "messages": {},
+            "pins": set(),
+        }
+        self.channels[channel["id"]] = channel
+        return {"channel": self._info(channel)}
+
+    def conversations_info(self, args: dict) -> dict:
+        return {"channel": self._info(self._channel(args.get("channel"), False))}
+
+    def conversations_rename(self, args: dict) -> dict:
+        channel = self._channel(args.get("channel"))
+        name = args.get("name")
+        if any(
+            other["name"] == name and other is not channel
+            for other in self.channels.values()
+        ):
+            raise FakeSlackError("name_taken")
+        channel["name"] = name
+        return {"channel": self._info(channel)}
+
+    def conversations_archive(self, args: dict) -> dict:
+        channel = self._channel(args.get("channel"), False)
+        if channel["is_archived"]:
+            raise FakeSlackError("already_archived")
+        channel["is_archived"] = True
+        return {}
+
+    def conversations_invite(self, args: dict) -> dict:
+        channel = self._channel(args.get("channel"))
+        user_ids = set(filter(None, str(args.get("users", "")).split(",")))
+        if not user_ids:
+            raise FakeSlackError("no_user")
+        if not user_ids.issubset(self.users.values()):
+            raise FakeSlackError("user_not_found")
+        if user_ids.issubset(channel["members"]):
+            raise FakeSlackError("already_in_channel")
+        channel["members"].update(user_ids)
+        return {"channel": self._info(channel)}
+
+    def conversations_kick(self, args: dict) -> dict:
+        channel = self._channel(args.get("channel"))
+        user_id = args.get("user")
+        if user_id not in channel["members"]:
+            raise FakeSlackError("not_in_channel")
+        channel["members"].discard(user_id)
+        return {}
+
+    def conversations_members(self, args: dict) -> dict:
+        channel = self._channel(args.get("channel"), False)
+        members, metadata = self._page(sorted(channel["members"]), args)
+        return {"members": members, "response_metadata": metadata}
+
+    def chat_postMessage(self, args: dict) -> dict:
+        channel = self._channel(args.get("channel"))
+        ts = f"{time.time():.6f}"
+        while ts in channel["messages"]:
+            ts = f"{float(ts) + 0.000001:.6f}"
+        channel["messages"][ts] = {"ts": ts, "text": args.get("text")}
+        return {"channel": channel["id"], "ts": ts, "message": channel["messages"][ts]}
+
+    def chat_update(self, args: dict) -> dict:
+        channel = self._channel(args.get("channel"))
+        ts = args.get("ts")
+        if ts not in channel["messages"]:
+            raise FakeSlackError("message_not_found")
+        channel["messages"][ts]["text"] = args.get("text")
+        return {"channel": channel["id"], "ts": ts, "text": args.get("text")}
+
+    def pins_add(self, args: dict) -> dict:
+        channel = self._channel(args.get("channel"))
+        ts = args.get("timestamp")
+        if ts not in channel["messages"]:
+            raise FakeSlackError("message_not_found")
+        if ts in channel["pins"]:
+            raise FakeSlackError("already_pinned")
+        channel["pins"].add(ts)
+        return {}
+
+
+class FakeSlackRequestHandler(BaseHTTPRequestHandler):
+    server: FakeSlackServer
+
+    def do_GET(self):
+        self.handle_api_call()
+
+    def do_POST(self):
+        self.handle_api_call()
+
+    def read_args(self) -> dict:
+        url = urlsplit(self.path)
+        args = dict(parse_qsl(url.query))
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length).decode("utf-8") if length else ""
+        if body and "json" in self.headers.get("Content-Type", ""):
+            args.update(json.loads(body))
+        elif body:
+            args.update(parse_qsl(body))
+        return args
+
+    def handle_api_call(self):
+        api_method = urlsplit(self.path).path.rstrip("/").rsplit("/", 1)[-1]
+        args = self.read_args()
+        status, headers, body = self.server.respond(api_method, args)
+        content = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(content)))
+        for key, value in headers.items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, format, *args):
+        logging.debug(f"Fake Slack server: {format % args}")
+
+
+class FakeSlackServer(ThreadingHTTPServer):
+    """Local stand-in for the Slack Web API, for tests and benchmarks.
+
+    The server listens on a local port in a background thread and serves
+    the Slack API methods used by SlackBoss against a FakeSlackWorkspace.
+    Every call is delayed by `latency` plus up to `jitter` seconds, and may
+    fail with an injected error or `ratelimited` response with a Retry-After
+    header, at the configured rates.
+
+    Errors can also be queued for specific methods with `inject`, which take
+    precedence over the random injection.
+
+    Attributes:
+        workspace: The state of the fake Slack workspace.
+        latency: The minimum delay of each call, in seconds.
+        jitter: The maximum random delay added to each call, in seconds.
+        error_rate: The fraction of calls failing with `internal_error`.
+        rate_limit_rate: The fraction of calls failing with `ratelimited`.
+        retry_after: The Retry-After delay of rate limited calls, in seconds.
+        stats: Counters of calls per method, and of injected failures.
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        rate_limit_rate: float = 0.0,
+        retry_after: float = 1.0,
+        seed: Optional[int] = None,
+        port: int = 0,
+    ):
+        super().__init__(("127.0.0.1", port), FakeSlackRequestHandler)
+        self.workspace = FakeSlackWorkspace()
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.retry_after = retry_after
+        self.stats = Counter()
+        self._random = random.Random(seed)
+        self._injected: Dict[str, Deque[str]] = defaultdict(deque)
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        """The base URL to configure Slack web clients with."""
+
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/api/"
+
+    def __enter__(self) -> FakeSlackServer:
+        self.start()
+        return self
+
+    def __exit__(self, *args):
+        self.stop()
+
+    def start(self):
+        """Starts serving requests in a background thread."""
+
+        self._thread = threading.Thread(
+            target=self.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        """Stops serving requests and closes the server socket."""
+
+        self.shutdown()
+        self.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def inject(self, api_method: str, error: str = "ratelimited", times: int = 1):
+        """Makes the next calls to a method fail with an error.
+
+        Args:
+            api_method: The Slack API method name, e.g. `chat.postMessage`.
+            error: The Slack error to fail with, `ratelimited` for a 429.
+            times: The number of calls to fail.
+        """
+
+        with self._lock:
+            self._injected[api_method].extend([error] * times)
+
+    def _injected_error(self, api_method: str) -> Optional[str]:
+        with self._lock:
+            delay = self.latency + self._random.uniform(0, self.jitter)
+            roll = self._random.random()
+            if self._injected[api_method]:
+                error = self._injected[api_method].popleft()
+            elif roll < self.rate_limit_rate:
+                error = "ratelimited"
+            elif roll < self.rate_limit_rate + self.error_rate:
+                error = "internal_error"
+            else:
+                error = None
+        time.sleep(delay)
+        return error
+
+    def respond(self, api_method: str, args: dict) -> Tuple[int, dict, dict]:
+        """Returns the status, headers and body of the response to a call."""
+
+        with self._lock:
+            self.stats[api_method] += 1
+        error = self._injected_error(api_method)
+        if error == "ratelimited":
+            with self._lock:
+                self.stats["ratelimited"] += 1
+            return (
+                429,
+                {"Retry-After": str(self.retry_after)},
+                {"ok": False, "error": error},
+            )
+        if error is not None:
+            with self._lock:
+                self.stats["errors"] += 1
+            return 200, {}, {"ok": False, "error": error}
+
+        try:
+            body = self.workspace.call(api_method, args)
+        except FakeSlackError as api_error:
+            return 200, {}, {"ok": False, "error": api_error.error}
+        return 200, {}, {"ok": True, **body}
+
+
+@contextmanager
+def use_fake_slack(
+    server: FakeSlackServer, emails: Iterable[str] = ()
+) -> Iterator[FakeSlackServer]:
+    """Points the SlackBoss and AsyncSlackBoss clients at a fake Slack server.
+
+    Args:
+        server: The running fake Slack server.
+        emails: The emails of users to add to the fake workspace.
+    """
+
+    for email in emails:
+        server.workspace.add_user(email)
+
+    clients = [slack_boss.client, async_slack_boss.client]
+    base_urls = [client.base_url for client in clients]
+    for client in clients:
+        client.base_url = server.url
+    try:
+        yield server
+    finally:
+        for client, base_url in zip(clients, base_urls):
+            client.base_url = base_url
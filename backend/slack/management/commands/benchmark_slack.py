@@ -0,0 +1,181 @@
+import math
+import time
+import uuid
+from collections import Counter, defaultdict
+from datetime import date, timedelta
+from itertools import islice
+from typing import Dict, List
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from shows.models import Member, Role, Show
+from slack.fake_server import FakeSlackServer, use_fake_slack
+from slack.models import SlackChannel, SlackTask
+from slack.service import slack_boss
+from users.models import User
+
+FLOWS = ["publish", "update", "archive"]
+
+
+def percentile(values: List[float], percent: float) -> float:
+    """Returns the nearest-rank percentile of a list of values."""
+
+    ordered = sorted(values)
+    rank = max(1, math.ceil(percent / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmarks show publish, update and archive Slack flows against a local "
+        "fake Slack server with injected latency and rate limiting. Temporary "
+        "shows and users are created in the database, so the command only runs "
+        "with DEBUG or --yes"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--shows", type=int, default=10, help="Number of shows to run flows for"
+        )
+        parser.add_argument(
+            "--performers", type=int, default=5, help="Number of performers per show"
+        )
+        parser.add_argument(
+            "--latency",
+            type=float,
+            default=50.0,
+            help="Minimum latency of each Slack call, in milliseconds",
+        )
+        parser.add_argument(
+            "--jitter",
+            type=float,
+            default=0.0,
+            help="Maximum random latency added to each Slack call, in milliseconds",
+        )
+        parser.add_argument(
+            "--error-rate",
+            type=float,
+            default=0.0,
+            help="Fraction of Slack calls failing with internal_error",
+        )
+        parser.add_argument(
+            "--rate-limit-rate",
+            type=float,
+            default=0.0,
+            help="Fraction of Slack calls failing with ratelimited",
+        )
+        parser.add_argument(
+            "--retry-after",
+            type=float,
+            default=1.0,
+            help="Retry-After delay of rate limited calls, in seconds",
+        )
+        parser.add_argument(
+            "--seed", type=int, default=None, help="Seed for the injected failures"
+        )
+        parser.add_argument(
+            "--yes",
+            action="store_true",
+            help="Run even though DEBUG is off, e.g. against a staging database",
+        )
+
+    def handle(self, *args, **options):
+        if not (settings.DEBUG or options["yes"]):
+            raise CommandError(
+                "benchmark_slack creates and deletes shows and users in the "
+                "database. Pass --yes to run it with DEBUG off."
+            )
+
+        run = uuid.uuid4().hex[:8]
+        emails = [
+            f"benchmark-{run}-{i}@example.com"
+            for i in range(options["shows"] * options["performers"])
+        ]
+        server = FakeSlackServer(
+            latency=options["latency"] / 1000,
+            jitter=options["jitter"] / 1000,
+            retry_after=options["retry_after"],
+            seed=options["seed"],
+        )
+
+        timings: Dict[str, List[float]] = defaultdict(list)
+        failures = Counter()
+        client_stats = Counter(slack_boss.stats())
+        with server, use_fake_slack(server, emails=emails):
+            users = User.objects.bulk_create(
+                [
+                    User(email=email, first_name="Benchmark", last_name=str(i))
+                    for i, email in enumerate(emails)
+                ]
+            )
+            shows = []
+            try:
+                members = iter([Member.objects.create(user=user) for user in users])
+                for i in range(options["shows"]):
+                    show = Show.objects.create(
+                        name=f"benchmark {run} {i}", date=date.today()
+                    )
+                    shows.append(show)
+                    performers = islice(members, options["performers"])
+                    Role.objects.bulk_create(
+                        [Role(show=show, performer=member) for member in performers]
+                    )
+
+                # Failures are only injected once the fixtures are set up.
+                server.error_rate = options["error_rate"]
+                server.rate_limit_rate = options["rate_limit_rate"]
+                for show in shows:
+                    show.status = Show.STATUSES.published
+                    show.save()
+                    self.run_flow("publish", show, timings, failures)
+
+                    show = Show.objects.get(pk=show.pk)
+                    show.name = f"{show.name} updated"
+                    show.date += timedelta(days=1)
+                    show.save()
+                    self.run_flow("update", show, timings, failures)
+
+                    start = time.perf_counter()
+                    try:
+                        show.channel.archive(rename=True)
+                    except Exception:
+                        failures["archive"] += 1
+                    timings["archive"].append(time.perf_counter() - start)
+            finally:
+                # Deleting shows in bulk cascades to their channels without
+                # archiving them in Slack, so channels left active by failed
+                # flows are archived first, without injected errors.
+                server.error_rate = 0.0
+                server.rate_limit_rate = 0.0
+                SlackChannel.objects.filter(show__in=shows).archive(rename=True)
+                Show.objects.filter(pk__in=[show.pk for show in shows]).delete()
+                User.objects.filter(pk__in=[user.pk for user in users]).delete()
+
+        client_stats = Counter(slack_boss.stats()) - client_stats
+        for flow in FLOWS:
+            if not timings[flow]:
+                continue
+            self.stdout.write(
+                f"{flow:<8} n={len(timings[flow])} "
+                f"p50={percentile(timings[flow], 50) * 1000:.1f}ms "
+                f"p95={percentile(timings[flow], 95) * 1000:.1f}ms "
+                f"max={max(timings[flow]) * 1000:.1f}ms "
+                f"failed={failures[flow]}"
+            )
+        self.stdout.write(
+            f"Slack calls: {client_stats['calls']}, "
+            f"throttled: {client_stats['throttled']}, "
+            f"retried: {client_stats['retried']}, "
+            f"rate limited by server: {server.stats['ratelimited']}, "
+            f"errors injected: {server.stats['errors']}"
+        )
+
+    def run_flow(self, flow: str, show: Show, timings: dict, failures: Counter):
+        """Executes the pending Slack tasks of a show, as the worker would."""
+
+        start = time.perf_counter()
+        for task in show.slack_tasks.filter(status=SlackTask.STATUSES.pending):
+            if SlackTask.objects.claim(task) and not task.run():
+                failures[flow] += 1
+        timings[flow].append(time.perf_counter() - start)
@@ -0,0 +1,7 @@
+from common.commands import OutboxCommand
+from slack.models import SlackTask
+
+
+class Command(OutboxCommand):
+    help = "Executes pending Slack tasks recorded in the outbox"
+    model = SlackTask
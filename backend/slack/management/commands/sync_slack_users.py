@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from shows.models import Member
+from slack.directory import slack_directory
+from slack.models import SlackUser
+
+
+class Command(BaseCommand):
+    help = (
+        "Links members to Slack users by email with a single paginated users.list scan"
+    )
+
+    def handle(self, *args, **options):
+        emails = Member.objects.filter(user__isnull=False).values_list(
+            "user__email", flat=True
+        )
+        directory = slack_directory.warm(emails=emails)
+        slack_users = SlackUser.objects.link_members(directory)
+        self.stdout.write(
+            f"Found {len(directory)} Slack users, linked {len(slack_users)} members"
+        )
@@ -1,16 +1,35 @@
 from __future__ import annotations
 
 import logging
-from typing import TYPE_CHECKING, Tuple, Union, List
-
+from typing import (
+    TYPE_CHECKING,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    NamedTuple,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
+
+from asgiref.sync import async_to_sync
+from django.apps import apps
 from django.db import models
 from django.utils.translation import gettext_lazy as _
 
+from common.managers import OutboxManager
+
+from slack.async_service import async_slack_boss
+from slack.directory import slack_directory
+from slack.exceptions import SlackBossException
+from slack.membership import channel_members
 from slack.service import slack_boss
 
 if TYPE_CHECKING:
     from django.db.models import QuerySet
-    from slack.models import SlackUser, SlackChannel
+    from slack.models import SlackUser, SlackChannel, SlackTask
     from shows.models import Member, Show
 
 
@@ -34,7 +53,9 @@ class SlackUserManager(models.Manager):
             raise ValueError(_("The member must be set"))
         if hasattr(member, "slack_user"):
             raise ValueError(_("The member already has a SlackUser record"))
-        user_id = slack_boss.fetch_user(member=member)
+        if not member.user:
+            raise SlackBossException("Member does not have an associated user")
+        user_id = slack_directory.lookup(member.user.email)
         if user_id is not None:
             logging.info(f"Creating SlackUser with ID {user_id} ...")
             user = self.model(id=user_id, member=member, **extra_fields)
@@ -60,8 +81,298 @@ class SlackUserManager(models.Manager):
         except self.model.DoesNotExist:
             return self.create(member=member, **extra_fields), True
 
+    def link_members(self, directory: Dict[str, str]) -> List[SlackUser]:
+        """Creates SlackUsers for all members found in a Slack directory.
+
+        Args:
+            directory: A dict mapping lowercase emails to Slack user IDs,
+                e.g. as returned by SlackDirectory.warm.
+
+        Returns:
+            The newly created SlackUser instances.
+        """
+
+        member_model = self.model._meta.get_field("member").related_model
+        taken_ids = set(self.values_list("id", flat=True))
+        slack_users = []
+        for member in member_model.objects.filter(
+            slack_user__isnull=True, user__isnull=False
+        ).select_related("user"):
+            user_id = directory.get(member.user.email.lower())
+            if user_id is not None and user_id not in taken_ids:
+                taken_ids.add(user_id)
+                slack_users.append(self.model(id=user_id, member=member))
+        logging.info(f"Creating {len(slack_users)} SlackUsers ...")
+        return self.bulk_create(slack_users)
+
+    def admin_ids(self) -> Set[str]:
+        """Returns the Slack IDs of all members of the slack_admins group."""
+
+        return set(
+            self.filter(member__user__groups__name="slack_admins").values_list(
+                "id", flat=True
+            )
+        )
+
+
+class ChannelResult(NamedTuple):
+    """Outcome of a bulk Slack operation for a single channel.
+
+    Attributes:
+        channel: The Slack channel the operation was performed on.
+        error: The Slack error if the operation failed, otherwise None.
+    """
+
+    channel: SlackChannel
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+class SlackChannelQuerySet(models.QuerySet):
+    """Query set for SlackChannel with bulk Slack operations.
+
+    Each bulk operation plans the Slack calls for all queried channels up
+    front and executes them concurrently through AsyncSlackBoss, so that
+    the calls are rate limited as a whole rather than made one by one. The
+    calls nested within each channel, e.g. one kick per user, share the same
+    concurrency bound as the calls for other channels.
+    """
+
+    def archive(self, rename: bool = True) -> List[ChannelResult]:
+        """Archives all queried Slack channels which are not archived yet.
+
+        Args:
+            rename: Whether to rename the channels before archiving.
+
+        Returns:
+            The result of archiving each channel.
+        """
+
+        channels = list(self.filter(archived=False).select_related("show"))
+        names = {channel.id: channel.archived_name() for channel in channels if rename}
+
+        async def archive_channel(channel: SlackChannel):
+            if rename:
+                await async_slack_boss.rename_channel(
+                    channel_id=channel.id, name=names[channel.id]
+                )
+            try:
+                await async_slack_boss.archive_channel(channel_id=channel.id)
+            except SlackBossException as error:
+                if str(error) != "already_archived":
+                    raise
+
+        results = self._execute(channels, archive_channel)
+        archived = [result.channel for result in results if result.ok]
+        for channel in archived:
+            channel.archived = True
+        self.bulk_update(archived, ["archived"])
+        return results
+
+    def invite_users(
+        self, users: Union[SlackUser, List[SlackUser]]
+    ) -> List[ChannelResult]:
+        """Invites Slack user or users to all queried active Slack channels.
+
+        Args:
+            users: The Slack user or users to invite.
+
+        Returns:
+            The result of inviting the users to each channel.
+        """
+
+        user_ids, _ = async_slack_boss._get_slack_user_ids_arg(users=users)
+        results = self._execute(
+            list(self.filter(archived=False)),
+            lambda channel: async_slack_boss.invite_users_to_channel(
+                channel_id=channel.id, user_ids=user_ids
+            ),
+        )
+        self._update_members(results, added=user_ids)
+        return results
+
+    def remove_users(
+        self, users: Union[SlackUser, List[SlackUser]]
+    ) -> List[ChannelResult]:
+        """Removes Slack user or users from all queried active Slack channels.
+
+        Args:
+            users: The Slack user or users to remove.
+
+        Returns:
+            The result of removing the users from each channel.
+        """
+
+        user_ids, _ = async_slack_boss._get_slack_user_ids_arg(users=users)
+        results = self._execute(
+            list(self.filter(archived=False)),
+            lambda channel: async_slack_boss.remove_users_from_channel(
+                channel_id=channel.id, user_ids=user_ids
+            ),
+        )
+        self._update_members(results, removed=user_ids)
+        return results
+
+    def reconcile_members(self, invite_admin: bool = True) -> List[ChannelResult]:
+        """Reconciles the members of all queried active Slack channels.
+
+        The members of channels missing from the membership cache are listed
+        concurrently, and only channels whose members differ from their
+        show's performers are invited to or removed from.
+
+        Args:
+            invite_admin: Whether to invite Slack admins who are missing.
+
+        Returns:
+            The result of reconciling each channel that had drifted, or
+            whose members could not be listed.
+        """
+
+        channels = list(self.filter(archived=False).select_related("show"))
+        members = channel_members.fetch_many([channel.id for channel in channels])
+        admin_ids = apps.get_model("slack", "SlackUser").objects.admin_ids()
+
+        results, plans = [], {}
+        for channel in channels:
+            if isinstance(members[channel.id], SlackBossException):
+                results.append(ChannelResult(channel, str(members[channel.id])))
+                continue
+            to_invite, to_remove = channel.membership_diff(
+                members[channel.id], invite_admin=invite_admin, admin_ids=admin_ids
+            )
+            if to_invite or to_remove:
+                plans[channel.id] = (sorted(to_invite), sorted(to_remove))
+
+        async def reconcile(channel: SlackChannel):
+            user_ids, kick_ids = plans[channel.id]
+            if user_ids:
+                await async_slack_boss.invite_users_to_channel(
+                    channel_id=channel.id, user_ids=user_ids
+                )
+            if kick_ids:
+                await async_slack_boss.remove_users_from_channel(
+                    channel_id=channel.id, user_ids=kick_ids
+                )
+
+        drifted = [channel for channel in channels if channel.id in plans]
+        for result in self._execute(drifted, reconcile):
+            if result.ok:
+                channel_members.update(
+                    result.channel.id,
+                    added=plans[result.channel.id][0],
+                    removed=plans[result.channel.id][1],
+                )
+            else:
+                channel_members.invalidate(result.channel.id)
+            results.append(result)
+        return results
+
+    def refresh(self, invite_admin: bool = True) -> List[ChannelResult]:
+        """Brings the names, members and briefings of queried channels up to date.
+
+        The names of all active channels are checked concurrently, and only
+        the channels whose name, members or briefing have drifted from their
+        show are renamed, invited to or removed from, or have their briefing
+        updated.
+
+        Args:
+            invite_admin: Whether to invite Slack admins who are missing.
+
+        Returns:
+            The result of refreshing each active channel.
+        """
+
+        channels = list(self.filter(archived=False).select_related("show"))
+        names = {
+            channel.id: channel.show.default_channel_name() for channel in channels
+        }
+        results = {
+            result.channel.id: result
+            for result in self._execute(
+                channels,
+                lambda channel: async_slack_boss.rename_channel(
+                    channel_id=channel.id, name=names[channel.id], check=True
+                ),
+            )
+        }
+        for result in self.reconcile_members(invite_admin=invite_admin):
+            if not result.ok and results[result.channel.id].ok:
+                results[result.channel.id] = result
+
+        for channel in channels:
+            if not results[channel.id].ok:
+                continue
+            try:
+                channel.send_or_update_briefing()
+            except SlackBossException as error:
+                logging.warning(f"Briefing for channel {channel.id} failed: {error}")
+                results[channel.id] = ChannelResult(channel, str(error))
+        return list(results.values())
+
+    @staticmethod
+    def _update_members(
+        results: List[ChannelResult],
+        added: Union[str, List[str]] = (),
+        removed: Union[str, List[str]] = (),
+    ):
+        """Applies the outcome of membership changes to the members cache.
+
+        The cached members of channels whose call failed are invalidated, as
+        some of the users may have been invited or removed before the failure.
+
+        Args:
+            results: The result of the membership change for each channel.
+            added: The Slack user ID or IDs that were invited.
+            removed: The Slack user ID or IDs that were removed.
+        """
+
+        added = [added] if isinstance(added, str) else added
+        removed = [removed] if isinstance(removed, str) else removed
+        for result in results:
+            if result.ok:
+                channel_members.update(result.channel.id, added=added, removed=removed)
+            else:
+                channel_members.invalidate(result.channel.id)
+
+    @staticmethod
+    def _execute(
+        channels: List[SlackChannel],
+        call: Callable[[SlackChannel], Awaitable],
+    ) -> List[ChannelResult]:
+        """Runs a Slack call for each channel concurrently.
+
+        Args:
+            channels: The channels to run the call for.
+            call: Returns the Slack call to await for a channel.
 
-class SlackChannelManager(models.Manager):
+        Returns:
+            The result of the call for each channel.
+        """
+
+        async def plan():
+            return await async_slack_boss.gather(
+                *(call(channel) for channel in channels), return_exceptions=True
+            )
+
+        logging.info(f"Running Slack calls for {len(channels)} channels ...")
+        results = []
+        for channel, outcome in zip(channels, async_to_sync(plan)()):
+            if isinstance(outcome, SlackBossException):
+                logging.warning(
+                    f"Slack call for channel {channel.id} failed: {outcome}"
+                )
+                results.append(ChannelResult(channel, str(outcome)))
+            elif isinstance(outcome, BaseException):
+                raise outcome
+            else:
+                results.append(ChannelResult(channel))
+        return results
+
+
+class SlackChannelManager(models.Manager.from_queryset(SlackChannelQuerySet)):
     """Model manager for SlackChannel"""
 
     def create(self, show: Show, **extra_fields) -> SlackChannel:
@@ -107,43 +418,43 @@ class SlackChannelManager(models.Manager):
         except self.model.DoesNotExist:
             return self.create(show=show, **extra_fields), True
 
-    def archive(self) -> QuerySet:
-        """Archives all queried Slack channels.
-
-        Returns:
-            A query set containing all Slack channels previously queried.
-        """
-        channel_set = self.all()
-        for channel in channel_set:
-            channel.archive()
-        return channel_set
 
-    def invite_users(self, users: Union[SlackUser, List[SlackUser]]) -> QuerySet:
-        """Invites Slack user or users to all queried Slack channels.
+class SlackTaskManager(OutboxManager):
+    """Model manager for SlackTask"""
 
-        Args:
-            users: The Slack user or users to invite.
+    def enqueue(self, show: Show, action: int, **payload) -> SlackTask:
+        """Records a Slack operation to be executed by the task worker.
 
-        Returns:
-            A query set containing all Slack channels previously queried.
-        """
-
-        channel_set = self.all()
-        for channel in channel_set:
-            channel.invite_users(users)
-        return channel_set
-
-    def remove_users(self, users: Union[SlackUser, List[SlackUser]]) -> QuerySet:
-        """Removes Slack user or users from all queried Slack channels.
+        If a task for the same show and action is still waiting for its first
+        attempt, the operation is merged into that task instead of recording
+        a new one, so that repeated saves result in a single Slack sync.
 
         Args:
-            users: The Slack user or users to remove.
+            show: The show the Slack operation is for.
+            action: The SlackTask action to execute.
+            **payload: Action-specific arguments stored with the task.
 
         Returns:
-            A query set containing all Slack channels previously queried.
+            The newly created or updated SlackTask instance.
         """
 
-        channel_set = self.all()
-        for channel in channel_set:
-            channel.remove_users(users)
-        return channel_set
+        task = self.filter(
+            show=show, action=action, status=self.model.STATUSES.pending, attempts=0
+        ).first()
+        if task is None:
+            logging.info(f"Queueing Slack task for {show} ...")
+            return self.create(show=show, action=action, payload=payload)
+
+        for key, value in payload.items():
+            if isinstance(value, list):
+                merged = task.payload.get(key, [])
+                task.payload[key] = merged + [v for v in value if v not in merged]
+            else:
+                task.payload[key] = value
+        task.save(update_fields=["payload"])
+        return task
+
+    def due(self) -> QuerySet:
+        """Returns pending tasks which are ready to be attempted."""
+
+        return super().due().select_related("show")
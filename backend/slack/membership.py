@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import logging
+from typing import Dict, Iterable, List, Optional, Set, Union
+
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.core.cache import cache
+
+from slack.async_service import AsyncSlackBoss, async_slack_boss
+from slack.exceptions import SlackBossException
+from slack.service import SlackBoss, slack_boss
+
+
+class ChannelMembers:
+    """Cache of the Slack user IDs of the members of each channel.
+
+    Each channel has a version stamp which is bumped whenever its membership
+    is changed outside of a reconciliation. Cached memberships are stored
+    along with the version they were fetched at, so entries that were being
+    fetched while the channel changed are discarded rather than served.
+
+    Attributes:
+        boss: The SlackBoss used to list members on cache misses.
+        async_boss: The AsyncSlackBoss used to list members of many channels.
+    """
+
+    def __init__(self, boss: SlackBoss, async_boss: AsyncSlackBoss):
+        self.boss = boss
+        self.async_boss = async_boss
+
+    @staticmethod
+    def _key(channel_id: str) -> str:
+        return f"slack:members:{channel_id}"
+
+    @staticmethod
+    def _version_key(channel_id: str) -> str:
+        return f"slack:members:{channel_id}:version"
+
+    def version(self, channel_id: str) -> int:
+        """Returns the current version stamp of a channel's membership."""
+
+        cache.add(self._version_key(channel_id), 0, None)
+        return cache.get(self._version_key(channel_id), 0)
+
+    def invalidate(self, channel_id: str):
+        """Marks the cached membership of a channel as stale."""
+
+        try:
+            cache.incr(self._version_key(channel_id))
+        except ValueError:
+            cache.add(self._version_key(channel_id), 1, None)
+
+    def get(self, channel_id: str) -> Optional[Set[str]]:
+        """Returns the cached members of a channel. None if not cached."""
+
+        entry = cache.get(self._key(channel_id))
+        if entry is not None and entry["version"] == self.version(channel_id):
+            return set(entry["members"])
+
+    def _set(self, channel_id: str, members: Iterable[str], version: int):
+        cache.set(
+            self._key(channel_id),
+            {"version": version, "members": sorted(members)},
+            settings.SLACK_CHANNEL_MEMBERS_TTL,
+        )
+
+    def update(
+        self,
+        channel_id: str,
+        added: Iterable[str] = (),
+        removed: Iterable[str] = (),
+    ):
+        """Applies known membership changes to the cached members of a channel.
+
+        Args:
+            channel_id: The Slack ID of the channel.
+            added: The Slack IDs of the users that were invited.
+            removed: The Slack IDs of the users that were removed.
+        """
+
+        members = self.get(channel_id)
+        if members is not None:
+            members = (members | set(added)) - set(removed)
+            self._set(channel_id, members, self.version(channel_id))
+
+    def fetch(self, channel_id: str) -> Set[str]:
+        """Returns the members of a channel, listing them on a cache miss.
+
+        Raises:
+            SlackBossException: If there was an error listing the members.
+        """
+
+        members = self.get(channel_id)
+        if members is None:
+            version = self.version(channel_id)
+            members = set(self.boss.list_channel_members(channel_id=channel_id))
+            self._set(channel_id, members, version)
+        return members
+
+    def fetch_many(
+        self, channel_ids: List[str]
+    ) -> Dict[str, Union[Set[str], SlackBossException]]:
+        """Returns the members of many channels, listing misses concurrently.
+
+        Args:
+            channel_ids: The Slack IDs of the channels.
+
+        Returns:
+            A dict mapping each channel ID to its members, or to the exception
+            raised while listing the members of that channel.
+        """
+
+        members = {}
+        for channel_id in channel_ids:
+            cached = self.get(channel_id)
+            if cached is not None:
+                members[channel_id] = cached
+        missing = [
+            channel_id for channel_id in channel_ids if channel_id not in members
+        ]
+        if not missing:
+            return members
+
+        versions = {channel_id: self.version(channel_id) for channel_id in missing}
+
+        async def list_members():
+            return await self.async_boss.gather(
+                *(
+                    self.async_boss.list_channel_members(channel_id=channel_id)
+                    for channel_id in missing
+                ),
+                return_exceptions=True,
+            )
+
+        logging.info(f"Listing members of {len(missing)} Slack channels ...")
+        for channel_id, result in zip(missing, async_to_sync(list_members)()):
+            if isinstance(result, SlackBossException):
+                members[channel_id] = result
+            elif isinstance(result, BaseException):
+                raise result
+            else:
+                members[channel_id] = set(result)
+                self._set(channel_id, result, versions[channel_id])
+        return members
+
+
+channel_members = ChannelMembers(slack_boss, async_slack_boss)
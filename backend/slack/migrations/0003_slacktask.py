@@ -0,0 +1,70 @@
+# Generated by Django 4.1.2 on 2026-10-16 23:32
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("shows", "0007_add_payment_method"),
+        ("slack", "0002_slackchannel_archived"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SlackTask",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "action",
+                    models.PositiveSmallIntegerField(
+                        choices=[(0, "Sync show channel")]
+                    ),
+                ),
+                ("payload", models.JSONField(blank=True, default=dict)),
+                (
+                    "status",
+                    models.PositiveSmallIntegerField(
+                        choices=[(0, "Pending"), (1, "Done"), (2, "Failed")], default=0
+                    ),
+                ),
+                ("attempts", models.PositiveSmallIntegerField(default=0)),
+                ("last_error", models.TextField(blank=True)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "run_after",
+                    models.DateTimeField(
+                        default=django.utils.timezone.now,
+                        help_text="Earliest time at which the task may be attempted",
+                    ),
+                ),
+                (
+                    "show",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="slack_tasks",
+                        to="shows.show",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["created_at", "id"],
+            },
+        ),
+        migrations.AddIndex(
+            model_name="slacktask",
+            index=models.Index(
+                fields=["status", "run_after"], name="slack_slack_status_931e4b_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,22 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("slack", "0003_slacktask"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="slackchannel",
+            name="briefing_hash",
+            field=models.CharField(
+                blank=True,
+                default="",
+                editable=False,
+                help_text="Hash of the content of the last briefing message sent",
+                max_length=64,
+            ),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 4.1.2 on 2026-10-17 00:54
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("slack", "0004_slackchannel_briefing_hash"),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name="slacktask",
+            options={"ordering": ["created_at", "id"], "verbose_name": "Slack task"},
+        ),
+        migrations.AlterField(
+            model_name="slacktask",
+            name="run_after",
+            field=models.DateTimeField(
+                default=django.utils.timezone.now,
+                help_text="Earliest time at which the entry may be attempted",
+            ),
+        ),
+    ]
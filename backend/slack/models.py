@@ -1,12 +1,19 @@
+import hashlib
+import json
+import logging
 from datetime import datetime
-from typing import Union, List, Optional
+from typing import Union, List, Optional, Set, Tuple
 
 from django.contrib import admin
 from django.db import models
 from django.utils.translation import gettext as _
+from model_utils import Choices
 
 from common.exceptions import WrongUsage
-from slack.managers import SlackUserManager, SlackChannelManager
+from common.models import OutboxModel
+from common.transactions import on_commit_once
+from slack.managers import SlackUserManager, SlackChannelManager, SlackTaskManager
+from slack.membership import channel_members
 from slack.service import slack_boss
 from users.models import User
 
@@ -50,6 +57,13 @@ class SlackChannel(models.Model):
         verbose_name="briefing timestamp",
         help_text=_("Slack ts for initial briefing message in the channel"),
     )
+    briefing_hash = models.CharField(
+        max_length=64,
+        default="",
+        blank=True,
+        editable=False,
+        help_text=_("Hash of the content of the last briefing message sent"),
+    )
     archived = models.BooleanField(default=False)
 
     objects = SlackChannelManager()
@@ -63,8 +77,8 @@ class SlackChannel(models.Model):
 
     def force_refresh(self):
         self.update_name(check=True)
-        self.invite_performers(invite_admin=True)
-        self.send_or_update_briefing()
+        self.invite_performers(invite_admin=True, reconcile=True)
+        self.schedule_briefing()
 
     def update_name(self, name: Optional[str] = None, check: bool = False):
         """Renames the Slack channel.
@@ -79,6 +93,12 @@ class SlackChannel(models.Model):
             channel_id=self.id, name=name, show=self.show, check=check
         )
 
+    def archived_name(self) -> str:
+        """Returns a unique name to rename the channel to when archiving."""
+
+        timestamp = str(datetime.now().timestamp()).replace(".", "-")
+        return f"arch-{self.show.default_channel_name()}-{timestamp}"
+
     def archive(self, rename: bool = True):
         """Archives the Slack channel.
 
@@ -93,10 +113,7 @@ class SlackChannel(models.Model):
 
         if not self.is_archived():
             if rename:
-                timestamp = str(datetime.now().timestamp()).replace(".", "-")
-                self.update_name(
-                    name=f"arch-{self.show.default_channel_name()}-{timestamp}"
-                )
+                self.update_name(name=self.archived_name())
             slack_boss.archive_channel(channel_id=self.id)
             self.archived = True
             self.save()
@@ -109,14 +126,21 @@ class SlackChannel(models.Model):
         """
 
         slack_boss.invite_users_to_channel(channel_id=self.id, users=users)
+        channel_members.invalidate(self.id)
 
-    def invite_performers(self, invite_admin: bool = True):
+    def invite_performers(self, invite_admin: bool = True, reconcile: bool = False):
         """Invites all registered performers to the Slack channel.
 
         Args:
             invite_admin: Whether to invite Slack admins
+            reconcile: Whether to only invite the performers and admins who
+                are not in the channel yet, and remove former performers.
         """
 
+        if reconcile:
+            self.reconcile_members(invite_admin=invite_admin)
+            return
+
         if self.show.performers.count() > 0:
             self.invite_users(
                 [
@@ -148,6 +172,88 @@ class SlackChannel(models.Model):
         """
 
         slack_boss.remove_users_from_channel(channel_id=self.id, users=users)
+        channel_members.invalidate(self.id)
+
+    def performer_slack_ids(self) -> Set[str]:
+        """Returns the Slack IDs of all registered performers of the show.
+
+        SlackUsers are created for performers who do not have one yet.
+        """
+
+        for performer in self.show.performers.filter(
+            slack_user__isnull=True, user__isnull=False
+        ):
+            performer.fetch_slack_user()
+        return set(
+            SlackUser.objects.filter(member__performed_show=self.show).values_list(
+                "id", flat=True
+            )
+        )
+
+    def membership_diff(
+        self,
+        members: Set[str],
+        invite_admin: bool = True,
+        admin_ids: Optional[Set[str]] = None,
+    ) -> Tuple[Set[str], Set[str]]:
+        """Compares the channel members against the show's performers.
+
+        Only members who are linked to a club member are ever removed, so
+        that bots and guests who were added by hand stay in the channel.
+        Slack admins are never removed.
+
+        Args:
+            members: The Slack IDs of the current channel members.
+            invite_admin: Whether to invite Slack admins who are missing.
+            admin_ids: The Slack IDs of the Slack admins, if already known.
+
+        Returns:
+            A tuple containing the Slack IDs of the users to invite and the
+            Slack IDs of the users to remove.
+        """
+
+        if admin_ids is None:
+            admin_ids = SlackUser.objects.admin_ids()
+        performer_ids = self.performer_slack_ids()
+        expected = performer_ids | admin_ids if invite_admin else performer_ids
+        candidates = members - performer_ids - admin_ids
+        to_remove = (
+            set(
+                SlackUser.objects.filter(id__in=candidates).values_list("id", flat=True)
+            )
+            if candidates
+            else set()
+        )
+        return expected - members, to_remove
+
+    def reconcile_members(self, invite_admin: bool = True) -> Tuple[Set[str], Set[str]]:
+        """Invites and removes users so that the channel matches the show.
+
+        The current channel members are fetched once, from the membership
+        cache if possible, and only the users that differ are invited or
+        removed.
+
+        Args:
+            invite_admin: Whether to invite Slack admins who are missing.
+
+        Returns:
+            A tuple containing the Slack IDs of the users invited and the
+            Slack IDs of the users removed.
+        """
+
+        to_invite, to_remove = self.membership_diff(
+            channel_members.fetch(self.id), invite_admin=invite_admin
+        )
+        if to_invite:
+            slack_boss.invite_users_to_channel(
+                channel_id=self.id, user_ids=sorted(to_invite)
+            )
+        if to_remove:
+            slack_boss.remove_users_from_channel(
+                channel_id=self.id, user_ids=sorted(to_remove)
+            )
+        channel_members.update(self.id, added=to_invite, removed=to_remove)
+        return to_invite, to_remove
 
     def send_update_message(self, updated_fields: list[str]):
         """Sends message to the Slack channel.
@@ -182,8 +288,13 @@ class SlackChannel(models.Model):
                 text=message,
             )
 
-    def send_or_update_briefing(self):
-        """Sends show briefing to Slack channel, or updates existing briefing."""
+    def render_briefing(self) -> Tuple[List, str]:
+        """Renders the show briefing message.
+
+        Returns:
+            A tuple containing the Slack blocks of the briefing and the text
+            to use for Slack notifications.
+        """
 
         name, date, time, point, lions, address, notes = (
             self.show.name,
@@ -244,13 +355,86 @@ class SlackChannel(models.Model):
                 },
             },
         ]
+        return briefing, f"New show on {date}"
+
+    def send_or_update_briefing(self) -> bool:
+        """Sends show briefing to Slack channel, or updates existing briefing.
+
+        A hash of the last briefing sent is stored with the channel, so that
+        the existing briefing is only updated if its content has changed.
+
+        Returns:
+            A bool indicating whether a Slack message was sent or updated.
+        """
+
+        blocks, text = self.render_briefing()
+        briefing_hash = hashlib.sha256(
+            json.dumps([blocks, text], sort_keys=True).encode()
+        ).hexdigest()
+        if self.briefing_ts and briefing_hash == self.briefing_hash:
+            logging.info(f"Briefing in channel {self.id} is up to date")
+            return False
+
         ts, created = slack_boss.send_message_in_channel(
-            channel_id=self.id,
-            ts=self.briefing_ts,
-            blocks=briefing,
-            text=f"New show on {date}",
+            channel_id=self.id, ts=self.briefing_ts, blocks=blocks, text=text
         )
         if created:
             slack_boss.pin_message_in_channel(channel_id=self.id, ts=ts)
             self.briefing_ts = ts
-            self.save()
+        self.briefing_hash = briefing_hash
+        self.save(update_fields=["briefing_ts", "briefing_hash"])
+        return True
+
+    def schedule_briefing(self):
+        """Sends or updates the briefing once the current transaction commits.
+
+        Briefings scheduled for the same channel within one transaction are
+        coalesced into a single update, rendered from the show as committed.
+        Outside a transaction, the briefing is sent immediately.
+        """
+
+        def send_or_update_briefing():
+            channel = SlackChannel.objects.filter(pk=self.id).first()
+            if channel is not None and not channel.is_archived():
+                channel.send_or_update_briefing()
+
+        on_commit_once(("slack_briefing", self.id), send_or_update_briefing)
+
+
+class SlackTask(OutboxModel):
+    """Model for a Slack operation waiting in the outbox.
+
+    Slack side effects of show saves are recorded as tasks in the same
+    transaction as the save, and executed out-of-band by the
+    process_slack_tasks management command. Failed attempts are retried until
+    SLACK_TASK_MAX_ATTEMPTS is reached.
+    """
+
+    ACTIONS = Choices(
+        (0, "sync_show", _("Sync show channel")),
+    )
+
+    show = models.ForeignKey(
+        "shows.Show", on_delete=models.CASCADE, related_name="slack_tasks"
+    )
+    action = models.PositiveSmallIntegerField(choices=ACTIONS)
+    payload = models.JSONField(default=dict, blank=True)
+
+    objects = SlackTaskManager()
+
+    max_attempts_setting = "SLACK_TASK_MAX_ATTEMPTS"
+    retry_delay_setting = "SLACK_TASK_RETRY_DELAY"
+
+    class Meta(OutboxModel.Meta):
+        verbose_name = _("Slack task")
+
+    def __str__(self):
+        return f"{self.get_action_display()} for {self.show}"
+
+    def execute(self):
+        """Performs the Slack operation recorded by the task."""
+
+        if self.action == self.ACTIONS.sync_show:
+            self.show.sync_slack_channel(self.payload.get("updated_fields", []))
+        else:
+            raise WrongUsage(f"Unknown Slack task action {self.action}")
@@ -4,11 +4,12 @@ import logging
 from typing import Optional, TYPE_CHECKING, Union, List, Tuple
 
 from django.conf import settings
-from slack_sdk import WebClient
 from slack_sdk.errors import SlackApiError
 
 from common.exceptions import WrongUsage
-from slack.exceptions import SlackBossException, SlackTokenException
+from slack.args import SlackArgsMixin
+from slack.exceptions import SlackBossException
+from slack.throttling import RateLimitedWebClient
 
 if TYPE_CHECKING:
     from users.models import User
@@ -16,7 +17,7 @@ if TYPE_CHECKING:
     from slack.models import SlackUser, SlackChannel
 
 
-class SlackBoss:
+class SlackBoss(SlackArgsMixin):
     """Custom Slack API WebClient wrapper.
 
     SlackBoss provides custom convenience functions, utilities, and
@@ -24,11 +25,11 @@ class SlackBoss:
 
     Attributes:
         token: The Slack access token to use, typically a bot token
-        client: The Slack web client configured with the Slackbot token
+        client: The rate limited Slack web client configured with the Slackbot token
     """
 
     token: str
-    client: WebClient
+    client: RateLimitedWebClient
 
     def __init__(self, token: Optional[str] = None):
         """Initializes SlackBoss by creating a Slack API WebClient.
@@ -43,16 +44,15 @@ class SlackBoss:
             SlackTokenException: If no Slack token is configured.
         """
 
-        if not token:
-            if hasattr(settings, "SLACK_TOKEN"):
-                token = settings.SLACK_TOKEN
-            else:
-                raise SlackTokenException(
-                    "SLACK_TOKEN must be configured in default settings if slack_token is None"
-                )
+        self.token = self._get_token_arg(token)
+        self.client = RateLimitedWebClient(
+            token=self.token, max_retries=settings.SLACK_MAX_RETRIES
+        )
+
+    def stats(self) -> dict:
+        """Returns counters of Slack API calls, throttled calls and retries."""
 
-        self.token = token
-        self.client = WebClient(token=self.token)
+        return dict(self.client.stats)
 
     def fetch_user(
         self,
@@ -78,7 +78,7 @@ class SlackBoss:
 
         email, member_label = self._get_email_arg(email=email, user=user, member=member)
 
-        logging.info(f"Fetching Slack user for {member_label} ...")
+        logging.info("Fetching Slack user for %s ...", member_label)
         try:
             response = self.client.users_lookupByEmail(email=email)
         except SlackApiError as api_error:
@@ -91,6 +91,35 @@ class SlackBoss:
             logging.debug(response)
             return response["user"]["id"]
 
+    def list_users(self, limit: int = 200) -> List[dict]:
+        """Lists all users in the Slack workspace.
+
+        The users.list results are paginated, so this follows the response
+        cursors until all pages have been fetched.
+
+        Args:
+            limit: The maximum number of users to fetch per page.
+
+        Returns:
+            The Slack user objects of all users in the workspace.
+
+        Raises:
+            SlackBossException: If there was an error listing the users.
+        """
+
+        users, cursor = [], None
+        while True:
+            logging.info("Listing Slack users ...")
+            try:
+                response = self.client.users_list(cursor=cursor, limit=limit)
+            except SlackApiError as api_error:
+                error = api_error.response.get("error")
+                raise SlackBossException(error)
+            users.extend(response["members"])
+            cursor = response.get("response_metadata", {}).get("next_cursor")
+            if not cursor:
+                return users
+
     def fetch_channel_name(
         self,
         channel_id: Optional[str] = None,
@@ -114,7 +143,7 @@ class SlackBoss:
             channel_id=channel_id, channel=channel, show=show
         )
 
-        logging.info(f"Fetching info on channel {channel_label} ...")
+        logging.info("Fetching info on channel %s ...", channel_label)
         try:
             response = self.client.conversations_info(channel=channel_id)
         except SlackApiError as api_error:
@@ -124,6 +153,52 @@ class SlackBoss:
             logging.debug(response)
             return response["channel"]["name"]
 
+    def list_channel_members(
+        self,
+        channel_id: Optional[str] = None,
+        channel: Optional[SlackChannel] = None,
+        show: Optional[Show] = None,
+        limit: int = 200,
+    ) -> List[str]:
+        """Lists the members of the specified Slack channel.
+
+        The conversations.members results are paginated, so this follows the
+        response cursors until all pages have been fetched.
+
+        One of channel_id, channel, or show should be provided.
+
+        Args:
+            channel_id: The Slack ID for the channel to list the members of.
+            channel: The Slack channel to list the members of.
+            show: The show to list the Slack channel members for.
+            limit: The maximum number of members to fetch per page.
+
+        Returns:
+            The Slack user IDs of all members of the channel.
+
+        Raises:
+            SlackBossException: If there was an error listing the members.
+        """
+
+        channel_id, channel_label = self._get_slack_channel_id_arg(
+            channel_id=channel_id, channel=channel, show=show
+        )
+
+        members, cursor = [], None
+        while True:
+            logging.info("Listing members of channel %s ...", channel_label)
+            try:
+                response = self.client.conversations_members(
+                    channel=channel_id, cursor=cursor, limit=limit
+                )
+            except SlackApiError as api_error:
+                error = api_error.response.get("error")
+                raise SlackBossException(error)
+            members.extend(response["members"])
+            cursor = response.get("response_metadata", {}).get("next_cursor")
+            if not cursor:
+                return members
+
     def create_channel(self, name: Optional[str] = None, show: Optional[Show] = None):
         """Creates Slack channel for the specified show.
 
@@ -142,7 +217,7 @@ class SlackBoss:
 
         name, show_label = self._get_channel_name_arg(name=name, show=show)
 
-        logging.info(f"Creating Slack channel for {show_label} ...")
+        logging.info("Creating Slack channel for %s ...", show_label)
         try:
             response = self.client.conversations_create(name=name, is_private=False)
         except SlackApiError as api_error:
@@ -175,7 +250,7 @@ class SlackBoss:
             channel_id=channel_id, channel=channel, show=show
         )
 
-        logging.info(f"Archiving channel {channel_label} ...")
+        logging.info("Archiving channel %s ...", channel_label)
         try:
             response = self.client.conversations_archive(channel=channel_id)
         except SlackApiError as api_error:
@@ -222,7 +297,7 @@ class SlackBoss:
             if name == current_name:
                 return False
 
-        logging.info(f"Renaming channel {channel_label} ...")
+        logging.info("Renaming channel %s ...", channel_label)
         try:
             response = self.client.conversations_rename(channel=channel_id, name=name)
         except SlackApiError as api_error:
@@ -263,7 +338,7 @@ class SlackBoss:
             user_ids=user_ids, users=users
         )
 
-        logging.info(f"Inviting {members_label} to channel {channel_label} ...")
+        logging.info("Inviting %s to channel %s ...", members_label, channel_label)
         try:
             response = self.client.conversations_invite(
                 channel=channel_id, users=user_ids
@@ -309,7 +384,7 @@ class SlackBoss:
             user_ids=user_ids, users=users
         )
 
-        logging.info(f"Removing {members_label} from channel {channel_label} ...")
+        logging.info("Removing %s from channel %s ...", members_label, channel_label)
         if not isinstance(user_ids, list):
             user_ids = [user_ids]
         for user_id in user_ids:
@@ -371,12 +446,12 @@ class SlackBoss:
 
         try:
             if is_new_message:
-                logging.info(f"Sending message in channel {channel_label} ...")
+                logging.info("Sending message in channel %s ...", channel_label)
                 response = self.client.chat_postMessage(
                     channel=channel_id, blocks=blocks, text=text
                 )
             else:
-                logging.info(f"Updating message in channel {channel_label} ...")
+                logging.info("Updating message in channel %s ...", channel_label)
                 response = self.client.chat_update(
                     channel=channel_id, ts=ts, blocks=blocks, text=text
                 )
@@ -416,180 +491,20 @@ class SlackBoss:
         )
         ts, ts_label = self._get_message_timestamp_arg(ts=ts)
 
-        logging.info(f"Pinning message {ts_label} in channel {channel_label} ...")
+        logging.info("Pinning message %s in channel %s ...", ts_label, channel_label)
         try:
             response = self.client.pins_add(channel=channel_id, timestamp=ts)
         except SlackApiError as api_error:
             error = api_error.response.get("error")
             if error == "already_pinned":
-                logging.info(f"Message {ts_label} is already pinned")
+                logging.info("Message %s is already pinned", ts_label)
             elif error == "not_pinnable":
-                logging.info(f"Message {ts_label} is not pinnable")
+                logging.info("Message %s is not pinnable", ts_label)
             else:
                 raise SlackBossException(error)
         else:
             logging.debug(response)
             return True
 
-    @staticmethod
-    def _get_email_arg(
-        email: Optional[str] = None,
-        user: Optional[User] = None,
-        member: Optional[Member] = None,
-    ) -> Tuple[str, str]:
-        """Processes email argument from various types.
-
-        Args:
-            email: The email address.
-            user: The user to get the email address for.
-            member: The member to get the email address for.
-
-        Returns:
-            A tuple containing the email address along with a user label
-            depending on input type to use for logging purposes.
-
-        Raises:
-            WrongUsage: If none of the optional inputs are provided.
-        """
-
-        if email is not None:
-            return email, email
-        elif user is not None:
-            return user.email, str(user)
-        elif member is not None:
-            if member.user:
-                return member.user.email, str(member)
-            raise SlackBossException(f"Member does not have an associated user")
-        raise WrongUsage("At least one of email, user, or member must be specified")
-
-    @staticmethod
-    def _get_channel_name_arg(
-        name: Optional[str] = None,
-        show: Optional[Show] = None,
-    ) -> Tuple[str, str]:
-        """Processes Slack channel name argument from various types.
-
-        Args:
-            name: The channel name.
-            show: The show to get the channel name for.
-
-        Returns:
-            A tuple containing the channel name along with a channel label
-            depending on input type to use for logging purposes.
-
-        Raises:
-            WrongUsage: If none of the optional inputs are provided.
-        """
-
-        if name is not None:
-            return name, name
-        elif show is not None:
-            channel_name = show.default_channel_name()
-            return channel_name, str(show)
-        raise WrongUsage("At least one of name or show must be specified")
-
-    @staticmethod
-    def _get_slack_channel_id_arg(
-        channel_id: Optional[str] = None,
-        channel: Optional[SlackChannel] = None,
-        show: Optional[Show] = None,
-    ) -> Tuple[str, str]:
-        """Processes Slack channel ID argument from various types.
-
-        Args:
-            channel_id: The Slack channel ID.
-            channel: The Slack channel to get the ID for.
-            show: The show to get the Slack channel ID for.
-
-        Returns:
-            A tuple containing the Slack channel ID along with a channel
-            label depending on input type to use for logging purposes.
-
-        Raises:
-            WrongUsage: If none of the optional inputs are provided.
-        """
-
-        if channel_id is not None:
-            return channel_id, channel_id
-        elif channel is not None:
-            return channel.id, channel.show.default_channel_name()
-        elif show is not None:
-            if hasattr(show, "channel"):
-                return show.channel.id, show.default_channel_name()
-            raise SlackBossException(f"Show {show} does not have a Slack channel")
-        raise WrongUsage(
-            "At least one of channel_id, channel, or show must be specified"
-        )
-
-    @staticmethod
-    def _get_slack_user_ids_arg(
-        user_ids: Optional[Union[str, List[str]]] = None,
-        users: Optional[Union[SlackUser, List[SlackUser]]] = None,
-    ) -> Tuple[Union[str, List[str]], str]:
-        """Processes Slack user ID arguments from various types.
-
-        Args:
-            user_ids: The Slack user ID or IDs.
-            users: The Slack user or users to get the ID or IDs for.
-
-        Returns:
-            A tuple containing the Slack user ID or IDs along with a Slack users
-            label depending on input type to use for logging purposes.
-
-        Raises:
-            WrongUsage: If none of the optional inputs are provided.
-        """
-
-        if user_ids is not None:
-            return user_ids, str(user_ids)
-        elif users is not None:
-            if isinstance(users, list):
-                return [user.id for user in users], str([user.member for user in users])
-            return users.id, str(users)
-        raise WrongUsage("At least one of user_ids or users must be specified")
-
-    @staticmethod
-    def _get_show_arg(
-        show: Optional[Show] = None,
-        channel: Optional[SlackChannel] = None,
-    ) -> Tuple[Show, str]:
-        """Processes show argument from various types.
-
-        Args:
-            show: The show to return.
-            channel: The channel to get the show for.
-
-        Returns:
-            A tuple containing the show along with a show label depending on
-            input type to use for logging purposes.
-
-        Raises:
-            WrongUsage: If none of the optional inputs are provided.
-        """
-
-        if show is not None:
-            return show, str(show)
-        elif channel is not None:
-            return channel.show, str(channel.show)
-        raise WrongUsage("At least one of show or channel must be specified")
-
-    @staticmethod
-    def _get_message_timestamp_arg(
-        ts: Optional[str] = None,
-    ) -> Tuple[Optional[str], str]:
-        """Processes Slack ts argument from various types.
-
-        Args:
-            ts: The unique Slack timestamp of the message.
-
-        Returns:
-            A tuple containing the timestamp along with a timestamp label
-            depending on input type to use for logging purposes.
-        """
-
-        if ts is not None and ts != "":
-            return ts, ts
-        return None, ""
-
 
 slack_boss = SlackBoss()
@@ -0,0 +1,90 @@
+from django.test import TestCase
+from faker import Faker
+
+from shows.models import Role, Show
+from shows.tests.utils import fake_show_data
+from slack.exceptions import SlackBossException
+from slack.models import SlackChannel
+from slack.tests.utils import (
+    PatchSlackBossMixin,
+    fake_slack_id,
+    fake_slack_timestamp,
+)
+from users.models import User
+from users.tests.utils import fake_user_data
+
+# logging.disable(logging.WARNING)
+
+
+class TestSlackChannelAdmin(PatchSlackBossMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        faker = Faker()
+        Faker.seed(2207)
+
+        admin_user = User.objects.create_superuser(**fake_user_data(faker))
+        self.client.force_login(admin_user)
+        self.channels = SlackChannel.objects.bulk_create(
+            [
+                SlackChannel(
+                    id=fake_slack_id(faker),
+                    show=Show.objects.create(**data),
+                    briefing_ts=fake_slack_timestamp(faker),
+                )
+                for data in fake_show_data(faker, count=3)
+            ]
+        )
+
+    def run_action(self, action: str):
+        return self.client.post(
+            "/admin/slack/slackchannel/",
+            {
+                "action": action,
+                "_selected_action": [channel.pk for channel in self.channels],
+            },
+            follow=True,
+        )
+
+    def test_archive(self):
+        self.mock_async_archive_channel.side_effect = [
+            True,
+            True,
+            SlackBossException("channel_not_found"),
+        ]
+        response = self.run_action("archive")
+
+        self.assertContains(response, "Archived 2 Slack channels, 1 failed")
+        self.assertEqual(self.mock_async_archive_channel.call_count, 3)
+        self.mock_archive_channel.assert_not_called()
+        self.assertEqual(SlackChannel.objects.filter(archived=True).count(), 2)
+
+    def test_refresh_without_drift(self):
+        self.run_action("force_refresh")
+        self.assertEqual(self.mock_send_message_in_channel.call_count, 3)
+        self.mock_send_message_in_channel.reset_mock()
+        self.mock_async_rename_channel.reset_mock()
+
+        response = self.run_action("force_refresh")
+
+        self.assertContains(response, "Refreshed 3 Slack channels")
+        self.assertEqual(self.mock_async_rename_channel.call_count, 3)
+        _, kwargs = self.mock_async_rename_channel.call_args
+        self.assertTrue(kwargs["check"])
+        self.mock_async_invite_users_to_channel.assert_not_called()
+        self.mock_async_remove_users_from_channel.assert_not_called()
+        self.mock_send_message_in_channel.assert_not_called()
+        self.mock_invite_users_to_channel.assert_not_called()
+        self.mock_remove_users_from_channel.assert_not_called()
+
+    def test_refresh_drifted_channel(self):
+        self.run_action("force_refresh")
+        member = User.objects.create(**fake_user_data(Faker(), count=1)).member
+        Role.objects.create(show=self.channels[1].show, performer=member)
+
+        response = self.run_action("force_refresh")
+
+        self.assertContains(response, "Refreshed 3 Slack channels")
+        self.mock_async_invite_users_to_channel.assert_called_once_with(
+            channel_id=self.channels[1].id, user_ids=[member.slack_user.id]
+        )
+        self.mock_async_remove_users_from_channel.assert_not_called()
@@ -0,0 +1,79 @@
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+from django.test import SimpleTestCase
+from faker import Faker
+from slack_sdk.errors import SlackApiError
+from slack_sdk.web.async_client import AsyncWebClient
+
+from slack.async_service import AsyncSlackBoss
+from slack.tests.test_throttling import fake_response
+from slack.tests.utils import fake_slack_token, fake_slack_id
+
+# logging.disable(logging.WARNING)
+
+
+def fake_api_error(error: str, status_code: int = 200, headers=None) -> SlackApiError:
+    return SlackApiError(
+        error, fake_response(status_code, headers, ok=False, error=error)
+    )
+
+
+class TestAsyncSlackBoss(SimpleTestCase):
+    def setUp(self):
+        self.faker = Faker()
+        Faker.seed(1207)
+
+        self.slack_boss = AsyncSlackBoss(
+            token=fake_slack_token(self.faker), max_concurrency=2
+        )
+
+    def track_in_flight(self, errors=None):
+        """Patches Slack API calls to record the peak number in flight."""
+
+        self.in_flight, self.peak = 0, 0
+        errors = errors or {}
+
+        async def api_call(api_method, **kwargs):
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+            await asyncio.sleep(0.001)
+            self.in_flight -= 1
+            user = kwargs.get("params", {}).get("user")
+            if user in errors:
+                raise fake_api_error(errors[user])
+            return fake_response(ok=True)
+
+        patcher = patch.object(AsyncWebClient, "api_call", side_effect=api_call)
+        mock_api_call = patcher.start()
+        self.addCleanup(patcher.stop)
+        return mock_api_call
+
+    def test_remove_users_from_channel_kicks_concurrently(self):
+        channel_id = fake_slack_id(self.faker)
+        user_ids = [fake_slack_id(self.faker) for _ in range(5)]
+        mock_api_call = self.track_in_flight(errors={user_ids[0]: "not_in_channel"})
+        self.assertTrue(
+            asyncio.run(
+                self.slack_boss.remove_users_from_channel(
+                    channel_id=channel_id, user_ids=user_ids
+                )
+            )
+        )
+        self.assertEqual(mock_api_call.call_count, 5)
+        self.assertEqual(self.peak, 2)
+
+    @patch("slack.throttling.TokenBucket.pause")
+    @patch.object(AsyncWebClient, "api_call", new_callable=AsyncMock)
+    def test_api_call_retries_rate_limited(self, mock_api_call, mock_pause):
+        response = fake_response(ok=True, channel={"name": "show"})
+        mock_api_call.side_effect = [
+            fake_api_error("ratelimited", 429, {"Retry-After": "3"}),
+            response,
+        ]
+        channel_name = asyncio.run(
+            self.slack_boss.fetch_channel_name(channel_id=fake_slack_id(self.faker))
+        )
+        self.assertEqual(channel_name, "show")
+        mock_pause.assert_called_once_with(3.0)
+        self.assertEqual(self.slack_boss.stats()["retried"], 1)
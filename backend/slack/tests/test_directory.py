@@ -0,0 +1,74 @@
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from faker import Faker
+
+from slack.directory import slack_directory
+from slack.models import SlackUser
+from slack.service import SlackBoss
+from slack.tests.utils import PatchSlackBossMixin, fake_slack_id
+from users.tests.utils import fake_user_data
+
+# logging.disable(logging.WARNING)
+
+User = get_user_model()
+
+
+class TestSlackDirectory(PatchSlackBossMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+
+        self.faker = Faker()
+        Faker.seed(77)
+
+    def test_lookup_caches_user_id(self):
+        email = self.faker.email()
+        user_id = slack_directory.lookup(email)
+        self.assertEqual(slack_directory.lookup(email.upper()), user_id)
+        self.mock_fetch_user.assert_called_once_with(email=email)
+
+    def test_lookup_caches_missing_user(self):
+        self.mock_fetch_user.side_effect = None
+        self.mock_fetch_user.return_value = None
+        email = self.faker.email()
+        self.assertIsNone(slack_directory.lookup(email))
+        self.assertIsNone(slack_directory.lookup(email))
+        self.mock_fetch_user.assert_called_once_with(email=email)
+
+    def test_member_save_does_not_refetch_missing_user(self):
+        self.mock_fetch_user.side_effect = None
+        self.mock_fetch_user.return_value = None
+        member = User.objects.create(**fake_user_data(self.faker)).member
+        member.save()
+        member.save()
+        self.mock_fetch_user.assert_called_once()
+        self.assertFalse(SlackUser.objects.filter(member=member).exists())
+
+    def test_warm_links_members(self):
+        self.mock_fetch_user.side_effect = None
+        self.mock_fetch_user.return_value = None
+        members = [
+            User.objects.create(**user_data).member
+            for user_data in fake_user_data(self.faker, count=3)
+        ]
+        user_ids = fake_slack_id(self.faker, count=2)
+        slack_users = [
+            {"id": user_id, "profile": {"email": member.user.email.upper()}}
+            for user_id, member in zip(user_ids, members)
+        ]
+        slack_users.append({"id": "deleted", "deleted": True, "profile": {}})
+
+        with patch.object(SlackBoss, "list_users", return_value=slack_users):
+            directory = slack_directory.warm(
+                emails=[member.user.email for member in members]
+            )
+        self.assertEqual(len(directory), 2)
+        self.mock_fetch_user.reset_mock()
+        self.assertEqual(slack_directory.lookup(members[0].user.email), user_ids[0])
+        self.assertIsNone(slack_directory.lookup(members[2].user.email))
+        self.mock_fetch_user.assert_not_called()
+
+        created = SlackUser.objects.link_members(directory)
+        self.assertEqual({slack_user.id for slack_user in created}, set(user_ids))
+        self.assertEqual(SlackUser.objects.get(member=members[1]).id, user_ids[1])
@@ -0,0 +1,176 @@
+import asyncio
+from io import StringIO
+
+from django.core.management import CommandError, call_command
+from django.test import SimpleTestCase, TestCase
+
+from shows.models import Show
+from slack.async_service import AsyncSlackBoss
+from slack.exceptions import SlackBossException
+from slack.fake_server import FakeSlackServer, use_fake_slack
+from slack.models import SlackChannel
+from slack.service import SlackBoss, slack_boss
+from users.models import User
+
+# logging.disable(logging.WARNING)
+
+
+class TestFakeSlackServer(SimpleTestCase):
+    def setUp(self):
+        self.server = FakeSlackServer(retry_after=0.01, seed=0)
+        self.server.start()
+        self.addCleanup(self.server.stop)
+        self.slack_boss = SlackBoss(token="xoxb-fake")
+        self.slack_boss.client.base_url = self.server.url
+
+    def test_channel_flow(self):
+        user_id = self.server.workspace.add_user("performer@example.com")
+        self.assertEqual(
+            self.slack_boss.fetch_user(email="performer@example.com"), user_id
+        )
+        self.assertIsNone(self.slack_boss.fetch_user(email="other@example.com"))
+
+        channel_id = self.slack_boss.create_channel(name="01-01-show")
+        self.assertTrue(
+            self.slack_boss.invite_users_to_channel(
+                channel_id=channel_id, user_ids=[user_id]
+            )
+        )
+        self.assertTrue(
+            self.slack_boss.invite_users_to_channel(
+                channel_id=channel_id, user_ids=[user_id]
+            )
+        )
+        self.assertEqual(
+            self.slack_boss.list_channel_members(channel_id=channel_id, limit=1),
+            [user_id],
+        )
+
+        ts, created = self.slack_boss.send_message_in_channel(
+            channel_id=channel_id, blocks=[{"type": "divider"}], text="briefing"
+        )
+        self.assertTrue(created)
+        self.assertEqual(
+            self.slack_boss.send_message_in_channel(
+                channel_id=channel_id,
+                ts=ts,
+                blocks=[{"type": "divider"}],
+                text="update",
+            ),
+            (ts, False),
+        )
+        self.assertTrue(
+            self.slack_boss.pin_message_in_channel(channel_id=channel_id, ts=ts)
+        )
+
+        self.assertTrue(
+            self.slack_boss.rename_channel(
+                channel_id=channel_id, name="01-02-show", check=True
+            )
+        )
+        self.assertEqual(
+            self.slack_boss.fetch_channel_name(channel_id=channel_id), "01-02-show"
+        )
+        self.assertTrue(
+            self.slack_boss.remove_users_from_channel(
+                channel_id=channel_id, user_ids=[user_id, user_id]
+            )
+        )
+        self.assertTrue(self.slack_boss.archive_channel(channel_id=channel_id))
+        with self.assertRaises(SlackBossException):
+            self.slack_boss.archive_channel(channel_id=channel_id)
+
+    def test_users_list_pagination(self):
+        user_ids = [
+            self.server.workspace.add_user(f"user{i}@example.com") for i in range(5)
+        ]
+        users = self.slack_boss.list_users(limit=2)
+        self.assertEqual([user["id"] for user in users], user_ids)
+        self.assertEqual(self.server.stats["users.list"], 3)
+
+    def test_rate_limited_call_is_retried(self):
+        channel_id = self.slack_boss.create_channel(name="01-01-show")
+        self.server.inject("conversations.members", times=2)
+        self.assertEqual(
+            self.slack_boss.list_channel_members(channel_id=channel_id), []
+        )
+        self.assertEqual(self.server.stats["ratelimited"], 2)
+        self.assertEqual(self.slack_boss.stats()["retried"], 2)
+
+    def test_rate_limited_call_error(self):
+        channel_id = self.slack_boss.create_channel(name="01-01-show")
+        self.server.inject("conversations.members", times=10)
+        with self.assertRaisesMessage(SlackBossException, "ratelimited"):
+            self.slack_boss.list_channel_members(channel_id=channel_id)
+
+    def test_injected_error(self):
+        self.server.inject("conversations.create", error="internal_error")
+        with self.assertRaisesMessage(SlackBossException, "internal_error"):
+            self.slack_boss.create_channel(name="01-01-show")
+        self.assertEqual(self.server.stats["errors"], 1)
+
+    def test_error_rate(self):
+        self.server.error_rate = 1.0
+        with self.assertRaises(SlackBossException):
+            self.slack_boss.create_channel(name="01-01-show")
+
+    def test_async_slack_boss(self):
+        async_slack_boss = AsyncSlackBoss(token="xoxb-fake")
+        async_slack_boss.client.base_url = self.server.url
+        user_id = self.server.workspace.add_user("performer@example.com")
+        channel_id = self.slack_boss.create_channel(name="01-01-show")
+
+        async def invite():
+            await async_slack_boss.invite_users_to_channel(
+                channel_id=channel_id, user_ids=[user_id]
+            )
+            return await async_slack_boss.list_channel_members(channel_id=channel_id)
+
+        self.assertEqual(asyncio.run(invite()), [user_id])
+
+
+class TestUseFakeSlack(TestCase):
+    def test_show_flow(self):
+        with FakeSlackServer() as server, use_fake_slack(server):
+            show = Show.objects.create(
+                name="fake slack show",
+                date="2022-01-01",
+                status=Show.STATUSES.published,
+            )
+            show.sync_slack_channel()
+            channel = SlackChannel.objects.get(show=show)
+            self.assertEqual(
+                server.workspace.channels[channel.id]["name"],
+                show.default_channel_name(),
+            )
+            self.assertIn(
+                channel.briefing_ts, server.workspace.channels[channel.id]["pins"]
+            )
+        self.assertNotEqual(slack_boss.client.base_url, server.url)
+
+
+class TestBenchmarkSlackCommand(TestCase):
+    def test_benchmark(self):
+        out = StringIO()
+        call_command(
+            "benchmark_slack",
+            shows=2,
+            performers=2,
+            latency=1,
+            rate_limit_rate=0.2,
+            retry_after=0.01,
+            seed=0,
+            yes=True,
+            stdout=out,
+        )
+        output = out.getvalue()
+        for flow in ["publish", "update", "archive"]:
+            self.assertRegex(output, rf"{flow} +n=2 p50=[\d.]+ms p95=[\d.]+ms")
+        self.assertIn("Slack calls:", output)
+        self.assertFalse(Show.objects.exists())
+        self.assertFalse(User.objects.exists())
+
+    def test_refuses_to_run_without_debug(self):
+        with self.assertRaises(CommandError):
+            call_command("benchmark_slack", stdout=StringIO())
+        self.assertFalse(Show.objects.exists())
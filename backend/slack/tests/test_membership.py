@@ -0,0 +1,58 @@
+from django.test import TestCase
+from faker import Faker
+
+from slack.exceptions import SlackBossException
+from slack.membership import channel_members
+from slack.tests.utils import PatchSlackBossMixin, fake_slack_id
+
+# logging.disable(logging.WARNING)
+
+
+class TestChannelMembers(PatchSlackBossMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+
+        self.faker = Faker()
+        Faker.seed(5150)
+
+        self.channel_id = fake_slack_id(self.faker)
+        self.user_ids = fake_slack_id(self.faker, count=3)
+        self.mock_list_channel_members.return_value = self.user_ids[:2]
+
+    def test_fetch_caches_members(self):
+        self.assertEqual(channel_members.fetch(self.channel_id), set(self.user_ids[:2]))
+        self.assertEqual(channel_members.fetch(self.channel_id), set(self.user_ids[:2]))
+        self.mock_list_channel_members.assert_called_once_with(
+            channel_id=self.channel_id
+        )
+
+    def test_invalidate_discards_cached_members(self):
+        channel_members.fetch(self.channel_id)
+        channel_members.invalidate(self.channel_id)
+        self.assertIsNone(channel_members.get(self.channel_id))
+        channel_members.fetch(self.channel_id)
+        self.assertEqual(self.mock_list_channel_members.call_count, 2)
+
+    def test_update_applies_changes(self):
+        channel_members.fetch(self.channel_id)
+        channel_members.update(
+            self.channel_id, added=[self.user_ids[2]], removed=[self.user_ids[0]]
+        )
+        self.assertEqual(channel_members.get(self.channel_id), set(self.user_ids[1:]))
+
+    def test_fetch_many_lists_misses_concurrently(self):
+        channel_ids = fake_slack_id(self.faker, count=3)
+        channel_members.fetch(channel_ids[0])
+        self.mock_async_list_channel_members.side_effect = [
+            self.user_ids,
+            SlackBossException("channel_not_found"),
+        ]
+
+        members = channel_members.fetch_many(channel_ids)
+
+        self.assertEqual(members[channel_ids[0]], set(self.user_ids[:2]))
+        self.assertEqual(members[channel_ids[1]], set(self.user_ids))
+        self.assertIsInstance(members[channel_ids[2]], SlackBossException)
+        self.assertEqual(self.mock_async_list_channel_members.call_count, 2)
+        self.assertEqual(channel_members.get(channel_ids[1]), set(self.user_ids))
+        self.assertIsNone(channel_members.get(channel_ids[2]))
@@ -1,12 +1,18 @@
-from unittest.mock import Mock, MagicMock
+import asyncio
+from unittest.mock import Mock, MagicMock, patch
 
-from django.test import TestCase
+from django.test import TestCase, override_settings
 from faker import Faker
+from slack_sdk.web.async_client import AsyncWebClient
 
 from common.exceptions import WrongUsage
 from shows.models import Member, Show, Role
 from shows.tests.utils import fake_show_data
-from slack.models import SlackUser, SlackChannel
+from slack.async_service import AsyncSlackBoss
+from slack.exceptions import SlackBossException
+from slack.membership import channel_members
+from slack.models import SlackUser, SlackChannel, SlackTask
+from slack.tests.test_throttling import fake_response
 from slack.tests.utils import fake_slack_id, PatchSlackBossMixin, fake_slack_timestamp
 
 # logging.disable(logging.WARNING)
@@ -106,6 +112,37 @@ class TestSlackChannel(PatchSlackBossMixin, TestCase):
         self.slack_channel.invite_performers()
         self.mock_invite_users_to_channel.assert_not_called()
 
+    def test_slack_channel_reconcile_members(self):
+        self.mock_fetch_user.side_effect = fake_slack_id(Faker(), count=2)
+        performer = User.objects.create(**self.user_data).member
+        Role.objects.create(show=self.show, performer=performer)
+        former_performer = User.objects.create(
+            **fake_user_data(Faker(), count=1)
+        ).member
+        guest_id = fake_slack_id(Faker())
+        self.mock_list_channel_members.return_value = [
+            former_performer.slack_user.id,
+            guest_id,
+        ]
+
+        invited, removed = self.slack_channel.reconcile_members()
+
+        self.assertEqual(invited, {performer.slack_user.id})
+        self.assertEqual(removed, {former_performer.slack_user.id})
+        self.mock_invite_users_to_channel.assert_called_with(
+            channel_id=self.channel_id, user_ids=[performer.slack_user.id]
+        )
+        self.mock_remove_users_from_channel.assert_called_with(
+            channel_id=self.channel_id, user_ids=[former_performer.slack_user.id]
+        )
+
+        self.mock_invite_users_to_channel.reset_mock()
+        self.mock_remove_users_from_channel.reset_mock()
+        self.assertEqual(self.slack_channel.reconcile_members(), (set(), set()))
+        self.mock_list_channel_members.assert_called_once()
+        self.mock_invite_users_to_channel.assert_not_called()
+        self.mock_remove_users_from_channel.assert_not_called()
+
     def test_slack_channel_remove_users(self):
         self.slack_channel.remove_users(users=self.slack_user)
         self.mock_remove_users_from_channel.assert_called_with(
@@ -123,7 +160,244 @@ class TestSlackChannel(PatchSlackBossMixin, TestCase):
         with self.assertRaises(ValueError):
             self.slack_channel.send_update_message(updated_fields=[])
 
+    def test_send_or_update_briefing_skips_unchanged(self):
+        self.assertTrue(self.slack_channel.send_or_update_briefing())
+        self.assertFalse(self.slack_channel.send_or_update_briefing())
+        self.assertEqual(self.mock_send_message_in_channel.call_count, 1)
+
+        self.show.lions += 1
+        self.assertTrue(self.slack_channel.send_or_update_briefing())
+        self.assertEqual(self.mock_send_message_in_channel.call_count, 2)
+        self.mock_pin_message_in_channel.assert_not_called()
+
+    def test_schedule_briefing_coalesces_updates(self):
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            self.slack_channel.schedule_briefing()
+            self.slack_channel.schedule_briefing()
+        self.assertEqual(len(callbacks), 1)
+        self.assertEqual(self.mock_send_message_in_channel.call_count, 1)
+
     def test_send_update_message_with_no_message(self):
         self.slack_channel.briefing_ts = ""
         with self.assertRaises(WrongUsage):
             self.slack_channel.send_update_message(updated_fields=[])
+
+
+class TestSlackChannelQuerySet(PatchSlackBossMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+
+        faker = Faker()
+        Faker.seed(864)
+
+        self.mock_create_channel.side_effect = fake_slack_id(faker, count=3)
+        self.channels = [
+            SlackChannel.objects.create(show=Show.objects.create(**show_data))
+            for show_data in fake_show_data(faker, count=3)
+        ]
+        self.user_ids = fake_slack_id(faker, count=2)
+        self.slack_users = [
+            Mock(spec=SlackUser, id=user_id) for user_id in self.user_ids
+        ]
+
+    def test_archive(self):
+        self.channels[2].archived = True
+        self.channels[2].save()
+        self.mock_async_archive_channel.side_effect = [
+            True,
+            SlackBossException("channel_not_found"),
+        ]
+
+        with self.assertNumQueries(2):
+            results = SlackChannel.objects.archive(rename=False)
+
+        self.assertEqual(
+            [(result.channel.id, result.error) for result in results],
+            [(self.channels[0].id, None), (self.channels[1].id, "channel_not_found")],
+        )
+        self.mock_async_rename_channel.assert_not_called()
+        self.assertEqual(
+            list(SlackChannel.objects.filter(archived=True).order_by("pk")),
+            sorted([self.channels[0], self.channels[2]], key=lambda c: c.pk),
+        )
+
+    def test_archive_renames_channels(self):
+        SlackChannel.objects.filter(pk=self.channels[0].pk).archive()
+        _, kwargs = self.mock_async_rename_channel.call_args
+        self.assertEqual(kwargs["channel_id"], self.channels[0].id)
+        self.assertTrue(kwargs["name"].startswith("arch-"))
+        self.mock_async_archive_channel.assert_called_once_with(
+            channel_id=self.channels[0].id
+        )
+
+    def test_archive_already_archived_in_slack(self):
+        self.mock_async_archive_channel.side_effect = SlackBossException(
+            "already_archived"
+        )
+        results = SlackChannel.objects.archive(rename=False)
+        self.assertTrue(all(result.ok for result in results))
+        self.assertFalse(SlackChannel.objects.filter(archived=False).exists())
+
+    def test_invite_users(self):
+        self.mock_list_channel_members.return_value = []
+        channel_members.fetch(self.channels[0].id)
+
+        results = SlackChannel.objects.invite_users(self.slack_users)
+        self.assertTrue(all(result.ok for result in results))
+        self.assertEqual(self.mock_async_invite_users_to_channel.call_count, 3)
+        self.mock_async_invite_users_to_channel.assert_any_call(
+            channel_id=self.channels[0].id, user_ids=self.user_ids
+        )
+        self.assertEqual(channel_members.get(self.channels[0].id), set(self.user_ids))
+
+    def test_reconcile_members_only_touches_drifted_channels(self):
+        self.mock_fetch_user.side_effect = [fake_slack_id(Faker())]
+        self.assertEqual(SlackChannel.objects.reconcile_members(), [])
+        self.assertEqual(self.mock_async_list_channel_members.call_count, 3)
+
+        member = User.objects.create(**fake_user_data(Faker(), count=1)).member
+        Role.objects.create(show=self.channels[1].show, performer=member)
+        results = SlackChannel.objects.reconcile_members()
+
+        self.assertEqual(
+            [(result.channel.id, result.error) for result in results],
+            [(self.channels[1].id, None)],
+        )
+        self.assertEqual(self.mock_async_list_channel_members.call_count, 4)
+        self.mock_async_invite_users_to_channel.assert_called_once_with(
+            channel_id=self.channels[1].id, user_ids=[member.slack_user.id]
+        )
+        self.mock_async_remove_users_from_channel.assert_not_called()
+
+    def test_remove_users(self):
+        self.mock_list_channel_members.return_value = self.user_ids
+        channel_members.fetch(self.channels[0].id)
+        channel_members.fetch(self.channels[1].id)
+        self.mock_async_remove_users_from_channel.side_effect = [
+            True,
+            SlackBossException("cant_kick_self"),
+            SlackBossException("cant_kick_self"),
+        ]
+
+        results = SlackChannel.objects.remove_users(self.slack_users[0])
+        self.assertEqual(
+            [result.error for result in results], [None] + ["cant_kick_self"] * 2
+        )
+        self.mock_async_remove_users_from_channel.assert_any_call(
+            channel_id=self.channels[1].id, user_ids=self.user_ids[0]
+        )
+        self.assertEqual(
+            channel_members.get(self.channels[0].id), set(self.user_ids[1:])
+        )
+        self.assertIsNone(channel_members.get(self.channels[1].id))
+
+
+class TestSlackChannelQuerySetConcurrency(TestCase):
+    def test_remove_users_bounds_nested_kicks(self):
+        faker = Faker()
+        Faker.seed(865)
+
+        shows = [
+            Show.objects.create(**show_data)
+            for show_data in fake_show_data(faker, count=3)
+        ]
+        SlackChannel.objects.bulk_create(
+            [SlackChannel(id=fake_slack_id(faker), show=show) for show in shows]
+        )
+        users = [
+            Mock(spec=SlackUser, id=user_id)
+            for user_id in fake_slack_id(faker, count=4)
+        ]
+        in_flight, peak = 0, 0
+
+        async def api_call(api_method, **kwargs):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.001)
+            in_flight -= 1
+            return fake_response(ok=True)
+
+        with patch(
+            "slack.managers.async_slack_boss",
+            AsyncSlackBoss(token="xoxb-fake", max_concurrency=2),
+        ), patch.object(
+            AsyncWebClient, "api_call", side_effect=api_call
+        ) as mock_api_call:
+            results = SlackChannel.objects.remove_users(users)
+
+        self.assertTrue(all(result.ok for result in results))
+        self.assertEqual(mock_api_call.call_count, 12)
+        self.assertEqual(peak, 2)
+
+
+class TestSlackTask(PatchSlackBossMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+
+        faker = Faker()
+        Faker.seed(517)
+
+        self.show_data = fake_show_data(faker, count=1)
+        self.show = Show.objects.create(
+            name=self.show_data["name"],
+            date=self.show_data["date"],
+            address=self.show_data["address"],
+            lions=self.show_data["lions"],
+        )
+
+    def publish_show(self):
+        self.show.status = Show.STATUSES.published
+        self.show.save()
+
+    def test_publish_show_enqueues_task(self):
+        self.publish_show()
+        self.mock_create_channel.assert_not_called()
+        task = SlackTask.objects.get(show=self.show)
+        self.assertEqual(task.action, SlackTask.ACTIONS.sync_show)
+        self.assertEqual(task.status, SlackTask.STATUSES.pending)
+
+    def test_draft_show_does_not_enqueue_task(self):
+        self.show.name = "Updated show"
+        self.show.save()
+        self.assertFalse(SlackTask.objects.exists())
+
+    def test_process_creates_channel(self):
+        self.publish_show()
+        self.assertEqual(SlackTask.objects.process(), (1, 0))
+        self.mock_create_channel.assert_called_once()
+        self.mock_send_message_in_channel.assert_called_once()
+        self.assertTrue(SlackChannel.objects.filter(show=self.show).exists())
+        task = SlackTask.objects.get(show=self.show)
+        self.assertEqual(task.status, SlackTask.STATUSES.done)
+        self.assertEqual(task.attempts, 1)
+
+    def test_updates_are_merged_into_pending_task(self):
+        self.publish_show()
+        SlackTask.objects.process()
+        self.show.refresh_from_db()
+
+        self.show.name = "Updated show"
+        self.show.save()
+        self.show.lions = (self.show.lions or 0) + 1
+        self.show.save()
+
+        task = SlackTask.objects.get(status=SlackTask.STATUSES.pending)
+        self.assertEqual(task.payload["updated_fields"], ["name", "lions"])
+
+    @override_settings(SLACK_TASK_MAX_ATTEMPTS=2)
+    def test_failed_task_is_retried(self):
+        self.mock_create_channel.side_effect = SlackBossException("ratelimited")
+        self.publish_show()
+
+        self.assertEqual(SlackTask.objects.process(), (0, 1))
+        task = SlackTask.objects.get(show=self.show)
+        self.assertEqual(task.status, SlackTask.STATUSES.pending)
+        self.assertEqual(task.last_error, "ratelimited")
+        self.assertEqual(SlackTask.objects.process(), (0, 0))
+
+        SlackTask.objects.update(run_after=task.created_at)
+        self.assertEqual(SlackTask.objects.process(), (0, 1))
+        task.refresh_from_db()
+        self.assertEqual(task.status, SlackTask.STATUSES.failed)
+        self.assertEqual(task.attempts, 2)
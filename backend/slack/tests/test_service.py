@@ -1,8 +1,9 @@
+import logging
 from typing import Optional, List, Union
 from unittest.mock import patch, MagicMock
 
 from django.conf import settings
-from django.test import SimpleTestCase, override_settings
+from django.test import SimpleTestCase, TestCase, override_settings
 from faker import Faker
 from slack_sdk.errors import SlackApiError
 
@@ -16,7 +17,6 @@ from slack.tests.utils import fake_slack_token, fake_slack_id, fake_slack_timest
 from users.models import User
 from users.tests.utils import fake_user_data
 
-
 # logging.disable(logging.WARNING)
 
 
@@ -171,7 +171,7 @@ class TestSlackBossArgs(SimpleTestCase):
 
 
 class TestSlackBoss(SimpleTestCase):
-    @patch("slack.service.WebClient")
+    @patch("slack.service.RateLimitedWebClient")
     def setUp(self, mock_web_client):
         self.faker = Faker()
         Faker.seed(26)
@@ -188,12 +188,14 @@ class TestSlackBoss(SimpleTestCase):
         with self.assertRaises(SlackTokenException):
             SlackBoss()
 
-    @patch("slack.service.WebClient")
+    @patch("slack.service.RateLimitedWebClient")
     def test_init_with_override_slack_token(self, mock_web_client):
         token = fake_slack_token(self.faker)
         slack_boss = SlackBoss(token=token)
         self.assertEqual(slack_boss.token, token)
-        mock_web_client.assert_called_with(token=token)
+        mock_web_client.assert_called_with(
+            token=token, max_retries=settings.SLACK_MAX_RETRIES
+        )
         self.assertEqual(slack_boss.client, mock_web_client.return_value)
 
     def test_fetch_user(self):
@@ -223,6 +225,50 @@ class TestSlackBoss(SimpleTestCase):
         with self.assertRaises(SlackBossException):
             self.slack_boss.fetch_user(email="")
 
+    def test_list_users(self):
+        pages = [
+            {
+                "members": [{"id": fake_slack_id(self.faker)} for _ in range(2)],
+                "response_metadata": {"next_cursor": "page2"},
+            },
+            {
+                "members": [{"id": fake_slack_id(self.faker)}],
+                "response_metadata": {"next_cursor": ""},
+            },
+        ]
+        self.mock_client.users_list.side_effect = pages
+
+        users = self.slack_boss.list_users(limit=2)
+        self.assertEqual(users, pages[0]["members"] + pages[1]["members"])
+        self.mock_client.users_list.assert_called_with(cursor="page2", limit=2)
+
+        self.mock_client.users_list.side_effect = self.generic_slack_api_error
+        with self.assertRaises(SlackBossException):
+            self.slack_boss.list_users()
+
+    def test_list_channel_members(self):
+        channel_id = fake_slack_id(self.faker)
+        pages = [
+            {
+                "members": fake_slack_id(self.faker, count=2),
+                "response_metadata": {"next_cursor": "page2"},
+            },
+            {"members": [fake_slack_id(self.faker)], "response_metadata": {}},
+        ]
+        self.mock_client.conversations_members.side_effect = pages
+
+        members = self.slack_boss.list_channel_members(channel_id=channel_id, limit=2)
+        self.assertEqual(members, pages[0]["members"] + pages[1]["members"])
+        self.mock_client.conversations_members.assert_called_with(
+            channel=channel_id, cursor="page2", limit=2
+        )
+
+        self.mock_client.conversations_members.side_effect = (
+            self.generic_slack_api_error
+        )
+        with self.assertRaises(SlackBossException):
+            self.slack_boss.list_channel_members(channel_id=channel_id)
+
     def test_create_channel(self):
         show_name = fake_show_name(self.faker)
         channel_id = fake_slack_id(self.faker)
@@ -433,3 +479,58 @@ class TestSlackBoss(SimpleTestCase):
         self.mock_client.pins_add.side_effect = self.generic_slack_api_error
         with self.assertRaises(SlackBossException):
             self.slack_boss.pin_message_in_channel(channel_id=channel_id, ts=message_ts)
+
+
+class TestSlackBossLabels(TestCase):
+    @patch("slack.service.RateLimitedWebClient")
+    def setUp(self, mock_web_client):
+        self.faker = Faker()
+        Faker.seed(27)
+
+        self.mock_client = MagicMock()
+        mock_web_client.return_value = self.mock_client
+        self.slack_boss = SlackBoss()
+
+        users = User.objects.bulk_create(
+            [User(**data) for data in fake_user_data(self.faker, count=30)]
+        )
+        members = Member.objects.bulk_create([Member(user=user) for user in users])
+        SlackUser.objects.bulk_create(
+            [
+                SlackUser(id=user_id, member=member)
+                for user_id, member in zip(fake_slack_id(self.faker, count=30), members)
+            ]
+        )
+        show = Show.objects.create(**fake_show_data(self.faker))
+        SlackChannel.objects.bulk_create(
+            [SlackChannel(id=fake_slack_id(self.faker), show=show)]
+        )
+
+        self.users = list(SlackUser.objects.all())
+        self.channel = SlackChannel.objects.get()
+        self.member_names = str(
+            [user.member for user in SlackUser.objects.select_related("member__user")]
+        )
+
+    def test_invite_users_to_channel_without_label_queries(self):
+        logging.disable(logging.INFO)
+        self.addCleanup(logging.disable, logging.NOTSET)
+
+        with self.assertNumQueries(0):
+            self.slack_boss.invite_users_to_channel(
+                channel=self.channel, users=self.users
+            )
+        self.mock_client.conversations_invite.assert_called_once_with(
+            channel=self.channel.id, users=[user.id for user in self.users]
+        )
+
+    def test_invite_users_to_channel_logs_labels(self):
+        with self.assertLogs(level=logging.INFO) as logs:
+            self.slack_boss.invite_users_to_channel(
+                channel=self.channel, users=self.users
+            )
+        self.assertIn(
+            f"Inviting {self.member_names} to channel "
+            f"{self.channel.show.default_channel_name()} ...",
+            logs.output[0],
+        )
@@ -0,0 +1,122 @@
+from typing import Optional
+from unittest.mock import patch
+
+from django.test import SimpleTestCase
+from slack_sdk import WebClient
+from slack_sdk.errors import SlackApiError
+from slack_sdk.web import SlackResponse
+
+from slack.async_service import AsyncRateLimitedWebClient
+from slack.throttling import RateLimitedWebClient, TokenBucket
+
+# logging.disable(logging.WARNING)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.slept = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+def fake_response(
+    status_code: int = 200, headers: Optional[dict] = None, **data
+) -> SlackResponse:
+    return SlackResponse(
+        client=None,
+        http_verb="POST",
+        api_url="https://slack.com/api/test",
+        req_args={},
+        data=data,
+        headers=headers or {},
+        status_code=status_code,
+    )
+
+
+class TestTokenBucket(SimpleTestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+
+    def test_acquire_allows_burst(self):
+        bucket = TokenBucket(20, clock=self.clock, sleep=self.clock.sleep)
+        for _ in range(20):
+            self.assertEqual(bucket.acquire(), 0)
+        self.assertEqual(self.clock.slept, [])
+
+    def test_acquire_waits_for_refill(self):
+        bucket = TokenBucket(20, clock=self.clock, sleep=self.clock.sleep)
+        for _ in range(20):
+            bucket.acquire()
+        self.assertAlmostEqual(bucket.acquire(), 3.0)
+        self.assertAlmostEqual(bucket.acquire(), 3.0)
+
+    def test_pause_blocks_acquire(self):
+        bucket = TokenBucket(50, clock=self.clock, sleep=self.clock.sleep)
+        bucket.pause(5)
+        self.assertAlmostEqual(bucket.acquire(), 5.0)
+
+
+class TestRateLimitedWebClient(SimpleTestCase):
+    def setUp(self):
+        self.client = RateLimitedWebClient(token="xoxb-test", max_retries=2)
+
+    def test_bucket_uses_method_tier(self):
+        self.assertEqual(self.client.bucket("users.list").capacity, 20)
+        self.assertEqual(self.client.bucket("chat.postMessage").capacity, 60)
+        self.assertEqual(self.client.bucket("unknown.method").capacity, 50)
+        self.assertIs(
+            self.client.bucket("users.list"), self.client.bucket("users.list")
+        )
+
+    def test_buckets_are_shared_by_token(self):
+        async_client = AsyncRateLimitedWebClient(token="xoxb-test")
+        self.assertIs(
+            async_client.bucket("users.list"), self.client.bucket("users.list")
+        )
+        other_client = RateLimitedWebClient(token="xoxb-other")
+        self.assertIsNot(
+            other_client.bucket("users.list"), self.client.bucket("users.list")
+        )
+
+    @patch("slack.throttling.TokenBucket.pause")
+    @patch.object(WebClient, "api_call")
+    def test_api_call_retries_rate_limited(self, mock_api_call, mock_pause):
+        response = fake_response(ok=True)
+        mock_api_call.side_effect = [
+            SlackApiError(
+                "ratelimited",
+                fake_response(429, {"Retry-After": "2"}, ok=False, error="ratelimited"),
+            ),
+            response,
+        ]
+        self.assertEqual(self.client.api_call("conversations.invite"), response)
+        mock_pause.assert_called_once_with(2.0)
+        self.assertEqual(self.client.stats["calls"], 2)
+        self.assertEqual(self.client.stats["retried"], 1)
+
+    @patch("slack.throttling.TokenBucket.pause")
+    @patch.object(WebClient, "api_call")
+    def test_api_call_gives_up_after_max_retries(self, mock_api_call, mock_pause):
+        mock_api_call.side_effect = SlackApiError(
+            "ratelimited", fake_response(429, ok=False, error="ratelimited")
+        )
+        with self.assertRaises(SlackApiError):
+            self.client.api_call("conversations.invite")
+        self.assertEqual(mock_api_call.call_count, 3)
+        self.assertEqual(self.client.stats["retried"], 2)
+
+    @patch.object(WebClient, "api_call")
+    def test_api_call_raises_other_errors(self, mock_api_call):
+        mock_api_call.side_effect = SlackApiError(
+            "channel_not_found", fake_response(ok=False, error="channel_not_found")
+        )
+        with self.assertRaises(SlackApiError):
+            self.client.api_call("conversations.info")
+        self.assertEqual(mock_api_call.call_count, 1)
+        self.assertEqual(self.client.stats["retried"], 0)
@@ -1,10 +1,12 @@
 from typing import Optional, Union, List
-from unittest.mock import patch
+from unittest.mock import AsyncMock, patch
 
+from django.core.cache import cache
 from django.test import TestCase
 from faker import Faker
 
 from common.exceptions import WrongUsage
+from slack.async_service import AsyncSlackBoss
 from slack.service import SlackBoss
 
 
@@ -46,6 +48,7 @@ def fake_slack_timestamp(faker: Optional[Faker] = None, **kwargs):
 class PatchSlackBossMixin(TestCase):
     def setUp(self):
         super().setUp()
+        cache.clear()
         self._patch_fetch_user()
         self._patch_create_channel()
         self._patch_rename_channel()
@@ -53,6 +56,9 @@ class PatchSlackBossMixin(TestCase):
         self._patch_invite_users_to_channel()
         self._patch_remove_users_from_channel()
         self._patch_send_message_in_channel()
+        self._patch_pin_message_in_channel()
+        self._patch_list_channel_members()
+        self._patch_async_slack_boss()
 
     def _patch_fetch_user(self):
         fetch_user_patcher = patch.object(
@@ -107,3 +113,39 @@ class PatchSlackBossMixin(TestCase):
         )
         self.mock_send_message_in_channel = send_message_in_channel_patcher.start()
         self.addCleanup(send_message_in_channel_patcher.stop)
+
+    def _patch_pin_message_in_channel(self):
+        pin_message_in_channel_patcher = patch.object(
+            SlackBoss, "pin_message_in_channel", return_value=True
+        )
+        self.mock_pin_message_in_channel = pin_message_in_channel_patcher.start()
+        self.addCleanup(pin_message_in_channel_patcher.stop)
+
+    def _patch_list_channel_members(self):
+        list_channel_members_patcher = patch.object(
+            SlackBoss, "list_channel_members", return_value=[]
+        )
+        self.mock_list_channel_members = list_channel_members_patcher.start()
+        self.addCleanup(list_channel_members_patcher.stop)
+
+        async_list_channel_members_patcher = patch.object(
+            AsyncSlackBoss, "list_channel_members", new_callable=AsyncMock
+        )
+        self.mock_async_list_channel_members = (
+            async_list_channel_members_patcher.start()
+        )
+        self.mock_async_list_channel_members.return_value = []
+        self.addCleanup(async_list_channel_members_patcher.stop)
+
+    def _patch_async_slack_boss(self):
+        for method in [
+            "rename_channel",
+            "archive_channel",
+            "invite_users_to_channel",
+            "remove_users_from_channel",
+        ]:
+            patcher = patch.object(
+                AsyncSlackBoss, method, new_callable=AsyncMock, return_value=True
+            )
+            setattr(self, f"mock_async_{method}", patcher.start())
+            self.addCleanup(patcher.stop)
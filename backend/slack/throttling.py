@@ -0,0 +1,199 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections import Counter
+from typing import Callable, Dict, Optional
+
+from slack_sdk import WebClient
+from slack_sdk.errors import SlackApiError
+from slack_sdk.web import SlackResponse
+
+from common.instrumentation import timed
+
+# Requests per minute allowed for each Slack Web API rate limit tier.
+# See https://api.slack.com/docs/rate-limits
+TIER_LIMITS = {1: 1, 2: 20, 3: 50, 4: 100}
+
+METHOD_TIERS = {
+    "users.list": 2,
+    "users.lookupByEmail": 3,
+    "conversations.create": 2,
+    "conversations.info": 3,
+    "conversations.rename": 2,
+    "conversations.archive": 2,
+    "conversations.invite": 3,
+    "conversations.kick": 3,
+    "conversations.members": 4,
+    "chat.update": 3,
+    "pins.add": 2,
+}
+
+# Methods with special rate limits, in requests per minute.
+METHOD_LIMITS = {
+    "chat.postMessage": 60,
+}
+
+DEFAULT_TIER = 3
+
+
+def method_limit(api_method: str) -> int:
+    """Returns the number of requests per minute allowed for a Slack method."""
+
+    return METHOD_LIMITS.get(
+        api_method, TIER_LIMITS[METHOD_TIERS.get(api_method, DEFAULT_TIER)]
+    )
+
+
+def retry_after(response: SlackResponse) -> Optional[float]:
+    """Returns the Retry-After delay of a rate limited response, if any."""
+
+    if response.status_code != 429 and response.get("error") != "ratelimited":
+        return None
+    headers = {key.lower(): value for key, value in (response.headers or {}).items()}
+    try:
+        return float(headers.get("retry-after", 1))
+    except (TypeError, ValueError):
+        return 1.0
+
+
+class TokenBucket:
+    """Token bucket limiting the rate of calls to a single Slack method.
+
+    Attributes:
+        rate: The number of tokens added per second.
+        capacity: The maximum number of tokens, i.e. the allowed burst.
+    """
+
+    def __init__(
+        self,
+        per_minute: int,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.rate = per_minute / 60
+        self.capacity = max(1, per_minute)
+        self.tokens = float(self.capacity)
+        self.clock = clock
+        self.sleep = sleep
+        self.updated = clock()
+        self.blocked_until = 0.0
+        self.lock = threading.Lock()
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reserve(self) -> float:
+        """Takes a token without waiting for it to become available.
+
+        Returns:
+            The number of seconds the caller must wait before using the token.
+        """
+
+        with self.lock:
+            now = self.clock()
+            self._refill(now)
+            wait = max(0.0, self.blocked_until - now)
+            if self.tokens < 1:
+                wait = max(wait, (1 - self.tokens) / self.rate)
+            self.tokens -= 1
+        return wait
+
+    def acquire(self) -> float:
+        """Takes a token, waiting until one is available.
+
+        Returns:
+            The number of seconds spent waiting.
+        """
+
+        wait = self.reserve()
+        if wait > 0:
+            self.sleep(wait)
+        return wait
+
+    def pause(self, seconds: float):
+        """Blocks all calls through the bucket for the given duration."""
+
+        with self.lock:
+            now = self.clock()
+            self._refill(now)
+            self.tokens = min(self.tokens, 0.0)
+            self.blocked_until = max(self.blocked_until, now + seconds)
+
+
+class TokenBuckets:
+    """Token buckets of the Slack methods called with one token.
+
+    Slack rate limits apply per token and method, so the sync and async
+    clients of a token share the same buckets, see for_token, and their
+    calls to a method are limited together.
+    """
+
+    _shared: Dict[str, "TokenBuckets"] = {}
+    _shared_lock = threading.Lock()
+
+    def __init__(self):
+        self.buckets: Dict[str, TokenBucket] = {}
+        self.lock = threading.Lock()
+
+    def get(self, api_method: str) -> TokenBucket:
+        with self.lock:
+            if api_method not in self.buckets:
+                self.buckets[api_method] = TokenBucket(method_limit(api_method))
+            return self.buckets[api_method]
+
+    @classmethod
+    def for_token(cls, token: Optional[str]) -> TokenBuckets:
+        """Returns the buckets shared by all clients of a token."""
+
+        with cls._shared_lock:
+            if token not in cls._shared:
+                cls._shared[token] = cls()
+            return cls._shared[token]
+
+
+class RateLimitedWebClient(WebClient):
+    """Slack WebClient that schedules calls according to Slack rate limits.
+
+    Every API call takes a token from the bucket of its method, sized by the
+    method's rate limit tier, before it is sent. If Slack still responds
+    with `ratelimited`, the call is retried after the `Retry-After` delay,
+    during which other calls to that method are held back as well. The
+    buckets are shared with the other clients of the token, see TokenBuckets.
+
+    Attributes:
+        max_retries: The maximum number of retries for a rate limited call.
+        stats: Counters of calls, throttled calls and retried calls.
+    """
+
+    def __init__(self, *args, max_retries: int = 3, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.max_retries = max_retries
+        self.stats = Counter()
+        self.buckets = TokenBuckets.for_token(self.token)
+
+    def bucket(self, api_method: str) -> TokenBucket:
+        return self.buckets.get(api_method)
+
+    def api_call(self, api_method: str, **kwargs) -> SlackResponse:
+        with timed("slack"):
+            bucket = self.bucket(api_method)
+            attempt = 0
+            while True:
+                if bucket.acquire() > 0:
+                    self.stats["throttled"] += 1
+                self.stats["calls"] += 1
+                try:
+                    return super().api_call(api_method, **kwargs)
+                except SlackApiError as api_error:
+                    delay = retry_after(api_error.response)
+                    if delay is None or attempt >= self.max_retries:
+                        raise
+                    attempt += 1
+                    self.stats["retried"] += 1
+                    logging.warning(
+                        f"Slack {api_method} is rate limited, retrying in {delay}s ..."
+                    )
+                    bucket.pause(delay)
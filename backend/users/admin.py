@@ -1,16 +1,35 @@
-from django.contrib import admin
+from django.contrib import admin, messages
 from django.contrib.auth import get_user_model
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
 from django.contrib.auth.models import Group
 from django.utils.translation import gettext_lazy as _
 
+from common.admin import retry
 from users.forms import GroupAdminForm
+from users.models import OutgoingEmail
 
 User = get_user_model()
 
 
+@admin.action(description="Activate selected users")
+def activate_users(modeladmin, request, queryset):
+    selected = queryset.count()
+    activated = queryset.activate()
+    modeladmin.message_user(
+        request,
+        f"Activated {len(activated)} users and queued their activation emails"
+        + (
+            f", {selected - len(activated)} already active"
+            if selected > len(activated)
+            else ""
+        ),
+        level=messages.SUCCESS if activated else messages.INFO,
+    )
+
+
 class UserAdmin(BaseUserAdmin):
     model = User
+    actions = [activate_users]
 
     @admin.display(boolean=True)
     def board(self, user):
@@ -56,6 +75,7 @@ class UserAdmin(BaseUserAdmin):
         "is_staff",
         "is_active",
     )
+    list_select_related = ("member",)
     search_fields = ("email", "first_name", "last_name")
     ordering = ("email",)
 
@@ -92,7 +112,24 @@ class GroupAdmin(admin.ModelAdmin):
     filter_horizontal = ["permissions"]
 
 
+class OutgoingEmailAdmin(admin.ModelAdmin):
+    readonly_fields = [
+        "subject",
+        "recipients",
+        "from_email",
+        "body",
+        "attempts",
+        "last_error",
+        "sent_at",
+    ]
+    exclude = ["html_body"]
+    list_display = ["id", "subject", "recipients", "status", "attempts", "run_after"]
+    list_filter = ["status"]
+    actions = [retry]
+
+
 admin.site.register(User, UserAdmin)
+admin.site.register(OutgoingEmail, OutgoingEmailAdmin)
 
 admin.site.unregister(Group)
 admin.site.register(Group, GroupAdmin)
@@ -0,0 +1,8 @@
+from common.commands import OutboxCommand
+from users.models import OutgoingEmail
+
+
+class Command(OutboxCommand):
+    help = "Delivers pending emails recorded in the outbox"
+    model = OutgoingEmail
+    verb = "Delivered"
@@ -1,17 +1,51 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+import logging
+from typing import TYPE_CHECKING, Iterable, List, Tuple
 
+from django.apps import apps
+from django.conf import settings
 from django.contrib.auth.base_user import BaseUserManager
+from django.core.mail import get_connection
 from django.core.validators import validate_email
 from django.db.models import QuerySet
 from django.utils.translation import gettext_lazy as _
 
+from common.instrumentation import record
+from common.managers import OutboxManager
+from users.signals import signals
+
 if TYPE_CHECKING:
-    from users.models import User
+    from users.models import OutgoingEmail, User
+
+
+class UserQuerySet(QuerySet):
+    def activate(self) -> List[User]:
+        """Activates all queried inactive users at once.
+
+        Unlike activating users one by one, the users are activated with a
+        single update, the users_activated signal is sent once for all of
+        them, and their activation emails are queued in bulk.
+
+        Returns:
+            The users which were activated, excluding those already active.
+        """
 
+        user_ids = list(self.filter(is_active=False).values_list("pk", flat=True))
+        if not user_ids:
+            return []
+        self.model.objects.filter(pk__in=user_ids).update(is_active=True)
+        users = list(self.model.objects.filter(pk__in=user_ids))
+        logging.info(f"Activated {len(users)} users")
 
-class UserManager(BaseUserManager):
+        signals.users_activated.send(sender=self.model, users=users)
+        apps.get_model("users", "OutgoingEmail").objects.enqueue(
+            [user.render_user_activated_email() for user in users]
+        )
+        return users
+
+
+class UserManager(BaseUserManager.from_queryset(UserQuerySet)):
     def create(
         self,
         email: str,
@@ -37,8 +71,56 @@ class UserManager(BaseUserManager):
             raise ValueError(_("Superuser must have is_superuser=True."))
         return self.create(email, password, **extra_fields)
 
-    def activate(self) -> QuerySet:
-        user_set = self.all()
-        for user in user_set:
-            user.activate()
-        return user_set
+
+class OutgoingEmailManager(OutboxManager):
+    """Model manager for OutgoingEmail"""
+
+    def enqueue(self, emails: Iterable[OutgoingEmail]) -> List[OutgoingEmail]:
+        """Records emails to be delivered by the outbox worker.
+
+        Args:
+            emails: Unsaved OutgoingEmail instances, e.g. as rendered by
+                User.render_email.
+
+        Returns:
+            The newly created OutgoingEmail instances.
+        """
+
+        emails = list(emails)
+        for email in emails:
+            email.from_email = email.from_email or settings.DEFAULT_FROM_EMAIL
+        logging.info(f"Queueing {len(emails)} emails ...")
+        # The INSERT is already timed as SQL, so only the count is recorded.
+        record("email", 0.0, count=len(emails))
+        return self.bulk_create(emails)
+
+    def run(self, emails: Iterable[OutgoingEmail], **kwargs) -> Tuple[int, int]:
+        """Delivers claimed emails over a single connection to the mail server.
+
+        The connection is opened up front and closed once the batch is done.
+        If it cannot be opened, each delivery attempt fails on its own and is
+        retried later.
+
+        Args:
+            emails: The claimed emails to deliver.
+            **kwargs: Arguments passed on to the execute() method of each
+                email.
+
+        Returns:
+            A tuple containing the number of emails which were sent and the
+            number of emails which failed.
+        """
+
+        emails = list(emails)
+        if not emails:
+            return 0, 0
+
+        connection = get_connection(fail_silently=False)
+        try:
+            connection.open()
+        except Exception:
+            logging.exception("Failed to connect to the mail server")
+        try:
+            return super().run(emails, connection=connection, **kwargs)
+        finally:
+            connection.close()
@@ -0,0 +1,57 @@
+# Generated by Django 4.1.2 on 2026-10-17 00:07
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+from django.contrib.sessions.backends.db import SessionStore
+from django.utils import timezone
+
+
+def index_user_sessions(apps, schema_editor):
+    Session = apps.get_model("sessions", "Session")
+    User = apps.get_model("users", "User")
+    UserSession = apps.get_model("users", "UserSession")
+
+    store = SessionStore()
+    user_sessions = []
+    user_ids = set(User.objects.values_list("pk", flat=True))
+    for session in Session.objects.filter(expire_date__gte=timezone.now()).iterator():
+        user_id = store.decode(session.session_data).get("_auth_user_id")
+        if user_id is not None and int(user_id) in user_ids:
+            user_sessions.append(UserSession(session=session, user_id=int(user_id)))
+    UserSession.objects.bulk_create(user_sessions, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("sessions", "0001_initial"),
+        ("users", "0002_outgoingemail"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="UserSession",
+            fields=[
+                (
+                    "session",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="user_session",
+                        serialize=False,
+                        to="sessions.session",
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="user_sessions",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+        ),
+        migrations.RunPython(index_user_sessions, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 4.1.2 on 2026-10-17 00:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0003_usersession"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="user",
+            index=models.Index(
+                fields=["first_name", "last_name"], name="users_user_first_n_6d862e_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 4.1.2 on 2026-10-17 00:54
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0004_user_name_index"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="outgoingemail",
+            name="run_after",
+            field=models.DateTimeField(
+                default=django.utils.timezone.now,
+                help_text="Earliest time at which the entry may be attempted",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="outgoingemail",
+            name="status",
+            field=models.PositiveSmallIntegerField(
+                choices=[(0, "Pending"), (1, "Done"), (2, "Failed")], default=0
+            ),
+        ),
+    ]
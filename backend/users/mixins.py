@@ -2,9 +2,7 @@ from smtplib import SMTPException
 
 import graphene
 from django.contrib.auth import get_user_model
-from django.contrib.sessions.models import Session
 from django.core.signing import BadSignature, SignatureExpired
-from django.utils import timezone
 from graphql_jwt.decorators import login_required
 
 from api.bases import Output
@@ -95,11 +93,8 @@ class LogoutUserMixin(Output):
     @classmethod
     def mutate(cls, root, info, **kwargs):
         try:
-            for session in Session.objects.filter(expire_date__gte=timezone.now()):
-                if str(info.context.user.pk) == session.get_decoded().get(
-                    "_auth_user_id"
-                ):
-                    session.delete()
+            if info.context.user.is_authenticated:
+                info.context.user.end_sessions()
             return cls(success=True)
         except Exception:
             return cls(success=False, errors=Messages.LOGOUT_FAIL)
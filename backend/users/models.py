@@ -2,20 +2,25 @@ import time
 
 from django.conf import settings
 from django.contrib.auth.models import AbstractUser
+from django.contrib.sessions.models import Session
 from django.contrib.sites.shortcuts import get_current_site
-from django.core.mail import send_mail
+from django.core.mail import EmailMultiAlternatives
 from django.db import models
 from django.template.loader import render_to_string
+from django.utils import timezone
 from django.utils.html import strip_tags
 from django.utils.translation import gettext_lazy as _
+from graphql_jwt.refresh_token.utils import get_refresh_token_model
 from phonenumber_field.modelfields import PhoneNumberField
 
-from users.managers import UserManager
+from common.instrumentation import timed
+from common.models import DirtyFieldsMixin, OutboxModel
+from users.managers import OutgoingEmailManager, UserManager
 from users.signals import signals
 from users.tokens import action_token, TokenAction
 
 
-class User(AbstractUser):
+class User(DirtyFieldsMixin, AbstractUser):
     username = None
     email = models.EmailField(_("email address"), unique=True)
     first_name = models.CharField(_("first name"), max_length=150)
@@ -27,12 +32,14 @@ class User(AbstractUser):
 
     objects = UserManager()
 
+    class Meta(AbstractUser.Meta):
+        indexes = [models.Index(fields=["first_name", "last_name"])]
+
     def __str__(self):
         return self.get_full_name()
 
     def save(self, *args, **kwargs):
-        old_instance = User.objects.filter(pk=self.pk).first()
-        was_active = getattr(old_instance, "is_active", False)
+        was_active = bool(self.original_value("is_active"))
         super().save(*args, **kwargs)
         if self.is_active and not was_active:
             signals.user_activated.send(sender=User, user=self)
@@ -45,23 +52,44 @@ class User(AbstractUser):
             self.save()
         return not was_active
 
+    def end_sessions(self) -> int:
+        """Logs the user out everywhere.
+
+        Deletes all sessions of the user, found through the UserSession
+        index, and revokes all of the user's active refresh tokens.
+
+        Returns:
+            The number of sessions which were deleted.
+        """
+
+        sessions = Session.objects.filter(user_session__user=self)
+        session_count = sessions.count()
+        sessions.delete()
+        get_refresh_token_model().objects.filter(
+            user=self, revoked__isnull=True
+        ).update(revoked=timezone.now())
+        return session_count
+
     @classmethod
     def email_is_free(cls, email):
         return not User.objects.filter(email=email).exists()
 
-    def send(self, subject, template, context, recipient_list=None):
+    def render_email(self, subject, template, context, recipient_list=None):
         _subject = render_to_string(subject, context).replace("\n", " ").strip()
         html_message = render_to_string(template, context)
         message = strip_tags(html_message)
-        return send_mail(
+        return OutgoingEmail(
             subject=_subject,
-            message=message,
+            body=message,
+            html_body=html_message,
             from_email=settings.DEFAULT_FROM_EMAIL,
-            html_message=html_message,
-            recipient_list=(recipient_list or [self.email]),
-            fail_silently=False,
+            recipients=(recipient_list or [self.email]),
         )
 
+    def send(self, subject, template, context, recipient_list=None):
+        email = self.render_email(subject, template, context, recipient_list)
+        return OutgoingEmail.objects.enqueue([email])[0]
+
     def get_email_context(self, info=None, path=None, action=None, **kwargs):
         context = {
             "user": self,
@@ -90,8 +118,93 @@ class User(AbstractUser):
         subject = "email/password_reset_subject.txt"
         return self.send(subject, template, email_context, *args, **kwargs)
 
-    def send_user_activated_email(self, *args, **kwargs):
+    def render_user_activated_email(self, *args, **kwargs):
         email_context = self.get_email_context(path="login")
         template = "email/user_activated_email.html"
         subject = "email/user_activated_subject.txt"
-        return self.send(subject, template, email_context, *args, **kwargs)
+        return self.render_email(subject, template, email_context, *args, **kwargs)
+
+    def send_user_activated_email(self, *args, **kwargs):
+        email = self.render_user_activated_email(*args, **kwargs)
+        return OutgoingEmail.objects.enqueue([email])[0]
+
+
+class UserSession(models.Model):
+    """Model indexing the sessions of a user.
+
+    Session data is signed and serialized, so the user a session belongs to
+    cannot be queried from the Session table itself. Rows are recorded when a
+    user logs in, and deleted along with their session on logout or when
+    expired sessions are cleared.
+    """
+
+    session = models.OneToOneField(
+        Session,
+        primary_key=True,
+        on_delete=models.CASCADE,
+        related_name="user_session",
+    )
+    user = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name="user_sessions"
+    )
+
+    def __str__(self):
+        return f"{self.session_id} for {self.user}"
+
+
+class OutgoingEmail(OutboxModel):
+    """Model for an email waiting in the outbox.
+
+    Emails are recorded in the same transaction as the change that triggers
+    them, and delivered out-of-band by the process_emails management command
+    over a single connection to the mail server per batch. Failed deliveries
+    are retried until EMAIL_OUTBOX_MAX_ATTEMPTS is reached.
+    """
+
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    html_body = models.TextField(blank=True)
+    from_email = models.CharField(max_length=255)
+    recipients = models.JSONField(default=list)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    objects = OutgoingEmailManager()
+
+    max_attempts_setting = "EMAIL_OUTBOX_MAX_ATTEMPTS"
+    retry_delay_setting = "EMAIL_OUTBOX_RETRY_DELAY"
+    completed_fields = ["sent_at"]
+
+    def __str__(self):
+        return f"{self.subject} to {', '.join(self.recipients)}"
+
+    def message(self, connection=None) -> EmailMultiAlternatives:
+        """Builds the message to deliver for the email.
+
+        Args:
+            connection: The mail backend connection to send the message over.
+
+        Returns:
+            An EmailMultiAlternatives instance with the HTML body attached.
+        """
+
+        message = EmailMultiAlternatives(
+            subject=self.subject,
+            body=self.body,
+            from_email=self.from_email,
+            to=self.recipients,
+            connection=connection,
+        )
+        if self.html_body:
+            message.attach_alternative(self.html_body, "text/html")
+        return message
+
+    def execute(self, connection=None):
+        """Sends the email.
+
+        Args:
+            connection: The mail backend connection to send the email over.
+        """
+
+        with timed("email"):
+            self.message(connection).send(fail_silently=False)
+        self.sent_at = timezone.now()
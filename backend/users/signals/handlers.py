@@ -0,0 +1,13 @@
+from django.contrib.auth.signals import user_logged_in
+from django.dispatch import receiver
+
+from users.models import UserSession
+
+
+@receiver(user_logged_in)
+def index_user_session(sender, request, user, **kwargs):
+    session_key = getattr(getattr(request, "session", None), "session_key", None)
+    if session_key:
+        UserSession.objects.update_or_create(
+            session_id=session_key, defaults={"user": user}
+        )
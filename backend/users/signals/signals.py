@@ -1,3 +1,4 @@
 from django import dispatch
 
 user_activated = dispatch.Signal()
+users_activated = dispatch.Signal()
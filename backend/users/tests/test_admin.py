@@ -1,11 +1,16 @@
+from unittest.mock import MagicMock, patch
+
 from django.contrib.admin import AdminSite
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from faker import Faker
 
 from shows.models import Member
+from slack.service import SlackBoss
 from slack.tests.utils import PatchSlackBossMixin
-from users.admin import UserAdmin
-from users.models import User
+from users.admin import UserAdmin, activate_users
+from users.models import OutgoingEmail, User
 from users.tests.utils import fake_user_data
 
 
@@ -37,3 +42,34 @@ class TestUserAdmin(PatchSlackBossMixin, TestCase):
                 self.assertFalse(is_board)
             else:
                 self.assertTrue(is_board)
+
+    def test_admin_activate_users(self):
+        inactive_data = fake_user_data(Faker(), count=2)
+        for user in inactive_data:
+            User.objects.create(**user, is_active=False)
+        OutgoingEmail.objects.all().delete()
+        modeladmin = MagicMock()
+
+        with patch.object(SlackBoss, "list_users", return_value=[]):
+            activate_users(modeladmin, MagicMock(), User.objects.all())
+
+        self.assertFalse(User.objects.filter(is_active=False).exists())
+        self.assertEqual(OutgoingEmail.objects.count(), 2)
+        message = modeladmin.message_user.call_args.args[1]
+        self.assertIn("Activated 2 users", message)
+        self.assertIn("1 already active", message)
+
+    def test_admin_changelist_query_count_is_constant(self):
+        faker = Faker()
+        Faker.seed(5678)
+        admin_user = User.objects.create_superuser(**fake_user_data(faker))
+        self.client.force_login(admin_user)
+        self.client.get("/admin/users/user/")
+        with CaptureQueriesContext(connection) as few_queries:
+            self.client.get("/admin/users/user/")
+        for user in fake_user_data(faker, count=5):
+            User.objects.create(**user)
+        with CaptureQueriesContext(connection) as many_queries:
+            response = self.client.get("/admin/users/user/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(few_queries), len(many_queries))
@@ -1,10 +1,23 @@
+from smtplib import SMTPException
+from unittest.mock import patch
+
+from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.core import mail
+from django.contrib.sessions.models import Session
 from django.core.exceptions import ValidationError
-from django.test import TestCase
+from django.db import connection
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
 from faker import Faker
+from graphql_jwt.refresh_token.shortcuts import create_refresh_token
 
 from shows.models import Member
-from slack.tests.utils import PatchSlackBossMixin
+from slack.models import SlackUser
+from slack.service import SlackBoss
+from slack.tests.utils import PatchSlackBossMixin, fake_slack_id
+from users.models import OutgoingEmail, UserSession
 from users.tests.utils import fake_user_data
 
 # logging.disable(logging.WARNING)
@@ -52,6 +65,23 @@ class TestUserModel(PatchSlackBossMixin, TestCase):
         self.assertTrue(user.is_active)
         self.assertTrue(hasattr(user, "member") and user.member is not None)
 
+    def test_activate_loaded_user_updates_only_is_active(self):
+        User.objects.create(
+            email=self.user_data["email"],
+            password=self.user_data["password"],
+            first_name=self.user_data["first_name"],
+            last_name=self.user_data["last_name"],
+            is_active=False,
+        )
+        user = User.objects.get(email=self.user_data["email"])
+        with CaptureQueriesContext(connection) as queries:
+            self.assertTrue(user.activate())
+        update = next(q["sql"] for q in queries if q["sql"].startswith("UPDATE"))
+        self.assertIn('"is_active"', update)
+        self.assertNotIn('"email"', update)
+        self.assertFalse(user.get_dirty_fields())
+        self.assertTrue(hasattr(user, "member") and user.member is not None)
+
     def test_create_user_invalid_email_error(self):
         with self.assertRaises(ValueError):
             User.objects.create(email=None, password=self.user_data["password"])
@@ -87,3 +117,185 @@ class TestUserModel(PatchSlackBossMixin, TestCase):
                 password=self.user_data["password"],
                 is_superuser=False,
             )
+
+
+class TestUserQuerySet(PatchSlackBossMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+
+        faker = Faker()
+        Faker.seed(0)
+
+        self.faker = faker
+        self.user_data = fake_user_data(faker, count=4)
+        self.users = [
+            User.objects.create(
+                email=user["email"],
+                password=user["password"],
+                first_name=user["first_name"],
+                last_name=user["last_name"],
+                is_active=i == 0,
+            )
+            for i, user in enumerate(self.user_data)
+        ]
+        self.mock_fetch_user.reset_mock()
+        OutgoingEmail.objects.all().delete()
+
+    def test_activate_users(self):
+        slack_users = [
+            {"id": fake_slack_id(self.faker), "profile": {"email": user["email"]}}
+            for user in self.user_data[1:3]
+        ]
+
+        with patch.object(
+            SlackBoss, "list_users", return_value=slack_users
+        ) as mock_list_users:
+            activated = User.objects.all().activate()
+
+        self.assertEqual(
+            sorted(user.pk for user in activated),
+            sorted(user.pk for user in self.users[1:]),
+        )
+        self.assertFalse(User.objects.filter(is_active=False).exists())
+        self.assertEqual(Member.objects.count(), 4)
+        self.assertEqual(
+            set(SlackUser.objects.values_list("member__user__email", flat=True)),
+            {user["email"] for user in self.user_data[:3]},
+        )
+        mock_list_users.assert_called_once()
+        self.mock_fetch_user.assert_not_called()
+        self.assertEqual(
+            sorted(email.recipients[0] for email in OutgoingEmail.objects.all()),
+            sorted(user["email"] for user in self.user_data[1:]),
+        )
+        self.assertEqual(len(mail.outbox), 0)
+
+    def test_activate_users_queries_do_not_scale_with_users(self):
+        with patch.object(SlackBoss, "list_users", return_value=[]):
+            with CaptureQueriesContext(connection) as one:
+                User.objects.filter(pk=self.users[1].pk).activate()
+            with CaptureQueriesContext(connection) as two:
+                User.objects.filter(pk__in=[u.pk for u in self.users[2:]]).activate()
+        self.assertEqual(len(one.captured_queries), len(two.captured_queries))
+
+    def test_activate_active_users(self):
+        self.assertEqual(User.objects.filter(pk=self.users[0].pk).activate(), [])
+        self.assertFalse(OutgoingEmail.objects.exists())
+
+
+class TestUserSessionModel(PatchSlackBossMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+
+        faker = Faker()
+        Faker.seed(0)
+
+        self.users = [
+            User.objects.create(**user) for user in fake_user_data(faker, count=2)
+        ]
+
+    def login(self, user):
+        client = Client()
+        client.force_login(user)
+        return client.session.session_key
+
+    def test_login_indexes_session(self):
+        session_key = self.login(self.users[0])
+        self.assertEqual(UserSession.objects.get().session_id, session_key)
+        self.assertEqual(self.users[0].user_sessions.count(), 1)
+
+    def test_end_sessions(self):
+        self.login(self.users[0])
+        self.login(self.users[0])
+        other_session_key = self.login(self.users[1])
+        refresh_token = create_refresh_token(self.users[0])
+        other_refresh_token = create_refresh_token(self.users[1])
+
+        self.assertEqual(self.users[0].end_sessions(), 2)
+
+        self.assertEqual(
+            list(Session.objects.values_list("session_key", flat=True)),
+            [other_session_key],
+        )
+        self.assertEqual(UserSession.objects.get().user, self.users[1])
+        refresh_token.refresh_from_db()
+        other_refresh_token.refresh_from_db()
+        self.assertIsNotNone(refresh_token.revoked)
+        self.assertIsNone(other_refresh_token.revoked)
+
+
+class TestOutgoingEmailModel(PatchSlackBossMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+
+        faker = Faker()
+        Faker.seed(0)
+
+        self.user_data = fake_user_data(faker, count=3)
+        self.users = [
+            User.objects.create(
+                email=user["email"],
+                password=user["password"],
+                first_name=user["first_name"],
+                last_name=user["last_name"],
+                is_active=False,
+            )
+            for user in self.user_data
+        ]
+
+    def test_activate_user_queues_email(self):
+        self.users[0].activate()
+        self.assertEqual(len(mail.outbox), 0)
+        email = OutgoingEmail.objects.get()
+        self.assertEqual(email.recipients, [self.user_data[0]["email"]])
+        self.assertEqual(email.from_email, settings.DEFAULT_FROM_EMAIL)
+        self.assertTrue(email.html_body)
+
+    def test_process_sends_batch_over_one_connection(self):
+        for user in self.users:
+            user.activate()
+
+        with patch(
+            "users.managers.get_connection", wraps=mail.get_connection
+        ) as mock_get_connection:
+            self.assertEqual(OutgoingEmail.objects.process(), (3, 0))
+
+        mock_get_connection.assert_called_once()
+        self.assertEqual(len(mail.outbox), 3)
+        self.assertEqual(mail.outbox[0].alternatives[0][1], "text/html")
+        self.assertFalse(
+            OutgoingEmail.objects.exclude(status=OutgoingEmail.STATUSES.done).exists()
+        )
+        self.assertEqual(OutgoingEmail.objects.process(), (0, 0))
+
+    def test_process_retries_failed_email(self):
+        self.users[0].activate()
+
+        with patch.object(
+            mail.EmailMultiAlternatives, "send", side_effect=SMTPException("down")
+        ):
+            self.assertEqual(OutgoingEmail.objects.process(), (0, 1))
+
+        email = OutgoingEmail.objects.get()
+        self.assertEqual(email.status, OutgoingEmail.STATUSES.pending)
+        self.assertEqual(email.attempts, 1)
+        self.assertEqual(email.last_error, "down")
+        self.assertGreater(email.run_after, timezone.now())
+        self.assertEqual(OutgoingEmail.objects.process(), (0, 0))
+
+        OutgoingEmail.objects.update(run_after=timezone.now())
+        self.assertEqual(OutgoingEmail.objects.process(), (1, 0))
+        self.assertEqual(len(mail.outbox), 1)
+
+    def test_process_marks_email_failed_after_max_attempts(self):
+        self.users[0].activate()
+        OutgoingEmail.objects.update(attempts=settings.EMAIL_OUTBOX_MAX_ATTEMPTS - 1)
+
+        with patch.object(
+            mail.EmailMultiAlternatives, "send", side_effect=SMTPException("down")
+        ):
+            OutgoingEmail.objects.process()
+
+        self.assertEqual(
+            OutgoingEmail.objects.get().status, OutgoingEmail.STATUSES.failed
+        )
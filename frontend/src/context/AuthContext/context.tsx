@@ -1,5 +1,5 @@
 import React, {createContext, useEffect, useState} from "react";
-import {handleApolloError, useMutation} from "../../services/graphql";
+import {createPersistedQueriesLink, handleApolloError, useMutation} from "../../services/graphql";
 import {useLocation, useNavigate} from "react-router-dom";
 import jwt_decode from "jwt-decode";
 import dayjs from "dayjs";
@@ -137,7 +137,7 @@ export const AuthProvider: React.FC<Props> = ({children}: Props) => {
 
             setClient(
                 new ApolloClient({
-                    link: authLink.concat(httpLink),
+                    link: authLink.concat(createPersistedQueriesLink()).concat(httpLink),
                     cache: new InMemoryCache(),
                 })
             );
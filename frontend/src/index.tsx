@@ -3,11 +3,12 @@ import ReactDOM from "react-dom/client";
 import App from "./App";
 import {BrowserRouter} from "react-router-dom";
 import {ApolloClient, ApolloProvider, createHttpLink, InMemoryCache,} from "@apollo/client";
+import {createPersistedQueriesLink} from "./services/graphql";
 
 const client = new ApolloClient({
-    link: createHttpLink({
+    link: createPersistedQueriesLink().concat(createHttpLink({
         uri: "/graphql/",
-    }), cache: new InMemoryCache(),
+    })), cache: new InMemoryCache(),
 });
 
 const root = ReactDOM.createRoot(document.getElementById("root"));
@@ -0,0 +1,11 @@
+import {ApolloLink} from "@apollo/client";
+import {createPersistedQueryLink} from "@apollo/client/link/persisted-queries";
+
+const sha256 = async (query: string): Promise<string> => {
+    const digest = await crypto.subtle.digest("SHA-256", new TextEncoder().encode(query));
+    return Array.from(new Uint8Array(digest))
+        .map((byte) => byte.toString(16).padStart(2, "0"))
+        .join("");
+};
+
+export const createPersistedQueriesLink = (): ApolloLink => createPersistedQueryLink({sha256});